@@ -0,0 +1,447 @@
+import threading
+from collections import OrderedDict
+
+from reduction import Reduction
+from cache import scenario_key
+
+_INF = float('inf')
+
+
+class _PrefixMin:
+    """
+    Segment tree untuk min prefix dengan penambahan pada prefix atau satu
+    posisi, semuanya O(log n). Penambahan disimpan di node yang tercakup penuh dan tidak
+    didorong ke anak: low[node] = min(anak) + add[node].
+    """
+
+    def __init__(self, values):
+        size = 1
+        while size < len(values):
+            size *= 2
+        self.size = size
+        self.low = [_INF] * (2 * size)
+        self.add = [0] * size
+        self.low[size:size + len(values)] = values
+        for node in range(size - 1, 0, -1):
+            self.low[node] = min(self.low[2 * node], self.low[2 * node + 1])
+
+    def min(self, p):
+        """
+        Minimum nilai di posisi [0, p)
+        """
+        low = self.low
+        node, lo, hi = 1, 0, self.size
+        acc = 0
+        best = _INF
+        while p > lo:
+            if p >= hi:
+                return min(best, low[node] + acc)
+            acc += self.add[node]
+            mid = (lo + hi) // 2
+            if p > mid:
+                best = min(best, low[2 * node] + acc)
+                node, lo = 2 * node + 1, mid
+            else:
+                node, hi = 2 * node, mid
+        return best
+
+    def shift(self, p, delta):
+        """
+        Tambahkan delta ke semua nilai di posisi [0, p)
+        """
+        low = self.low
+        add = self.add
+        size = self.size
+        node, lo, hi = 1, 0, size
+        path = []
+        while p > lo:
+            if p >= hi:
+                low[node] += delta
+                if node < size:
+                    add[node] += delta
+                break
+            path.append(node)
+            mid = (lo + hi) // 2
+            if p > mid:
+                left = 2 * node
+                low[left] += delta
+                if left < size:
+                    add[left] += delta
+                node, lo = left + 1, mid
+            else:
+                node, hi = 2 * node, mid
+        for node in reversed(path):
+            low[node] = min(low[2 * node], low[2 * node + 1]) + add[node]
+
+    def bump(self, p, delta):
+        """
+        Tambahkan delta ke nilai di posisi p saja
+        """
+        low = self.low
+        add = self.add
+        node = self.size + p
+        low[node] += delta
+        node //= 2
+        while node:
+            low[node] = min(low[2 * node], low[2 * node + 1]) + add[node]
+            node //= 2
+
+
+class BankerState:
+    """
+    State Banker's Algorithm untuk resource-request berulang.
+
+    Safe sequence terakhir disimpan sebagai sertifikat bersama slack prefix
+    per resource: slack[j][p] = min(work_t[j] - need[S_t][j]) untuk posisi
+    t < p. Request r dari proses di posisi p tetap sesuai urutan tersebut
+    jika r[j] <= slack[j][p] untuk setiap j. Slack disimpan per resource
+    dalam segment tree (_PrefixMin), sehingga cek dan pembaruan setelah
+    request dikabulkan cukup O(m log n). Jika cek gagal, urutan dicoba
+    diperbaiki dalam O(n*m) dengan memajukan proses tersebut; safety scan
+    penuh hanya dijalankan jika keduanya gagal.
+    """
+
+    def __init__(self, processes, resources, allocation, max_need, available, safe_sequence=None):
+        self.processes = list(processes)
+        self.resources = list(resources)
+        self.allocation = [list(row) for row in allocation]
+        self.max_need = [list(row) for row in max_need]
+        self.available = list(available)
+
+        n = len(self.processes)
+        m = len(self.resources)
+        if len(self.allocation) != n or len(self.max_need) != n or len(self.available) != m:
+            raise ValueError("Ukuran matriks tidak sesuai dengan jumlah proses/resource")
+        for i in range(n):
+            if len(self.allocation[i]) != m or len(self.max_need[i]) != m:
+                raise ValueError(f"Baris matriks untuk {self.processes[i]} tidak sesuai jumlah resource")
+
+        self.process_index = {p: i for i, p in enumerate(self.processes)}
+        self.resource_index = {r: j for j, r in enumerate(self.resources)}
+        self.need = [[mx - a for mx, a in zip(self.max_need[i], self.allocation[i])] for i in range(n)]
+
+        self.sequence = None
+        self.position = {}
+        self.slack = []
+        self.full_scans = 0
+
+        if safe_sequence is None or not self._adopt(safe_sequence):
+            self._scan()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['processes'], data['resources'], data['allocation'],
+                   data['max_need'], data['available'], data.get('safe_sequence'))
+
+    # ------------------------------------------------------------------
+    # Sertifikat
+    # ------------------------------------------------------------------
+
+    def _adopt(self, names):
+        """
+        Pakai safe sequence dari luar setelah diverifikasi dalam O(n*m)
+        """
+        if len(names) != len(self.processes) or any(p not in self.process_index for p in names):
+            return False
+        order = [self.process_index[p] for p in names]
+        if len(set(order)) != len(order):
+            return False
+        work = self.available[:]
+        for i in order:
+            need_i = self.need[i]
+            alloc_i = self.allocation[i]
+            for j in range(len(work)):
+                if need_i[j] > work[j]:
+                    return False
+                work[j] += alloc_i[j]
+        self._certify(order)
+        return True
+
+    def _scan(self):
+        """
+        Safety scan penuh; sertifikat dibuang jika state tidak aman
+        """
+        self.full_scans += 1
+        order = []
+        Reduction(self.allocation, self.max_need, self.available).run(lambda i, work: order.append(i))
+        if len(order) == len(self.processes):
+            self._certify(order)
+            return True
+        self.sequence = None
+        self.position = {}
+        self.slack = []
+        return False
+
+    def _certify(self, order):
+        self.sequence = order
+        self.position = {i: p for p, i in enumerate(order)}
+        self.slack = [self._slack_column(j) for j in range(len(self.resources))]
+
+    def _slack_column(self, j):
+        w = self.available[j]
+        terms = []
+        for q in self.sequence:
+            terms.append(w - self.need[q][j])
+            w += self.allocation[q][j]
+        return _PrefixMin(terms)
+
+    def fits_certificate(self, i, amounts):
+        """
+        O(m): apakah state setelah request tetap aman dengan urutan yang sama
+        """
+        if self.sequence is None:
+            return False
+        p = self.position[i]
+        return all(r <= self.slack[j].min(p) for j, r in enumerate(amounts) if r > 0)
+
+    def _repair(self, i, amounts):
+        """
+        O(n*m): cari posisi q sebelum posisi proses i di mana i bisa
+        menyelesaikan seluruh kebutuhannya dan prefix sebelum q tetap aman
+        setelah request. Proses setelah q hanya mendapat work lebih banyak,
+        jadi urutan dengan i dipindah ke q tetap aman.
+        """
+        if self.sequence is None:
+            return None
+        p = self.position[i]
+        need_i = self.need[i]
+        work = self.available[:]
+        requested = [(j, r) for j, r in enumerate(amounts) if r > 0]
+        for q in range(p):
+            if all(n <= w for n, w in zip(need_i, work)):
+                return self.sequence[:q] + [i] + self.sequence[q:p] + self.sequence[p + 1:]
+            k = self.sequence[q]
+            # Proses k harus tetap bisa selesai setelah request; jika tidak,
+            # posisi berikutnya juga gagal
+            if any(work[j] - r < self.need[k][j] for j, r in requested):
+                return None
+            for j, a in enumerate(self.allocation[k]):
+                work[j] += a
+        return None
+
+    # ------------------------------------------------------------------
+    # Request / release
+    # ------------------------------------------------------------------
+
+    def _shift(self, i, amounts, sign):
+        alloc_i = self.allocation[i]
+        need_i = self.need[i]
+        for j, r in enumerate(amounts):
+            if r:
+                alloc_i[j] += sign * r
+                need_i[j] -= sign * r
+                self.available[j] -= sign * r
+
+    def _refresh_columns(self, i, amounts):
+        # Work sebelum posisi i berkurang r; suku di posisi i dan sesudahnya tetap
+        p = self.position[i]
+        for j, r in enumerate(amounts):
+            if r:
+                self.slack[j].shift(p, -r)
+
+    def request(self, i, amounts):
+        """
+        Resource-request algorithm untuk proses i. Mengembalikan (verdict,
+        certificate_reused) dengan verdict "granted", "wait" (resource belum
+        tersedia) atau "denied" (state menjadi tidak aman).
+        """
+        need_i = self.need[i]
+        if any(r > need_i[j] for j, r in enumerate(amounts)):
+            raise ValueError(f"Request {self.processes[i]} melebihi kebutuhan maksimum")
+        if any(r > self.available[j] for j, r in enumerate(amounts)):
+            return "wait", False
+
+        if self.fits_certificate(i, amounts):
+            self._shift(i, amounts, 1)
+            self._refresh_columns(i, amounts)
+            return "granted", True
+
+        order = self._repair(i, amounts)
+        if order is not None:
+            self._shift(i, amounts, 1)
+            self._certify(order)
+            return "granted", True
+
+        # Sertifikat tidak berlaku: alokasikan sementara lalu scan penuh
+        previous = (self.sequence, self.position, self.slack)
+        self._shift(i, amounts, 1)
+        if self._scan():
+            return "granted", False
+        self._shift(i, amounts, -1)
+        self.sequence, self.position, self.slack = previous
+        return "denied", False
+
+    def request_one(self, i, j, amount):
+        """
+        Request satu resource j yang hanya dikabulkan jika sesuai sertifikat,
+        O(log n) tanpa perbaikan urutan atau safety scan. Konservatif:
+        "denied" di sini berarti tunggu sampai sertifikat berubah, bukan
+        bahwa state pasti tidak aman.
+        """
+        if amount > self.need[i][j]:
+            raise ValueError(f"Request {self.processes[i]} melebihi kebutuhan maksimum")
+        if amount > self.available[j]:
+            return "wait"
+        if self.sequence is None:
+            return "denied"
+        p = self.position[i]
+        column = self.slack[j]
+        if amount > column.min(p):
+            return "denied"
+        self.allocation[i][j] += amount
+        self.need[i][j] -= amount
+        self.available[j] -= amount
+        column.shift(p, -amount)
+        return "granted"
+
+    def release(self, i, amounts):
+        """
+        Lepas resource proses i. Urutan aman tetap berlaku: work sebelum
+        posisi i bertambah r, suku lainnya tetap, jadi slack diperbarui
+        dalam O(m log n) tanpa dihitung ulang.
+        """
+        alloc_i = self.allocation[i]
+        if any(r > alloc_i[j] for j, r in enumerate(amounts)):
+            raise ValueError(f"Proses {self.processes[i]} melepas lebih dari yang dipegang")
+        self._shift(i, amounts, -1)
+        if self.sequence is None:
+            self._scan()
+            return
+        p = self.position[i]
+        for j, r in enumerate(amounts):
+            if r:
+                self.slack[j].shift(p, r)
+
+    def retire(self, i):
+        """
+        Proses i selesai: seluruh alokasinya dilepas dan klaim maksimumnya
+        menjadi nol. Seperti release, sertifikat tetap berlaku; selain
+        prefix, suku di posisi i sendiri naik sebesar alokasi + need-nya.
+        """
+        alloc_i = self.allocation[i]
+        need_i = self.need[i]
+        p = self.position.get(i)
+        for j, a in enumerate(alloc_i):
+            if self.sequence is not None and (a or need_i[j]):
+                column = self.slack[j]
+                column.shift(p, a)
+                column.bump(p, a + need_i[j])
+            self.available[j] += a
+            alloc_i[j] = 0
+            self.max_need[i][j] = 0
+            need_i[j] = 0
+        if self.sequence is None:
+            self._scan()
+
+    def amounts(self, request):
+        """
+        Normalisasi request berupa list per resource atau dict {resource: jumlah}
+        """
+        m = len(self.resources)
+        if isinstance(request, dict):
+            amounts = [0] * m
+            for res, amount in request.items():
+                if res not in self.resource_index:
+                    raise ValueError(f"Resource {res} tidak dikenal")
+                amounts[self.resource_index[res]] = amount
+        elif isinstance(request, list) and len(request) == m:
+            amounts = list(request)
+        else:
+            raise ValueError("Request harus berupa list sepanjang jumlah resource atau dict resource -> jumlah")
+        if any(not isinstance(r, int) or isinstance(r, bool) or r < 0 for r in amounts):
+            raise ValueError("Jumlah resource harus bilangan bulat non-negatif")
+        return amounts
+
+    def state(self):
+        return {
+            "processes": self.processes,
+            "resources": self.resources,
+            "allocation": [row[:] for row in self.allocation],
+            "max_need": [row[:] for row in self.max_need],
+            "available": self.available[:],
+            "safe": self.sequence is not None,
+            "safe_sequence": [self.processes[i] for i in self.sequence] if self.sequence is not None else []
+        }
+
+
+def request_resources(data, process, request):
+    """
+    Jalankan resource-request algorithm sekali untuk skenario data. Jika data
+    membawa safe_sequence dari hasil sebelumnya, urutan itu dipakai sebagai
+    sertifikat setelah diverifikasi.
+    """
+    state = BankerState.from_dict(data)
+    if process not in state.process_index:
+        raise ValueError(f"Proses {process} tidak dikenal")
+    verdict, reused = state.request(state.process_index[process], state.amounts(request))
+    result = state.state()
+    result["verdict"] = verdict
+    result["certificate_reused"] = reused
+    return result
+
+
+class BankerStore:
+    """
+    Cache BankerState berdasarkan hash isi state. Setelah request dikabulkan
+    state disimpan dengan key barunya, sehingga request berikutnya atas
+    state hasil (dikirim lengkap atau cukup state_id) memakai sertifikat
+    yang sama tanpa scan ulang.
+    """
+
+    def __init__(self, max_states=1024):
+        self.max_states = max_states
+        self.states = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data):
+        return scenario_key('request', data).hex()
+
+    def handle(self, data):
+        """
+        Proses satu body /api/request: {"process", "request"} ditambah state
+        lengkap atau "state_id" dari response sebelumnya
+        """
+        process = data.get('process')
+        request = data.get('request')
+        with self.lock:
+            state_id = data.get('state_id')
+            if state_id is not None:
+                state = self.states.pop(state_id, None)
+                if state is None:
+                    raise KeyError(state_id)
+                self.hits += 1
+            else:
+                state_id = self.key(data)
+                state = self.states.pop(state_id, None)
+                if state is None:
+                    self.misses += 1
+                    try:
+                        state = BankerState.from_dict(data)
+                    except (KeyError, TypeError) as e:
+                        raise ValueError(f"Invalid scenario: {e}")
+                else:
+                    self.hits += 1
+
+            try:
+                if process not in state.process_index:
+                    raise ValueError(f"Proses {process} tidak dikenal")
+                verdict, reused = state.request(state.process_index[process], state.amounts(request))
+                result = state.state()
+                state_id = self.key(result)
+            finally:
+                # State tetap disimpan (dengan key baru jika berubah) walau request tidak valid
+                self.states[state_id] = state
+                while len(self.states) > self.max_states:
+                    self.states.popitem(last=False)
+
+        result["verdict"] = verdict
+        result["certificate_reused"] = reused
+        result["state_id"] = state_id
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {"states": len(self.states), "hits": self.hits, "misses": self.misses}
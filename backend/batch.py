@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import signal
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from scenario import Scenario
+from simulator import simulate_execution
+from solver import handle_deadlock, solve_deadlock
+
+DEFAULT_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+# Default sekaligus batas atas timeout per item yang bisa diminta klien
+DEFAULT_TIMEOUT = float(os.environ.get('BATCH_ITEM_TIMEOUT', 10.0))
+# Selang cek future yang belum dijalankan worker pada order="completion"
+_POLL_INTERVAL = 0.5
+
+_executor = None
+_executor_workers = None
+
+
+class ItemTimeout(Exception):
+    pass
+
+
+def get_executor(max_workers=None):
+    """
+    Process pool bersama untuk /api/batch, dibuat saat pertama kali dipakai
+    """
+    global _executor, _executor_workers
+    max_workers = max_workers or DEFAULT_WORKERS
+    if _executor is None or _executor_workers != max_workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+        _executor_workers = max_workers
+    return _executor
+
+
+def _on_timeout(signum, frame):
+    raise ItemTimeout()
+
+
+@contextmanager
+def _alarm(timeout):
+    """
+    SIGALRM setelah timeout detik (jika tersedia) yang memicu ItemTimeout
+    """
+    use_alarm = timeout and hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def solve_item(item, timeout):
+    """
+    Jalankan satu skenario di worker. Tanpa strategy skenario diproses seperti
+    /api/simulate, selain itu seperti /api/solve. Error selalu dikembalikan
+    sebagai data agar tidak menjatuhkan batch.
+    """
+    try:
+        with _alarm(timeout):
+            if isinstance(item, Scenario):
+                # Scenario dari body biner; item sudah berupa salinan milik worker
+                data = item
+                strategy = item.options.pop('strategy', None)
+            elif isinstance(item, dict):
+                data = dict(item)
+                strategy = data.pop('strategy', None)
+            else:
+                return {"error": "Invalid input"}
+            if strategy is None:
+                return {"result": handle_deadlock(data)}
+            return {"result": solve_deadlock(data, strategy)}
+    except ItemTimeout:
+        return {"error": f"Timeout setelah {timeout} detik", "timeout": True}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def execute_item(item, timeout):
+    """
+    Jalankan simulasi /api/execute di worker. Input yang tidak valid ditandai
+    "invalid" agar bisa dijawab 400, bukan 500.
+    """
+    try:
+        with _alarm(timeout):
+            return {"result": simulate_execution(item, item.get('strategy', 'Avoidance'))}
+    except ItemTimeout:
+        return {"error": f"Timeout setelah {timeout} detik", "timeout": True}
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": f"Invalid input: {e}", "invalid": True}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _timeout_error(index, timeout):
+    return {"error": f"Timeout setelah {timeout} detik", "timeout": True, "index": index}
+
+
+def _collect(index, future, timeout):
+    try:
+        outcome = future.result(timeout=timeout + 1)
+    except FutureTimeout:
+        future.cancel()
+        return _timeout_error(index, timeout)
+    except BrokenProcessPool:
+        outcome = {"error": "Worker pool rusak"}
+    except Exception as e:
+        outcome = {"error": f"{type(e).__name__}: {e}"}
+    return dict(outcome, index=index)
+
+
+def item_timeout(value):
+    """
+    Timeout per item dari request: harus angka > 0 dan dibatasi
+    DEFAULT_TIMEOUT (BATCH_ITEM_TIMEOUT), agar klien tidak bisa mematikan
+    alarm worker. Melempar ValueError untuk nilai tidak valid.
+    """
+    if value is None:
+        return DEFAULT_TIMEOUT
+    value = float(value)
+    if math.isnan(value) or value <= 0:
+        raise ValueError("timeout harus lebih dari 0")
+    return min(value, DEFAULT_TIMEOUT)
+
+
+def run_batch(items, executor, order="input", timeout=DEFAULT_TIMEOUT, window=DEFAULT_WORKERS * 4):
+    """
+    Sebar skenario ke process pool dan yield hasil {"index", "result"|"error"}
+    dalam urutan input atau urutan selesai. Jumlah skenario yang sedang
+    diproses dibatasi window agar memori tetap konstan untuk batch besar.
+    """
+    timeout = item_timeout(timeout)
+    pending = deque()
+    items = iter(enumerate(items))
+
+    def submit_next():
+        for index, item in items:
+            pending.append([index, executor.submit(solve_item, item, timeout), None])
+            return True
+        return False
+
+    while len(pending) < window and submit_next():
+        pass
+
+    if order == "completion":
+        # Setiap future punya deadline sendiri, dihitung sejak future mulai
+        # dijalankan worker; future yang masih antri di executor belum dihitung
+        while pending:
+            now = time.monotonic()
+            waits = [_POLL_INTERVAL]
+            for entry in pending:
+                if entry[2] is None and (entry[1].running() or entry[1].done()):
+                    entry[2] = now
+                if entry[2] is not None:
+                    waits.append(entry[2] + timeout + 1 - now)
+            done, _ = wait([entry[1] for entry in pending], timeout=max(0.0, min(waits)),
+                           return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for entry in list(pending):
+                index, future, started = entry
+                if future in done:
+                    pending.remove(entry)
+                    yield _collect(index, future, timeout)
+                    submit_next()
+                elif started is not None and now > started + timeout + 1:
+                    # Worker macet melewati alarm: gagalkan future ini saja
+                    pending.remove(entry)
+                    future.cancel()
+                    yield _timeout_error(index, timeout)
+                    submit_next()
+    else:
+        while pending:
+            index, future, _ = pending.popleft()
+            yield _collect(index, future, timeout)
+            submit_next()
+
+
+def iter_ndjson(lines):
+    """
+    Parse NDJSON baris per baris; baris yang tidak valid diteruskan apa adanya
+    sehingga menjadi error pada item tersebut saja
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
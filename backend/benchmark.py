@@ -0,0 +1,185 @@
+"""
+Benchmark solver.py untuk berbagai ukuran skenario dan strategi.
+
+Contoh:
+    python benchmark.py --output bench.json
+    python benchmark.py --preset full --output bench.json
+    python benchmark.py --compare bench_baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from reduction import track_reductions
+from solver import (
+    bankers_algorithm,
+    detect_deadlock,
+    detect_deadlock_dependencies,
+    find_cycles,
+    generate_random_scenario,
+    solve_deadlock,
+)
+
+PRESETS = {
+    "small": [(10, 3), (100, 10), (1000, 50)],
+    "full": [(10, 3), (100, 10), (1000, 50), (5000, 200), (10000, 500)],
+}
+
+STRATEGIES = ["Prevention", "Avoidance", "Detection"]
+
+
+def parse_sizes(text):
+    """
+    Parse daftar ukuran "10x3,100x10" menjadi [(10, 3), (100, 10)]
+    """
+    sizes = []
+    for part in text.split(','):
+        n, m = part.lower().split('x')
+        sizes.append((int(n), int(m)))
+    return sizes
+
+
+def build_scenario(num_processes, num_resources, seed):
+    return generate_random_scenario(num_processes, num_resources, 4, seed)
+
+
+def benchmark_cases(scenario):
+    """
+    Daftar (nama, fungsi tanpa argumen) yang diukur untuk satu skenario
+    """
+    args = (scenario['processes'], scenario['resources'], scenario['allocation'],
+            scenario['max_need'], scenario['available'])
+    _, dependencies, _ = detect_deadlock_dependencies(*args)
+
+    cases = [
+        ("detect_deadlock", lambda: detect_deadlock(*args)),
+        ("detect_deadlock_dependencies", lambda: detect_deadlock_dependencies(*args)),
+        ("find_cycles", lambda: find_cycles(dependencies)),
+        ("bankers_algorithm", lambda: bankers_algorithm(*args)),
+    ]
+    for strategy in STRATEGIES:
+        cases.append((f"solve_deadlock[{strategy}]",
+                      lambda strategy=strategy: solve_deadlock(dict(scenario), strategy)))
+    return cases
+
+
+def measure(fn, repeats):
+    """
+    Ukur waktu (beberapa kali), iterasi reduksi dan peak memori satu fungsi
+    """
+    timings = []
+    iterations = 0
+    for _ in range(repeats):
+        with track_reductions() as engines:
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        iterations = sum(engine.iterations for engine in engines)
+
+    # tracemalloc memperlambat eksekusi, jadi dijalankan terpisah dari timing
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time_s": statistics.median(timings),
+        "min_time_s": min(timings),
+        "peak_bytes": peak,
+        "iterations": iterations,
+    }
+
+
+def run(sizes, seed, repeats, only=None, log=sys.stderr):
+    results = []
+    for num_processes, num_resources in sizes:
+        scenario = build_scenario(num_processes, num_resources, seed)
+        for name, fn in benchmark_cases(scenario):
+            if only and not any(pattern in name for pattern in only):
+                continue
+            entry = {
+                "case": f"{name}@{num_processes}x{num_resources}",
+                "function": name,
+                "processes": num_processes,
+                "resources": num_resources,
+            }
+            entry.update(measure(fn, repeats))
+            results.append(entry)
+            print(f"{entry['case']:<50} {entry['time_s'] * 1000:10.2f} ms "
+                  f"{entry['peak_bytes'] / 1024:10.1f} KiB {entry['iterations']:>10} it",
+                  file=log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeats": repeats,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """
+    Bandingkan hasil dengan baseline; kembalikan daftar regresi waktu/memori
+    di atas threshold (rasio, mis. 0.2 = 20% lebih lambat)
+    """
+    previous = {entry["case"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in report["results"]:
+        base = previous.get(entry["case"])
+        if base is None:
+            continue
+        for metric in ("time_s", "peak_bytes"):
+            if base[metric] and entry[metric] > base[metric] * (1 + threshold):
+                regressions.append({
+                    "case": entry["case"],
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": entry[metric],
+                    "ratio": entry[metric] / base[metric],
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark solver deadlock")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--sizes", help="Ukuran kustom, mis. 10x3,1000x50")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", action="append", help="Jalankan hanya case yang namanya mengandung teks ini")
+    parser.add_argument("--output", help="Tulis hasil JSON ke file ini")
+    parser.add_argument("--compare", help="File JSON baseline untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    sizes = parse_sizes(args.sizes) if args.sizes else PRESETS[args.preset]
+    report = run(sizes, args.seed, args.repeats, args.only)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        report["regressions"] = regressions
+        for reg in regressions:
+            print(f"REGRESI {reg['case']} {reg['metric']}: {reg['baseline']:.6g} -> "
+                  f"{reg['current']:.6g} ({reg['ratio']:.2f}x)", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
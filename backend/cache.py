@@ -0,0 +1,253 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+# Opsi request yang ikut memengaruhi hasil solver dan karenanya bagian dari key
+RESULT_OPTIONS = ('recovery_mode', 'time_budget', 'max_cycles', 'max_cycle_length',
+                  # Simulasi admisi Prevention
+                  'seed', 'burst_times', 'cores', 'process_core_mapping')
+
+# Record disk: key sha256 (32 byte), waktu kedaluwarsa (double), panjang body
+_RECORD = struct.Struct('<32sdI')
+
+
+def scenario_key(endpoint, data, strategy=None):
+    """
+    Hash kanonik dari (processes, resources, allocation, max_need, available,
+    strategy) beserta opsi yang memengaruhi hasil
+    """
+    payload = [
+        endpoint,
+        strategy,
+        data.get('processes'),
+        data.get('resources'),
+        data.get('allocation'),
+        data.get('max_need'),
+        data.get('available'),
+        {option: data[option] for option in RESULT_OPTIONS if option in data},
+    ]
+    canonical = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).digest()
+
+
+class DiskStore:
+    """
+    Tier disk append-only yang dibaca lewat mmap. Index key -> offset dibangun
+    ulang saat start sehingga cache bertahan setelah restart; record dari
+    proses lain yang menulis ke file yang sama dibaca saat terjadi miss.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'results.bin')
+        self.max_bytes = max_bytes
+        self.index = {}
+        self.scanned = 0
+        self.map = None
+        # (st_dev, st_ino) file yang di-index; berubah jika file diganti
+        self.identity = None
+        self.lock = threading.Lock()
+        open(self.path, 'ab').close()
+        self._scan()
+
+    def _remap(self):
+        """
+        Petakan ulang file jika ukurannya berubah. Jika file sudah diganti
+        (di-compact proses lain, inode berbeda) index lama tidak berlaku,
+        walaupun file baru sudah lebih besar dari posisi scan terakhir.
+        """
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self.identity:
+                self.index = {}
+                self.scanned = 0
+                self.identity = identity
+            elif self.map is not None and len(self.map) == stat.st_size:
+                return
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            # mmap dari fd yang sama dengan fstat: identity selalu cocok dengan isi map
+            if stat.st_size:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _scan(self):
+        """
+        Index record baru sejak posisi scan terakhir
+        """
+        self._remap()
+        if self.map is None:
+            return
+        offset = self.scanned
+        end = len(self.map)
+        while offset + _RECORD.size <= end:
+            key, expires, length = _RECORD.unpack_from(self.map, offset)
+            body_start = offset + _RECORD.size
+            if body_start + length > end:
+                # Record terakhir belum selesai ditulis
+                break
+            self.index[key] = (body_start, length, expires)
+            offset = body_start + length
+        self.scanned = offset
+
+    def get(self, key):
+        with self.lock:
+            self._remap()
+            entry = self.index.get(key)
+            if entry is None:
+                self._scan()
+                entry = self.index.get(key)
+                if entry is None:
+                    return None
+            start, length, expires = entry
+            if expires < time.time():
+                del self.index[key]
+                return None
+            # Header record harus menyimpan key yang sama; jika tidak, index basi
+            stored_key, _, stored_length = _RECORD.unpack_from(self.map, start - _RECORD.size)
+            if stored_key != key or stored_length != length:
+                del self.index[key]
+                return None
+            return bytes(self.map[start:start + length])
+
+    def put(self, key, body, expires):
+        with self.lock:
+            record = _RECORD.pack(key, expires, len(body)) + body
+            # Satu write O_APPEND agar record proses lain tidak menyela
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record)
+            finally:
+                os.close(fd)
+            if os.path.getsize(self.path) > self.max_bytes:
+                self._compact()
+            else:
+                self._scan()
+
+    def _compact(self):
+        """
+        Tulis ulang hanya record yang masih berlaku, terbaru dulu, sampai
+        separuh batas ukuran
+        """
+        self._scan()
+        now = time.time()
+        live = [(key, entry) for key, entry in self.index.items() if entry[2] >= now]
+        live.reverse()
+        budget = self.max_bytes // 2
+        records = []
+        for key, (start, length, expires) in live:
+            if length + _RECORD.size > budget:
+                break
+            budget -= length + _RECORD.size
+            records.append(_RECORD.pack(key, expires, length) + self.map[start:start + length])
+        records.reverse()
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            for record in records:
+                f.write(record)
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        os.replace(tmp, self.path)
+        self.index = {}
+        self.scanned = 0
+        self._scan()
+
+    def __len__(self):
+        return len(self.index)
+
+
+class ResultCache:
+    """
+    Cache LRU in-process untuk body response (byte), dengan batas jumlah
+    entri, TTL dan tier disk opsional
+    """
+
+    def __init__(self, max_entries=1024, ttl=3600.0, disk=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk = disk
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires, body = entry
+                if expires >= now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                del self.entries[key]
+                self.expirations += 1
+
+        if self.disk is not None:
+            body = self.disk.get(key)
+            if body is not None:
+                with self.lock:
+                    self.disk_hits += 1
+                    self._store(key, body, now + self.ttl)
+                return body
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, body):
+        expires = time.time() + self.ttl
+        with self.lock:
+            self._store(key, body, expires)
+        if self.disk is not None:
+            self.disk.put(key, body, expires)
+
+    def _store(self, key, body, expires):
+        self.entries[key] = (expires, body)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "disk_entries": len(self.disk) if self.disk is not None else None
+            }
+
+
+def cache_from_env():
+    """
+    Bangun ResultCache dari environment: RESULT_CACHE_SIZE, RESULT_CACHE_TTL,
+    RESULT_CACHE_DIR (tier disk, opsional) dan RESULT_CACHE_DISK_BYTES
+    """
+    disk = None
+    directory = os.environ.get('RESULT_CACHE_DIR')
+    if directory:
+        disk = DiskStore(directory, int(os.environ.get('RESULT_CACHE_DISK_BYTES', 256 * 1024 * 1024)))
+    return ResultCache(
+        max_entries=int(os.environ.get('RESULT_CACHE_SIZE', 1024)),
+        ttl=float(os.environ.get('RESULT_CACHE_TTL', 3600)),
+        disk=disk
+    )
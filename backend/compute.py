@@ -0,0 +1,189 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+from batch import execute_item, solve_item
+from profiling import profile_call
+
+
+class Overloaded(Exception):
+    """Antrian komputasi penuh; request harus ditolak dengan 503"""
+
+
+class ComputeTimeout(Exception):
+    """Komputasi melewati deadline request"""
+
+    def __init__(self, deadline):
+        super().__init__(f"Komputasi melewati batas {deadline} detik")
+        self.deadline = deadline
+
+
+class ComputeError(Exception):
+    """Solver gagal di worker"""
+
+
+class InvalidInput(ValueError):
+    """Worker menolak input skenario; request harus dijawab 400"""
+
+
+def solve_recorded(item, deadline):
+    """
+    solve_item dengan metrics.Recorder aktif di worker; observasi ikut
+    dikembalikan agar bisa diputar ulang di proses server
+    """
+    recorder = metrics.Recorder()
+    previous = metrics.set_collector(recorder)
+    try:
+        outcome = solve_item(item, deadline)
+    finally:
+        metrics.set_collector(previous)
+    outcome["metrics"] = recorder.events
+    return outcome
+
+
+def solve_profiled(item, deadline):
+    """
+    solve_recorded di bawah cProfile dan tracemalloc; report ikut
+    dikembalikan sebagai outcome["profile"]
+    """
+    outcome, report = profile_call(solve_recorded, item, deadline)
+    outcome["profile"] = report
+    return outcome
+
+
+class ComputePool:
+    """
+    Process pool terbatas untuk pekerjaan solver dari request HTTP. Thread
+    request hanya menunggu hasil sehingga thread lain (mis. halaman statis)
+    tetap dilayani. Jumlah pekerjaan yang belum selesai dibatasi max_pending;
+    jika penuh, run() langsung melempar Overloaded alih-alih mengantri.
+    """
+
+    def __init__(self, workers=None, max_pending=None, deadline=30.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.deadline = deadline
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self):
+        # Dibuat saat pertama dipakai agar aman setelah fork worker server
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self.executor
+
+    def _release(self, future):
+        with self.lock:
+            self.pending -= 1
+        self.slots.release()
+
+    def run(self, item, deadline=None):
+        """
+        Jalankan satu skenario (format item /api/batch) di worker dan
+        kembalikan hasil solver. Slot antrian baru dilepas saat worker benar-
+        benar selesai, jadi request yang timeout tetap dihitung sampai alarm
+        di worker menghentikannya.
+        """
+        task = solve_item if metrics.get_collector() is None else solve_recorded
+        return self._run(task, item, deadline)["result"]
+
+    def run_profiled(self, item, deadline=None):
+        """
+        Seperti run(), tetapi solver di worker diprofile; mengembalikan
+        (hasil, report profile_call)
+        """
+        outcome = self._run(solve_profiled, item, deadline)
+        return outcome["result"], outcome["profile"]
+
+    def execute(self, data, deadline=None):
+        """
+        Jalankan simulasi /api/execute di worker dengan deadline yang sama
+        seperti solver
+        """
+        return self._run(execute_item, data, deadline)["result"]
+
+    def _acquire(self):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise Overloaded()
+        with self.lock:
+            self.pending += 1
+
+    def admit(self):
+        """
+        Tempati satu slot antrian untuk pekerjaan yang berjalan di thread
+        request (mis. stream /api/solve). Melempar Overloaded jika penuh;
+        fungsi yang dikembalikan melepas slot dan harus dipanggil tepat sekali.
+        """
+        self._acquire()
+        return lambda: self._release(None)
+
+    def note_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def _run(self, task, item, deadline):
+        deadline = deadline or self.deadline
+        self._acquire()
+
+        try:
+            future = self._get_executor().submit(task, item, deadline)
+        except BrokenProcessPool:
+            with self.lock:
+                self.executor = None
+            self._release(None)
+            raise ComputeError("Worker pool rusak")
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            outcome = future.result(timeout=deadline + 1)
+        except FutureTimeout:
+            future.cancel()
+            outcome = {"timeout": True}
+        except BrokenProcessPool:
+            with self.lock:
+                self.executor = None
+            raise ComputeError("Worker pool rusak")
+
+        metrics.replay(outcome.get("metrics", ()))
+        if outcome.get("timeout"):
+            self.note_timeout()
+            raise ComputeTimeout(deadline)
+        if outcome.get("invalid"):
+            raise InvalidInput(outcome["error"])
+        if "error" in outcome:
+            raise ComputeError(outcome["error"])
+        return outcome
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "deadline": self.deadline
+            }
+
+
+def pool_from_env():
+    """
+    Bangun ComputePool dari environment: COMPUTE_WORKERS, COMPUTE_QUEUE
+    (batas pekerjaan yang belum selesai) dan COMPUTE_DEADLINE (detik)
+    """
+    workers = int(os.environ.get('COMPUTE_WORKERS', 0)) or None
+    max_pending = int(os.environ.get('COMPUTE_QUEUE', 0)) or None
+    return ComputePool(workers, max_pending, float(os.environ.get('COMPUTE_DEADLINE', 30.0)))
@@ -0,0 +1,184 @@
+from collections import defaultdict
+
+
+def wait_for_graph(dependencies):
+    """
+    Ubah dict dependencies ({proc: {"waits_for": [...]}}) menjadi adjacency list
+    """
+    return {proc: dep.get("waits_for", []) for proc, dep in dependencies.items()}
+
+
+def strongly_connected_components(graph):
+    """
+    Tarjan SCC iteratif dalam O(V+E). graph adalah dict node -> iterable
+    tetangga; tetangga yang bukan key dianggap tidak punya edge keluar.
+    Anggota setiap komponen diurutkan sesuai urutan key pada graph.
+    """
+    order = {node: k for k, node in enumerate(graph)}
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+
+        while work:
+            node, neighbors = work[-1]
+            descended = False
+            for nb in neighbors:
+                if nb not in index:
+                    index[nb] = low[nb] = counter
+                    counter += 1
+                    stack.append(nb)
+                    on_stack.add(nb)
+                    work.append((nb, iter(graph.get(nb, ()))))
+                    descended = True
+                    break
+                if nb in on_stack and index[nb] < low[node]:
+                    low[node] = index[nb]
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    component.append(w)
+                    if w == node:
+                        break
+                component.sort(key=lambda v: order.get(v, len(order)))
+                components.append(component)
+
+    return components
+
+
+def cyclic_components(graph):
+    """
+    SCC yang mengandung siklus (ukuran > 1 atau punya self-loop): himpunan
+    proses yang saling menunggu, diurutkan sesuai anggota pertamanya
+    """
+    order = {node: k for k, node in enumerate(graph)}
+    knots = [
+        c for c in strongly_connected_components(graph)
+        if len(c) > 1 or c[0] in graph.get(c[0], ())
+    ]
+    knots.sort(key=lambda c: order.get(c[0], len(order)))
+    return knots
+
+
+def _unblock(node, blocked, blocked_by):
+    stack = [node]
+    while stack:
+        v = stack.pop()
+        if v in blocked:
+            blocked.discard(v)
+            stack.extend(blocked_by[v])
+            blocked_by[v].clear()
+
+
+def _cycles_from(subgraph, start):
+    """
+    Satu iterasi algoritma Johnson: semua siklus elementer yang melalui start
+    """
+    path = [start]
+    blocked = {start}
+    closed = set()
+    blocked_by = defaultdict(set)
+    stack = [(start, list(subgraph[start]))]
+
+    while stack:
+        node, neighbors = stack[-1]
+        if neighbors:
+            nxt = neighbors.pop()
+            if nxt == start:
+                yield path[:]
+                closed.update(path)
+            elif nxt not in blocked:
+                path.append(nxt)
+                stack.append((nxt, list(subgraph[nxt])))
+                closed.discard(nxt)
+                blocked.add(nxt)
+                continue
+        if not neighbors:
+            if node in closed:
+                _unblock(node, blocked, blocked_by)
+            else:
+                for nb in subgraph[node]:
+                    blocked_by[nb].add(node)
+            stack.pop()
+            path.pop()
+
+
+def _bounded_cycles_from(subgraph, start, max_length):
+    """
+    Backtracking dengan batas panjang; blocking Johnson tidak valid jika
+    panjang path dibatasi, sehingga di sini tidak dipakai
+    """
+    path = [start]
+    on_path = {start}
+    stack = [iter(subgraph[start])]
+
+    while stack:
+        nxt = next(stack[-1], None)
+        if nxt is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if nxt == start:
+            yield path[:]
+        elif nxt not in on_path and len(path) < max_length:
+            path.append(nxt)
+            on_path.add(nxt)
+            stack.append(iter(subgraph[nxt]))
+
+
+def elementary_cycles(graph, max_cycles=None, max_length=None):
+    """
+    Enumerasi siklus elementer secara lazy (algoritma Johnson), dibatasi
+    max_cycles dan max_length (jumlah proses dalam siklus). Setiap siklus
+    dikembalikan dalam format circular_waits: [P1, P2, ..., P1].
+    """
+    if max_cycles is not None and max_cycles <= 0:
+        return
+    emitted = 0
+    order = {node: k for k, node in enumerate(graph)}
+    adjacency = {
+        v: [w for w in graph.get(v, ()) if w in order]
+        for v in graph
+    }
+
+    pending = cyclic_components(adjacency)
+    while pending:
+        component = pending.pop(0)
+        members = set(component)
+        subgraph = {v: [w for w in adjacency[v] if w in members] for v in component}
+        start = component[0]
+
+        if max_length is None:
+            found = _cycles_from(subgraph, start)
+        else:
+            found = _bounded_cycles_from(subgraph, start, max_length)
+        for cycle in found:
+            yield cycle + [start]
+            emitted += 1
+            if max_cycles is not None and emitted >= max_cycles:
+                return
+
+        # Buang start lalu cari SCC baru pada sisa komponen
+        remainder = {v: [w for w in subgraph[v] if w != start] for v in component if v != start}
+        pending[:0] = cyclic_components(remainder)
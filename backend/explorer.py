@@ -0,0 +1,351 @@
+import heapq
+import time
+
+EXACT_LIMIT = 25
+# Batas sisi server untuk opsi request explore_safe_sequences
+MAX_SEQUENCES = 100
+MAX_TIME_BUDGET = 5.0
+MAX_STATES = 1_000_000
+MAX_BEAM_WIDTH = 256
+
+
+class ExplorationLimit(Exception):
+    """Batas waktu atau jumlah state tercapai"""
+
+
+class Cost:
+    """
+    Fungsi biaya safe sequence: step(i, position, work) untuk setiap proses
+    yang dieksekusi, digabung dengan "sum" atau "max". Karena biaya langkah
+    hanya bergantung pada himpunan proses yang sudah selesai (lewat work dan
+    position), biaya optimal bisa dihitung dengan DP per himpunan.
+
+    estimate(mask, position, work) opsional: batas bawah biaya sisa, dipakai
+    beam search agar tidak hanya mengejar biaya sejauh ini.
+    """
+
+    def __init__(self, name, step, combine="sum", estimate=None):
+        if combine not in ("sum", "max"):
+            raise ValueError("combine harus 'sum' atau 'max'")
+        self.name = name
+        self.step = step
+        self.combine = combine
+        self.estimate = estimate
+
+    def join(self, a, b):
+        return a + b if self.combine == "sum" else max(a, b)
+
+    @property
+    def identity(self):
+        # Biaya langkah diasumsikan non-negatif
+        return 0
+
+
+def peak_cost(explorer):
+    """
+    Puncak unit yang terpakai pada resource mana pun: saat proses i berjalan
+    ia memegang seluruh max_need-nya, sehingga terpakai = total - work + need
+    """
+    total = explorer.total
+    need = explorer.need
+
+    peak_need = [max(row, default=0) for row in need]
+
+    def step(i, position, work):
+        need_i = need[i]
+        return max((total[j] - work[j] + need_i[j] for j in range(len(work))), default=0)
+
+    def estimate(mask, position, work):
+        # Proses sisa paling tidak memakai need-nya sendiri
+        return max((peak_need[i] for i in range(len(need)) if not mask >> i & 1), default=0)
+
+    return Cost("peak", step, "max", estimate)
+
+
+def priority_cost(explorer, priorities):
+    """
+    Weighted completion time: proses berprioritas tinggi sebaiknya selesai dulu.
+    priorities berupa dict {proses: bobot angka}; bentuk lain ValueError.
+    """
+    if not isinstance(priorities, dict):
+        raise ValueError("priorities harus berupa dict proses -> bobot")
+    weights = [priorities.get(p, 0) for p in explorer.processes]
+    if any(isinstance(w, bool) or not isinstance(w, (int, float)) for w in weights):
+        raise ValueError("bobot priorities harus berupa angka")
+
+    def step(i, position, work):
+        return weights[i] * (position + 1)
+
+    def estimate(mask, position, work):
+        # Tanpa memperhatikan safety: bobot terbesar di posisi paling awal
+        remaining = sorted((weights[i] for i in range(len(weights)) if not mask >> i & 1), reverse=True)
+        return sum(w * (position + k + 1) for k, w in enumerate(remaining))
+
+    return Cost("priority", step, "sum", estimate)
+
+
+class SafeSequenceExplorer:
+    """
+    Eksplorasi safe sequence dengan model state bankers_algorithm: work hanya
+    bergantung pada himpunan proses yang sudah selesai, jadi himpunan tersebut
+    (bitmask) menjadi key memoization.
+
+    Dari state aman, setiap proses yang runnable tetap menghasilkan state aman
+    (work tidak pernah berkurang), sehingga enumerasi tidak pernah buntu.
+    """
+
+    def __init__(self, processes, resources, allocation, max_need, available,
+                 time_budget=1.0, max_states=1_000_000):
+        self.processes = list(processes)
+        self.resources = list(resources)
+        self.allocation = [list(row) for row in allocation]
+        self.need = [[mx - a for mx, a in zip(max_need[i], allocation[i])]
+                     for i in range(len(self.processes))]
+        self.available = list(available)
+        self.total = self.available[:]
+        for row in self.allocation:
+            for j, a in enumerate(row):
+                self.total[j] += a
+        self.full = (1 << len(self.processes)) - 1
+        self.time_budget = time_budget
+        self.max_states = max_states
+        self.states = 0
+        self.deadline = None
+        self.limited = False
+
+    # ------------------------------------------------------------------
+    # Helper
+    # ------------------------------------------------------------------
+
+    def _start(self):
+        self.states = 0
+        self.limited = False
+        self.deadline = time.monotonic() + self.time_budget if self.time_budget else None
+
+    def _visit(self):
+        self.states += 1
+        if self.max_states and self.states > self.max_states:
+            raise ExplorationLimit("Batas jumlah state tercapai")
+        if self.deadline is not None and self.states % 256 == 0 and time.monotonic() > self.deadline:
+            raise ExplorationLimit("Batas waktu tercapai")
+
+    def _runnable(self, mask, work):
+        need = self.need
+        for i in range(len(self.processes)):
+            if not mask >> i & 1 and all(n <= w for n, w in zip(need[i], work)):
+                yield i
+
+    def _after(self, i, work):
+        return [w + a for w, a in zip(work, self.allocation[i])]
+
+    def is_safe(self):
+        """
+        Greedy seperti bankers_algorithm: state aman jika semua proses selesai
+        """
+        mask = 0
+        work = self.available
+        for _ in range(len(self.processes)):
+            i = next(self._runnable(mask, work), None)
+            if i is None:
+                return False
+            mask |= 1 << i
+            work = self._after(i, work)
+        return True
+
+    # ------------------------------------------------------------------
+    # Enumerasi dan penghitungan
+    # ------------------------------------------------------------------
+
+    def enumerate(self, limit=None):
+        """
+        Yield safe sequence secara lazy dalam urutan leksikografis indeks;
+        sequence pertama sama dengan hasil bankers_algorithm. Dibatasi
+        time_budget dan max_states seperti count(); jika batas tercapai
+        enumerasi berhenti dan limited bernilai True.
+        """
+        n = len(self.processes)
+        if not self.is_safe() or limit is not None and limit <= 0:
+            return
+        if n == 0:
+            yield []
+            return
+        self._start()
+        sequence = []
+        works = [self.available]
+        stack = [self._runnable(0, self.available)]
+        mask = 0
+        produced = 0
+        while stack:
+            i = next(stack[-1], None)
+            if i is None:
+                stack.pop()
+                works.pop()
+                if sequence:
+                    mask &= ~(1 << sequence.pop())
+                continue
+            try:
+                self._visit()
+            except ExplorationLimit:
+                self.limited = True
+                return
+            sequence.append(i)
+            mask |= 1 << i
+            work = self._after(i, works[-1])
+            if len(sequence) == n:
+                yield [self.processes[q] for q in sequence]
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+                mask &= ~(1 << sequence.pop())
+                continue
+            works.append(work)
+            stack.append(self._runnable(mask, work))
+
+    def count(self):
+        """
+        Jumlah safe sequence dengan DP bitmask. Mengembalikan None jika
+        n > EXACT_LIMIT atau batas waktu/state tercapai.
+        """
+        if len(self.processes) > EXACT_LIMIT:
+            return None
+        self._start()
+        memo = {self.full: 1}
+
+        def walk(mask, work):
+            cached = memo.get(mask)
+            if cached is not None:
+                return cached
+            self._visit()
+            total = 0
+            for i in self._runnable(mask, work):
+                total += walk(mask | 1 << i, self._after(i, work))
+            memo[mask] = total
+            return total
+
+        try:
+            return walk(0, self.available)
+        except ExplorationLimit:
+            return None
+
+    def best(self, cost, beam_width=64):
+        """
+        Safe sequence dengan biaya minimum. Eksak dengan DP bitmask untuk
+        n <= EXACT_LIMIT; selebihnya, atau jika batas tercapai, beam search.
+        Mengembalikan (sequence, biaya, eksak) atau (None, None, True) jika
+        state tidak aman.
+        """
+        if not self.is_safe():
+            return None, None, True
+        if len(self.processes) <= EXACT_LIMIT:
+            try:
+                sequence, value = self._best_exact(cost)
+                return sequence, value, True
+            except ExplorationLimit:
+                pass
+        sequence, value = self._beam(cost, beam_width)
+        return sequence, value, False
+
+    def _best_exact(self, cost):
+        self._start()
+        memo = {self.full: (cost.identity, None)}
+
+        def walk(mask, work, position):
+            cached = memo.get(mask)
+            if cached is not None:
+                return cached[0]
+            self._visit()
+            best_value = None
+            best_next = None
+            for i in self._runnable(mask, work):
+                value = cost.join(cost.step(i, position, work),
+                                  walk(mask | 1 << i, self._after(i, work), position + 1))
+                if best_value is None or value < best_value:
+                    best_value, best_next = value, i
+            memo[mask] = (best_value, best_next)
+            return best_value
+
+        value = walk(0, self.available, 0)
+        sequence = []
+        mask = 0
+        while mask != self.full:
+            i = memo[mask][1]
+            sequence.append(self.processes[i])
+            mask |= 1 << i
+        return sequence, value
+
+    def _beam(self, cost, beam_width):
+        """
+        Beam search per level: simpan beam_width state terbaik (satu per
+        himpunan proses selesai) berdasarkan biaya sejauh ini
+        """
+        estimate = cost.estimate
+        beam = [(cost.identity, 0, self.available, [])]
+        for position in range(len(self.processes)):
+            candidates = {}
+            for value, mask, work, sequence in beam:
+                for i in self._runnable(mask, work):
+                    next_value = cost.join(value, cost.step(i, position, work))
+                    next_mask = mask | 1 << i
+                    current = candidates.get(next_mask)
+                    if current is None or next_value < current[0]:
+                        candidates[next_mask] = (next_value, next_mask, self._after(i, work), sequence + [i])
+            if estimate is None:
+                key = lambda c: (c[0], c[3])
+            else:
+                key = lambda c: (cost.join(c[0], estimate(c[1], position + 1, c[2])), c[3])
+            beam = heapq.nsmallest(beam_width, candidates.values(), key=key)
+        value, _, _, sequence = beam[0]
+        return [self.processes[i] for i in sequence], value
+
+
+def _clamp(value, default, maximum):
+    """
+    Opsi numerik dari request: None memakai default, nilai di luar
+    (0, maximum] dibatasi ke maximum agar klien tidak bisa mematikan batas
+    """
+    if value is None:
+        return default
+    value = float(value)
+    return value if 0 < value <= maximum else maximum
+
+
+def explore_safe_sequences(data):
+    """
+    Ringkasan eksplorasi untuk satu skenario: jumlah safe sequence, beberapa
+    contoh sequence dan sequence terbaik menurut cost ("peak", "priority"
+    dengan data['priorities'])
+    """
+    explorer = SafeSequenceExplorer(
+        data['processes'], data['resources'], data['allocation'], data['max_need'], data['available'],
+        time_budget=_clamp(data.get('time_budget'), 1.0, MAX_TIME_BUDGET),
+        max_states=int(_clamp(data.get('max_states'), MAX_STATES, MAX_STATES))
+    )
+    cost_name = data.get('cost', 'peak')
+    if cost_name == 'peak':
+        cost = peak_cost(explorer)
+    elif cost_name == 'priority':
+        cost = priority_cost(explorer, data.get('priorities', {}))
+    else:
+        raise ValueError("cost harus 'peak' atau 'priority'")
+
+    safe = explorer.is_safe()
+    count = explorer.count() if safe else 0
+    count_states = explorer.states
+    sequence, value, exact = explorer.best(cost, int(_clamp(data.get('beam_width'), 64, MAX_BEAM_WIDTH)))
+    limit = data.get('limit')
+    limit = 10 if limit is None else min(max(int(limit), 0), MAX_SEQUENCES)
+    sequences = list(explorer.enumerate(limit))
+    return {
+        "safe": safe,
+        "count": count,
+        "count_exact": count is not None,
+        "states_visited": count_states,
+        "sequences": sequences,
+        "sequences_truncated": explorer.limited,
+        "best": {
+            "cost": cost.name,
+            "sequence": sequence,
+            "value": value,
+            "exact": exact
+        }
+    }
@@ -0,0 +1,330 @@
+import hashlib
+import json
+import random
+import struct
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional; tanpa NumPy dipakai jalur pure-Python
+    np = None
+
+# Format corpus biner: header file lalu record per skenario, semua little-endian
+CORPUS_MAGIC = b'DLKC'
+CORPUS_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sI')
+_RECORD_HEADER = struct.Struct('<III')
+
+DEADLOCK_PROBABILITY = 0.7
+
+
+class _Draws:
+    """
+    Sumber acak per skenario yang sama untuk jalur NumPy dan pure-Python:
+    setiap jenis undian dibaca dari SHAKE-256 atas (seed, index, nama)
+    sehingga seed yang sama selalu menghasilkan skenario yang sama, dengan
+    atau tanpa NumPy. Skenario ke-index pada stream diturunkan dari seed
+    sehingga stream bisa diulang dan dilanjutkan dari posisi mana pun.
+    """
+
+    def __init__(self, seed, index=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.key = f"{seed}" if index is None else f"{seed}:{index}"
+
+    def bytes(self, name, count):
+        return hashlib.shake_256(f"{self.key}:{name}".encode('utf-8')).digest(count)
+
+    def uint8(self, name, count):
+        if np is not None:
+            return np.frombuffer(self.bytes(name, count), dtype=np.uint8)
+        return self.bytes(name, count)
+
+    def _words(self, name, count, size, dtype, typecodes):
+        data = self.bytes(name, size * count)
+        if np is not None:
+            return np.frombuffer(data, dtype=dtype)
+        values = next(array(code) for code in typecodes if array(code).itemsize == size)
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def uint16(self, name, count):
+        return self._words(name, count, 2, '<u2', 'HI')
+
+    def uint32(self, name, count):
+        return self._words(name, count, 4, '<u4', 'IL')
+
+    def chance(self, name, probability):
+        return int.from_bytes(self.bytes(name, 4), 'little') < probability * 2 ** 32
+
+    def sample(self, name, population, k):
+        """
+        k indeks berbeda dari range(population), urutan undian dipertahankan
+        """
+        picked = []
+        for value in self.uint32(name, 8 * k).tolist():
+            value %= population
+            if value not in picked:
+                picked.append(value)
+                if len(picked) == k:
+                    return picked
+        # Sangat jarang: lengkapi dengan indeks terkecil yang belum terpilih
+        picked.extend(v for v in range(population) if v not in picked)
+        return picked[:k]
+
+
+def _generate_numpy(draws, n, m, c):
+    total = (draws.uint8("total", m) & 3).astype(np.int32) + 2
+    core_of = (draws.uint32("core", n) % c).astype(np.int32)
+
+    # Alokasi: proses mengambil 0-3 unit secara berurutan sampai resource habis
+    proposal = (draws.uint8("proposal", n * m) & 3).astype(np.int32).reshape(n, m)
+    taken_before = np.cumsum(proposal, axis=0, dtype=np.int64) - proposal
+    allocation = np.clip(total - taken_before, 0, proposal).astype(np.int32)
+    extra = (draws.uint16("extra", n * m) % 3).astype(np.int32).reshape(n, m)
+    max_need = allocation + extra
+    available = total - allocation.sum(axis=0, dtype=np.int64).astype(np.int32)
+
+    if n >= 2 and m >= 2 and draws.chance("deadlock", DEADLOCK_PROBABILITY):
+        k = min(3, n, m)
+        _inject_cycle(allocation, max_need, available, total,
+                      draws.sample("procs", n, k), draws.sample("res", m, k))
+    return allocation, max_need, available, core_of
+
+
+def _generate_python(draws, n, m, c):
+    total = [(b & 3) + 2 for b in draws.uint8("total", m)]
+    core_of = [v % c for v in draws.uint32("core", n)]
+
+    # Kebutuhan tambahan 0-2 per sel, diambil sekaligus
+    extra = [v % 3 for v in draws.uint16("extra", n * m)]
+    allocation = [[0] * m for _ in range(n)]
+    max_need = [extra[i * m:(i + 1) * m] for i in range(n)]
+    available = total[:]
+
+    # Alokasi: proses mengambil 0-3 unit secara berurutan sampai resource
+    # habis, sehingga hanya beberapa proses pertama per resource yang disentuh
+    proposal = draws.uint8("proposal", n * m)
+    for j in range(m):
+        left = total[j]
+        for i in range(n):
+            if left <= 0:
+                break
+            amount = min(proposal[i * m + j] & 3, left)
+            allocation[i][j] = amount
+            max_need[i][j] += amount
+            left -= amount
+        available[j] = left
+
+    if n >= 2 and m >= 2 and draws.chance("deadlock", DEADLOCK_PROBABILITY):
+        k = min(3, n, m)
+        _inject_cycle(allocation, max_need, available, total,
+                      draws.sample("procs", n, k), draws.sample("res", m, k))
+    return allocation, max_need, available, core_of
+
+
+def _inject_cycle(allocation, max_need, available, total, procs, res):
+    """
+    Bentuk circular wait secara eksplisit dalam O(k): proses procs[i] memegang
+    res[i] dan membutuhkan res[i+1] lebih banyak dari yang bisa dilepas
+    selama procs[i+1] masih memegangnya
+    """
+    k = len(procs)
+    for i in range(k):
+        p, r = procs[i], res[i]
+        if allocation[p][r] == 0:
+            if available[r] > 0:
+                available[r] -= 1
+            else:
+                # Ambil satu unit dari holder lain agar total tetap konsisten
+                donor = next(q for q in range(len(allocation)) if allocation[q][r] > 0)
+                allocation[donor][r] -= 1
+                max_need[donor][r] -= 1
+            allocation[p][r] = 1
+            max_need[p][r] = max(max_need[p][r], 1)
+    for i in range(k):
+        p, r = procs[i], res[(i + 1) % k]
+        nxt = procs[(i + 1) % k]
+        # Butuh lebih dari semua unit r kecuali yang dipegang proses berikutnya
+        max_need[p][r] = int(total[r]) - int(allocation[nxt][r]) + 1
+
+
+def generate_matrices(num_processes, num_resources, num_cores, seed=None, index=None):
+    """
+    Generate matriks satu skenario. Dengan NumPy hasilnya array int32
+    (allocation/max_need berukuran n x m), tanpa NumPy berupa list; isinya
+    sama untuk seed dan index yang sama.
+    Mengembalikan (allocation, max_need, available, core_of).
+    """
+    draws = _Draws(seed, index)
+    if np is not None:
+        return _generate_numpy(draws, num_processes, num_resources, num_cores)
+    return _generate_python(draws, num_processes, num_resources, num_cores)
+
+
+def _tolist(value):
+    return value.tolist() if hasattr(value, 'tolist') else value
+
+
+def to_scenario(allocation, max_need, available, core_of, num_cores):
+    """
+    Ubah matriks menjadi dict skenario dengan format /api/generate
+    """
+    allocation = _tolist(allocation)
+    max_need = _tolist(max_need)
+    available = _tolist(available)
+    core_of = _tolist(core_of)
+    n = len(allocation)
+    m = len(available)
+
+    processes = [f'P{i+1}' for i in range(n)]
+    resources = [f'R{j+1}' for j in range(m)]
+    cores = [f'Core{c+1}' for c in range(num_cores)]
+    totals = available[:]
+    for row in allocation:
+        for j in range(m):
+            if row[j]:
+                totals[j] += row[j]
+
+    return {
+        "processes": processes,
+        "resources": resources,
+        "cores": cores,
+        "process_core_mapping": {processes[i]: cores[core_of[i]] for i in range(n)},
+        "allocation": allocation,
+        "max_need": max_need,
+        "need": [[mx - a for mx, a in zip(max_need[i], allocation[i])] for i in range(n)],
+        "available": available,
+        "total_resources": {res: totals[j] for j, res in enumerate(resources)}
+    }
+
+
+def generate_scenario(num_processes, num_resources, num_cores, seed=None, index=None):
+    """
+    Generate satu skenario siap-JSON; seed yang sama selalu menghasilkan
+    skenario yang sama
+    """
+    matrices = generate_matrices(num_processes, num_resources, num_cores, seed, index)
+    return to_scenario(*matrices, num_cores)
+
+
+def iter_scenarios(num_processes, num_resources, num_cores, seed, start=0):
+    """
+    Stream skenario tanpa batas; skenario ke-i selalu sama untuk seed yang sama
+    """
+    index = start
+    while True:
+        yield generate_scenario(num_processes, num_resources, num_cores, seed, index)
+        index += 1
+
+
+def write_ndjson(f, scenarios, count):
+    """
+    Tulis count skenario dari stream ke file teks sebagai NDJSON
+    """
+    for _, scenario in zip(range(count), scenarios):
+        f.write(json.dumps(scenario))
+        f.write("\n")
+
+
+def _int32(values):
+    if np is not None and hasattr(values, 'astype'):
+        return np.ascontiguousarray(values, dtype='<i4').tobytes()
+    flat = array('i')
+    for row in values:
+        if isinstance(row, (list, tuple)):
+            flat.extend(row)
+        else:
+            flat.append(row)
+    if flat.itemsize != 4:
+        raise ValueError("Platform tidak mendukung int32 untuk array('i')")
+    if sys.byteorder == 'big':
+        flat.byteswap()
+    return flat.tobytes()
+
+
+def write_corpus(f, num_processes, num_resources, num_cores, seed, count, start=0):
+    """
+    Tulis corpus biner ke file biner f: header file lalu per skenario
+    (n, m, cores) diikuti allocation, max_need, available dan core_of
+    sebagai int32 little-endian
+    """
+    f.write(_FILE_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION))
+    for index in range(start, start + count):
+        allocation, max_need, available, core_of = generate_matrices(
+            num_processes, num_resources, num_cores, seed, index
+        )
+        f.write(_RECORD_HEADER.pack(num_processes, num_resources, num_cores))
+        for values in (allocation, max_need, available, core_of):
+            f.write(_int32(values))
+
+
+def _read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Corpus terpotong")
+    return data
+
+
+def _unpack(data, rows, cols):
+    if np is not None:
+        values = np.frombuffer(data, dtype='<i4')
+        return values.reshape(rows, cols) if cols else values
+    flat = array('i')
+    flat.frombytes(data)
+    if sys.byteorder == 'big':
+        flat.byteswap()
+    if not cols:
+        return flat.tolist()
+    return [flat[i * cols:(i + 1) * cols].tolist() for i in range(rows)]
+
+
+def read_corpus(f):
+    """
+    Baca corpus biner; yield (allocation, max_need, available, core_of, num_cores)
+    """
+    magic, version = _FILE_HEADER.unpack(_read_exact(f, _FILE_HEADER.size))
+    if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+        raise ValueError("Bukan file corpus skenario yang valid")
+    while True:
+        header = f.read(_RECORD_HEADER.size)
+        if not header:
+            return
+        if len(header) != _RECORD_HEADER.size:
+            raise ValueError("Corpus terpotong")
+        n, m, c = _RECORD_HEADER.unpack(header)
+        allocation = _unpack(_read_exact(f, 4 * n * m), n, m)
+        max_need = _unpack(_read_exact(f, 4 * n * m), n, m)
+        available = _unpack(_read_exact(f, 4 * m), m, 0)
+        core_of = _unpack(_read_exact(f, 4 * n), n, 0)
+        yield allocation, max_need, available, core_of, c
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate corpus skenario deadlock")
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--resources", type=int, default=3)
+    parser.add_argument("--cores", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--format", choices=["ndjson", "corpus"], default="ndjson")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args(argv)
+
+    if args.format == "ndjson":
+        with open(args.output, 'w') as f:
+            scenarios = iter_scenarios(args.processes, args.resources, args.cores, args.seed)
+            write_ndjson(f, scenarios, args.count)
+    else:
+        with open(args.output, 'wb') as f:
+            write_corpus(f, args.processes, args.resources, args.cores, args.seed, args.count)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
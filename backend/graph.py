@@ -0,0 +1,32 @@
+def resource_holders(allocation, num_resources, members):
+    """
+    Indeks terbalik resource -> proses (anggota members) yang memegangnya.
+    Urutan holder per resource mengikuti urutan members.
+    """
+    holders = [[] for _ in range(num_resources)]
+    for i in members:
+        row = allocation[i]
+        for j in range(num_resources):
+            if row[j] > 0:
+                holders[j].append(i)
+    return holders
+
+
+def build_wait_for(need, holders, members):
+    """
+    Bangun wait-for graph: proses i menunggu proses q jika q memegang resource
+    yang masih dibutuhkan i. Hanya resource yang benar-benar dibutuhkan i yang
+    ditelusuri, sehingga biayanya O(sum kebutuhan x holder) bukan O(n^2 m).
+    Mengembalikan dict i -> set proses yang ditunggu.
+    """
+    waits_for = {}
+    for i in members:
+        edges = set()
+        row = need[i]
+        for j in range(len(holders)):
+            if row[j] > 0:
+                edges.update(holders[j])
+        edges.discard(i)
+        waits_for[i] = edges
+    return waits_for
+
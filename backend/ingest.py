@@ -0,0 +1,346 @@
+"""
+Ingest streaming body JSON skenario berukuran besar.
+
+request.json membangun seluruh pohon objek Python sebelum solver mulai;
+untuk matriks 100k x 500 itu gigabyte int ter-box. Di sini body dibaca per
+chunk (di-decompress dulu jika Content-Encoding: gzip), allocation dan
+max_need di-parse per blok baris langsung ke buffer int32 scenario.Matrix,
+dan bentuk serta nilai negatif diperiksa begitu baris tiba. Peak memori
+sebanding dengan ukuran matriks packed ditambah satu chunk.
+
+Nilai lain (nama proses/resource, available, opsi) kecil dan di-parse
+dengan json biasa. Batas ukuran:
+    INGEST_MAX_BYTES  : body setelah decompress (default 1 GiB)
+    INGEST_MAX_CELLS  : total sel matriks (default 2^28)
+    STREAM_MIN_BYTES  : body JSON tanpa gzip yang lebih kecil dari ini tetap
+                        lewat request.json (default 1 MiB)
+"""
+import hashlib
+import json
+import os
+import re
+import zlib
+from array import array
+
+from scenario import Matrix, Scenario
+
+CHUNK_SIZE = 1 << 16
+
+MAX_BYTES = int(os.environ.get('INGEST_MAX_BYTES', 1 << 30))
+MAX_CELLS = int(os.environ.get('INGEST_MAX_CELLS', 1 << 28))
+STREAM_MIN_BYTES = int(os.environ.get('STREAM_MIN_BYTES', 1 << 20))
+
+# Batas satu nilai non-matriks (mis. list nama proses) di buffer
+MAX_VALUE_BYTES = 64 * 1024 * 1024
+
+GZIP_ENCODINGS = ('gzip', 'x-gzip')
+
+_REQUIRED = ('processes', 'resources', 'allocation', 'max_need', 'available')
+_MATRIX_KEYS = ('allocation', 'max_need', 'need')
+
+_SPACE = re.compile(rb'[ \t\r\n]*')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+# Penutup baris terakhir diikuti penutup matriks; baris hanya berisi angka
+_MATRIX_END = re.compile(rb'\][ \t\r\n]*\]')
+
+_DECODER = json.JSONDecoder()
+# Karakter yang masih bisa melanjutkan angka JSON ("1500." atau "1e" terpotong)
+_NUMBER_TAIL = frozenset('0123456789.eE+-')
+
+
+class IngestError(ValueError):
+    """Body skenario tidak valid"""
+
+
+class PayloadTooLarge(IngestError):
+    """Body skenario melebihi batas ukuran"""
+
+
+def streamable(encoding, content_length, min_bytes=STREAM_MIN_BYTES):
+    """
+    True jika body JSON sebaiknya dibaca lewat read_scenario: body gzip,
+    body tanpa Content-Length (chunked) atau body berukuran besar
+    """
+    return (encoding or '').lower() in GZIP_ENCODINGS or content_length is None \
+        or content_length >= min_bytes
+
+
+class _Source:
+    """
+    Buffer byte di atas stream body; byte yang sudah dikonsumsi dibuang
+    secara berkala sehingga buffer tetap sekitar satu chunk
+    """
+
+    def __init__(self, stream, gzip, max_bytes, digest):
+        self.stream = stream
+        self.inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzip else None
+        self.max_bytes = max_bytes
+        self.digest = digest
+        self.buffer = bytearray()
+        self.pos = 0
+        self.total = 0
+        self.cells = 0
+        self.eof = False
+
+    def _read(self):
+        if self.inflate is None:
+            return self.stream.read(CHUNK_SIZE)
+        # Output decompress dibatasi per panggilan agar gzip bomb berhenti
+        # di max_bytes, bukan setelah semuanya di-inflate
+        try:
+            while True:
+                if self.inflate.unconsumed_tail:
+                    compressed = self.inflate.unconsumed_tail
+                elif self.inflate.eof:
+                    return b''
+                else:
+                    compressed = self.stream.read(CHUNK_SIZE)
+                    if not compressed:
+                        raise IngestError("body gzip terpotong")
+                data = self.inflate.decompress(compressed, CHUNK_SIZE)
+                if data:
+                    return data
+        except zlib.error as e:
+            raise IngestError(f"body gzip tidak valid: {e}")
+
+    def fill(self):
+        """
+        Tambah satu chunk ke buffer; False jika body sudah habis
+        """
+        if self.eof:
+            return False
+        data = self._read()
+        if not data:
+            self.eof = True
+            return False
+        self.total += len(data)
+        if self.total > self.max_bytes:
+            raise PayloadTooLarge(f"body melebihi {self.max_bytes} byte")
+        if self.digest is not None:
+            self.digest.update(data)
+        if self.pos > CHUNK_SIZE and 2 * self.pos > len(self.buffer):
+            del self.buffer[:self.pos]
+            self.pos = 0
+        self.buffer += data
+        return True
+
+    def offset(self):
+        return self.total - (len(self.buffer) - self.pos)
+
+    def peek(self):
+        """
+        Byte non-whitespace berikutnya tanpa mengonsumsinya, atau None di akhir body
+        """
+        while True:
+            self.pos = _SPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != ord(char):
+            got = "akhir body" if found is None else repr(chr(found))
+            raise IngestError(f"diharapkan '{char}' di byte {self.offset()}, ditemukan {got}")
+        self.pos += 1
+
+    def more(self, pending):
+        """
+        Baca sampai buffer setelah pos bertambah sekitar dua kali lipat agar
+        parse ulang nilai yang terpotong tetap linear
+        """
+        if pending > MAX_VALUE_BYTES:
+            raise PayloadTooLarge(f"satu nilai melebihi {MAX_VALUE_BYTES} byte")
+        target = len(self.buffer) - self.pos + max(pending, CHUNK_SIZE)
+        grew = False
+        while len(self.buffer) - self.pos < target and self.fill():
+            grew = True
+        return grew
+
+    def key(self):
+        if self.peek() != ord('"'):
+            raise IngestError(f"diharapkan key string di byte {self.offset()}")
+        while True:
+            match = _STRING.match(self.buffer, self.pos)
+            if match is not None:
+                break
+            if not self.more(len(self.buffer) - self.pos):
+                raise IngestError("body terpotong di tengah key")
+        self.pos = match.end()
+        return json.loads(match.group())
+
+    def value(self):
+        """
+        Satu nilai JSON utuh dengan json biasa; nilai yang terpotong di akhir
+        buffer di-parse ulang setelah buffer ditambah
+        """
+        if self.peek() is None:
+            raise IngestError("body terpotong, nilai tidak ada")
+        while True:
+            pending = bytes(self.buffer[self.pos:])
+            error = None
+            try:
+                text = pending.decode('utf-8')
+            except UnicodeDecodeError as e:
+                # Karakter multi-byte bisa terpotong di batas chunk
+                text = pending[:e.start].decode('utf-8')
+                error = e
+            try:
+                value, end = _DECODER.raw_decode(text)
+            except ValueError as e:
+                error = e
+            else:
+                # Angka di akhir buffer mungkin masih berlanjut di chunk
+                # berikutnya, termasuk yang terpotong setelah '.' atau 'e'
+                number = type(value) in (int, float)
+                if self.eof or (end < len(text) and not (number and text[end] in _NUMBER_TAIL)):
+                    self.pos += len(text[:end].encode('utf-8'))
+                    return value
+            if not self.more(len(pending)):
+                if isinstance(error, UnicodeDecodeError):
+                    raise IngestError("body bukan UTF-8 yang valid")
+                if error is None:
+                    self.pos += len(text[:end].encode('utf-8'))
+                    return value
+                raise IngestError(f"JSON tidak valid: {error}")
+
+    def matrix(self, name, cols, max_cells):
+        """
+        Parse list of list int non-negatif per blok baris ke Matrix. cols
+        None berarti lebar diambil dari baris pertama.
+        """
+        self.expect('[')
+        data = array('i')
+        rows = 0
+        if self.peek() == ord(']'):
+            self.pos += 1
+            return Matrix(data, 0, cols or 0)
+        while True:
+            end = self._rows_end()
+            block = self.buffer[self.pos:end]
+            try:
+                parsed = json.loads(b'[' + block + b']')
+            except ValueError as e:
+                raise IngestError(f"{name} baris {rows}: JSON tidak valid ({e})")
+            for row in parsed:
+                if type(row) is not list:
+                    raise IngestError(f"{name} harus berupa matriks (list of list)")
+                if cols is None:
+                    cols = len(row)
+                if len(row) != cols:
+                    raise IngestError(f"{name} baris {rows} harus memiliki {cols} kolom, bukan {len(row)}")
+                try:
+                    if row and min(row) < 0:
+                        raise IngestError(f"{name} baris {rows} berisi nilai negatif")
+                    data.fromlist(row)
+                except (TypeError, OverflowError):
+                    raise IngestError(f"{name} baris {rows} harus berisi bilangan bulat int32")
+                rows += 1
+            self.cells += len(parsed) * cols
+            if self.cells > max_cells:
+                raise PayloadTooLarge(f"matriks melebihi {max_cells} sel")
+            self.pos = end
+            char = self.peek()
+            if char == ord(']'):
+                self.pos += 1
+                return Matrix(data, rows, cols)
+            if char != ord(','):
+                raise IngestError(f"{name}: diharapkan ',' atau ']' di byte {self.offset()}")
+            self.pos += 1
+
+    def _rows_end(self):
+        """
+        Posisi setelah ']' baris lengkap terakhir di buffer (atau baris
+        terakhir matriks), membaca chunk baru jika belum ada baris lengkap
+        """
+        while True:
+            match = _MATRIX_END.search(self.buffer, self.pos)
+            if match is not None:
+                return match.start() + 1
+            end = self.buffer.rfind(b']', self.pos)
+            if end >= 0:
+                return end + 1
+            if not self.more(len(self.buffer) - self.pos):
+                raise IngestError("body terpotong di tengah matriks")
+
+
+def _vector(name, value, length):
+    if not isinstance(value, list) or len(value) != length:
+        raise IngestError(f"{name} harus berupa list dengan {length} elemen")
+    try:
+        if value and min(value) < 0:
+            raise IngestError(f"{name} berisi nilai negatif")
+        return array('i', value)
+    except (TypeError, OverflowError):
+        raise IngestError(f"{name} harus berisi bilangan bulat int32")
+
+
+def _scenario(fields):
+    missing = [key for key in _REQUIRED if key not in fields]
+    if missing:
+        raise IngestError(f"key wajib tidak ada: {', '.join(missing)}")
+    processes = fields['processes']
+    resources = fields['resources']
+    for name in ('processes', 'resources'):
+        if not isinstance(fields[name], list):
+            raise IngestError(f"{name} harus berupa list")
+    n = len(processes)
+    m = len(resources)
+    matrices = []
+    for name in ('allocation', 'max_need'):
+        matrix = fields[name]
+        if not isinstance(matrix, Matrix):
+            raise IngestError(f"{name} harus berupa matriks (list of list)")
+        if matrix.rows != n:
+            raise IngestError(f"{name} harus memiliki {n} baris, bukan {matrix.rows}")
+        if matrix.rows and matrix.cols != m:
+            raise IngestError(f"{name} harus memiliki {m} kolom, bukan {matrix.cols}")
+        matrices.append(matrix if matrix.rows else Matrix(array('i'), 0, m))
+    available = _vector('available', fields['available'], m)
+    # need dihitung ulang oleh Scenario
+    options = {key: value for key, value in fields.items() if key not in _REQUIRED and key != 'need'}
+    return Scenario(processes, resources, matrices[0], matrices[1], available, options)
+
+
+def read_scenario(stream, encoding=None, content_length=None, key_prefix=b'',
+                  max_bytes=MAX_BYTES, max_cells=MAX_CELLS):
+    """
+    Parse body JSON skenario dari stream (file-like dengan read) menjadi
+    Scenario. Mengembalikan (scenario, key) dengan key hash SHA-256 dari
+    key_prefix dan body setelah decompress. Melempar PayloadTooLarge untuk
+    body yang terlalu besar dan IngestError untuk body yang tidak valid.
+    """
+    encoding = (encoding or 'identity').lower()
+    if encoding not in GZIP_ENCODINGS and encoding != 'identity':
+        raise IngestError(f"Content-Encoding '{encoding}' tidak didukung")
+    gzip = encoding in GZIP_ENCODINGS
+    if not gzip and content_length is not None and content_length > max_bytes:
+        raise PayloadTooLarge(f"body melebihi {max_bytes} byte")
+
+    digest = hashlib.sha256(key_prefix)
+    source = _Source(stream, gzip, max_bytes, digest)
+    source.expect('{')
+    fields = {}
+    if source.peek() == ord('}'):
+        source.pos += 1
+    else:
+        while True:
+            key = source.key()
+            source.expect(':')
+            if key in _MATRIX_KEYS and source.peek() == ord('['):
+                resources = fields.get('resources')
+                cols = len(resources) if isinstance(resources, list) else None
+                fields[key] = source.matrix(key, cols, max_cells)
+            else:
+                fields[key] = source.value()
+            char = source.peek()
+            if char == ord('}'):
+                source.pos += 1
+                break
+            if char != ord(','):
+                raise IngestError(f"diharapkan ',' atau '}}' di byte {source.offset()}")
+            source.pos += 1
+    if source.peek() is not None:
+        raise IngestError(f"data tambahan setelah objek JSON di byte {source.offset()}")
+    return _scenario(fields), digest.digest()
@@ -0,0 +1,350 @@
+"""
+Solusi level game bawaan (static/js/levels.js) yang dihitung di depan.
+
+Setiap level diubah menjadi skenario, diselesaikan dengan handle_deadlock dan
+ketiga strategi solve_deadlock, lalu body JSON-nya disimpan dalam satu file
+ber-index yang dibaca lewat mmap. Route level cukup mengiris file tersebut.
+
+Layout file (little-endian):
+    header : magic b"DLKL", versi (uint16), jumlah variant (uint16), jumlah level (uint32)
+    index  : per level id (uint32), hash skenario (32 byte), lalu
+             (offset uint64, panjang uint32) untuk setiap variant
+    body   : JSON per (level, variant)
+
+Hash dihitung dari skenario hasil konversi level, bukan teks level, jadi
+mengubah judul atau tutorial tidak membuat solusi basi; mengubah proses
+atau resource hanya menghitung ulang level tersebut. Hash juga memuat
+sidik jari solver (isi modul solver dan RESULT_FORMAT), jadi perubahan
+solver atau format hasil menghitung ulang semua level.
+
+Build offline (opsional; tanpa file atau untuk level yang basi, solusi
+dihitung saat diminta):
+    python levels.py --output levels.bin
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+from solver import handle_deadlock, solve_deadlock
+
+LEVELS_JS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'static', 'js', 'levels.js')
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'levels.bin')
+
+# Variant "simulate" adalah handle_deadlock, sisanya strategi solve_deadlock
+VARIANTS = ("simulate", "Prevention", "Avoidance", "Detection")
+VERSION = 1
+# Naikkan saat bentuk hasil berubah tanpa perubahan di SOLVER_MODULES
+RESULT_FORMAT = 1
+# Modul yang menentukan hasil handle_deadlock dan solve_deadlock
+SOLVER_MODULES = ("solver", "reduction", "recovery", "cycles", "graph", "waitfor",
+                  "generator", "prevention")
+
+_HEADER = struct.Struct('<4sHHI')
+_MAGIC = b'DLKL'
+_ENTRY = struct.Struct('<I32s' + 'QI' * len(VARIANTS))
+
+_TOKEN = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<punct>[\[\]{}:,])
+''', re.VERBOSE | re.DOTALL)
+
+
+class LevelError(ValueError):
+    """Definisi level tidak bisa dibaca"""
+
+
+def _js_literal(text, start):
+    """
+    Ubah literal array/objek JavaScript mulai dari text[start] menjadi JSON:
+    key tanpa kutip diberi kutip, string kutip tunggal dikonversi, komentar
+    dan koma di akhir dibuang. Mengembalikan (json, posisi setelah literal).
+    """
+    out = []
+    depth = 0
+    pos = start
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise LevelError(f"Token tidak dikenal di posisi {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        token = match.group()
+        if kind in ('space', 'comment'):
+            continue
+        if kind == 'string':
+            if token[0] == "'":
+                token = json.dumps(token[1:-1].replace("\\'", "'").replace('\\"', '"'))
+            out.append(token)
+        elif kind == 'name':
+            out.append(token if token in ('true', 'false', 'null') else json.dumps(token))
+        elif kind == 'number':
+            out.append(token)
+        else:
+            if token in ']}' and out and out[-1] == ',':
+                out.pop()
+            out.append(token)
+            if token in '[{':
+                depth += 1
+            elif token in ']}':
+                depth -= 1
+                if depth == 0:
+                    return ''.join(out), pos
+    raise LevelError("Literal tidak tertutup")
+
+
+def parse_levels(text):
+    """
+    Ambil array gameLevels dari isi levels.js
+    """
+    match = re.search(r'\bgameLevels\s*=\s*\[', text)
+    if match is None:
+        raise LevelError("gameLevels tidak ditemukan")
+    literal, _ = _js_literal(text, match.end() - 1)
+    try:
+        return json.loads(literal)
+    except ValueError as e:
+        raise LevelError(f"gameLevels tidak valid: {e}")
+
+
+def level_scenario(level):
+    """
+    Skenario solver untuk state awal level: proses mengklaim satu unit setiap
+    resource di needs, alokasi dari allocation/held_by, available adalah
+    count dikurangi alokasi
+    """
+    processes = [process['id'] for process in level['processes']]
+    resources = [resource['id'] for resource in level['resources']]
+    column = {resource: j for j, resource in enumerate(resources)}
+    allocation = [[0] * len(resources) for _ in processes]
+    max_need = [[0] * len(resources) for _ in processes]
+    row = {process: i for i, process in enumerate(processes)}
+    for i, process in enumerate(level['processes']):
+        for resource in process.get('needs', []):
+            max_need[i][column[resource]] = 1
+        for resource in process.get('allocation', []):
+            allocation[i][column[resource]] = 1
+    for j, resource in enumerate(level['resources']):
+        holder = resource.get('held_by')
+        if holder is not None and not allocation[row[holder]][j]:
+            allocation[row[holder]][j] = 1
+    available = [
+        resource.get('count', 1) - sum(allocation[i][j] for i in range(len(processes)))
+        for j, resource in enumerate(level['resources'])
+    ]
+    return {
+        "processes": processes,
+        "resources": resources,
+        "allocation": allocation,
+        "max_need": max_need,
+        "available": available
+    }
+
+
+_solver_fingerprint = None
+
+
+def solver_fingerprint():
+    """
+    Hash isi SOLVER_MODULES dan RESULT_FORMAT, dihitung sekali per proses
+    """
+    global _solver_fingerprint
+    if _solver_fingerprint is None:
+        digest = hashlib.sha256(f"result-format:{RESULT_FORMAT}".encode('utf-8'))
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in SOLVER_MODULES:
+            with open(os.path.join(directory, f"{name}.py"), 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        _solver_fingerprint = digest.digest()
+    return _solver_fingerprint
+
+
+def scenario_hash(scenario):
+    canonical = json.dumps(scenario, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(solver_fingerprint() + canonical.encode('utf-8')).digest()
+
+
+def solve_level(scenario):
+    """
+    Body JSON untuk setiap variant, dalam urutan VARIANTS
+    """
+    bodies = []
+    for variant in VARIANTS:
+        if variant == "simulate":
+            result = handle_deadlock(scenario)
+        else:
+            result = solve_deadlock(dict(scenario), variant)
+        bodies.append(json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return bodies
+
+
+class SolutionStore:
+    """
+    File solusi level yang dibaca lewat mmap; get() mengiris body JSON
+    langsung dari file tanpa menyentuh solver
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < _HEADER.size:
+            raise LevelError("File solusi terlalu pendek")
+        magic, version, variants, count = _HEADER.unpack_from(self.map)
+        if magic != _MAGIC or version != VERSION or variants != len(VARIANTS):
+            raise LevelError("Format file solusi tidak dikenal")
+        if _HEADER.size + count * _ENTRY.size > len(self.map):
+            raise LevelError("Index file solusi terpotong")
+        for k in range(count):
+            fields = _ENTRY.unpack_from(self.map, _HEADER.size + k * _ENTRY.size)
+            spans = [(fields[2 + 2 * v], fields[3 + 2 * v]) for v in range(len(VARIANTS))]
+            if any(offset + length > len(self.map) for offset, length in spans):
+                raise LevelError("Body file solusi terpotong")
+            self.entries[fields[0]] = (fields[1], spans)
+
+    def __contains__(self, level_id):
+        return level_id in self.entries
+
+    def hash(self, level_id):
+        entry = self.entries.get(level_id)
+        return entry[0] if entry else None
+
+    def get(self, level_id, variant):
+        """
+        Body JSON (bytes) untuk level dan variant, atau None jika tidak ada
+        """
+        entry = self.entries.get(level_id)
+        if entry is None or variant not in VARIANTS:
+            return None
+        offset, length = entry[1][VARIANTS.index(variant)]
+        return self.map[offset:offset + length]
+
+    def close(self):
+        self.map.close()
+
+
+def write_store(path, levels, previous=None):
+    """
+    Tulis file solusi untuk levels. Level yang hash-nya sama dengan entry di
+    store previous disalin apa adanya, sisanya diselesaikan ulang. File
+    ditulis ke berkas sementara lalu di-rename agar pembaca lama tetap valid.
+    Mengembalikan (SolutionStore baru, jumlah level yang diselesaikan ulang).
+    """
+    records = []
+    solved = 0
+    for level in levels:
+        scenario = level_scenario(level)
+        digest = scenario_hash(scenario)
+        if previous is not None and previous.hash(level['id']) == digest:
+            bodies = [previous.get(level['id'], variant) for variant in VARIANTS]
+        else:
+            bodies = solve_level(scenario)
+            solved += 1
+        records.append((level['id'], digest, bodies))
+
+    offset = _HEADER.size + len(records) * _ENTRY.size
+    index = []
+    for level_id, digest, bodies in records:
+        spans = []
+        for body in bodies:
+            spans.extend((offset, len(body)))
+            offset += len(body)
+        index.append(_ENTRY.pack(level_id, digest, *spans))
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, VERSION, len(VARIANTS), len(records)))
+        f.write(b''.join(index))
+        for _, _, bodies in records:
+            for body in bodies:
+                f.write(body)
+    os.replace(temporary, path)
+    return SolutionStore(path), solved
+
+
+def load_levels(levels_path=LEVELS_JS):
+    with open(levels_path, encoding='utf-8') as f:
+        return parse_levels(f.read())
+
+
+class LevelSolutions:
+    """
+    Sumber solusi route /api/levels: body dari file hasil build offline
+    (python levels.py) untuk level yang hash-nya masih cocok, selain itu
+    level diselesaikan live saat pertama diminta dan disimpan di memori.
+    Membuatnya tidak pernah menjalankan solver atau menulis file.
+    """
+
+    def __init__(self, levels, store=None):
+        self.levels = {level['id']: level for level in levels}
+        self.store = store
+        self.fresh = set()
+        if store is not None:
+            self.fresh = {level_id for level_id, level in self.levels.items()
+                          if store.hash(level_id) == scenario_hash(level_scenario(level))}
+        self.solved = {}
+
+    def get(self, level_id, variant):
+        """
+        Body JSON (bytes) untuk level dan variant, atau None jika tidak ada
+        """
+        if variant not in VARIANTS or level_id not in self.levels:
+            return None
+        if level_id in self.fresh:
+            return self.store.get(level_id, variant)
+        bodies = self.solved.get(level_id)
+        if bodies is None:
+            bodies = self.solved[level_id] = solve_level(level_scenario(self.levels[level_id]))
+        return bodies[VARIANTS.index(variant)]
+
+
+def store_from_env():
+    """
+    LevelSolutions dengan file LEVEL_STORE (default DEFAULT_PATH) jika file
+    tersebut ada, atau None jika LEVEL_STORE=0 atau levels.js tidak bisa
+    dibaca. File dibangun terpisah dengan python levels.py --output PATH.
+    """
+    path = os.environ.get('LEVEL_STORE', DEFAULT_PATH)
+    if path == '0':
+        return None
+    try:
+        levels = load_levels()
+    except (OSError, LevelError):
+        return None
+    try:
+        store = SolutionStore(path)
+    except (OSError, LevelError):
+        store = None
+    return LevelSolutions(levels, store)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung solusi level game ke file ber-index")
+    parser.add_argument("--output", default=os.environ.get('LEVEL_STORE', DEFAULT_PATH))
+    parser.add_argument("--levels", default=LEVELS_JS)
+    parser.add_argument("--force", action="store_true", help="Selesaikan ulang semua level")
+    args = parser.parse_args(argv)
+
+    levels = load_levels(args.levels)
+    previous = None
+    if not args.force:
+        try:
+            previous = SolutionStore(args.output)
+        except (OSError, LevelError):
+            pass
+    store, solved = write_store(args.output, levels, previous)
+    print(f"{len(store.entries)} level, {solved} diselesaikan ulang -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
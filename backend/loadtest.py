@@ -0,0 +1,581 @@
+"""
+Load test HTTP end-to-end untuk server simulator deadlock.
+
+Campuran request /api/simulate, /api/solve (per strategi) dan /api/generate
+dibangun dari skenario ber-seed lalu dikirim ke server lokal dalam satu atau
+beberapa stage:
+    closed : --concurrency C klien, masing-masing mengirim request berikutnya
+             setelah response sebelumnya diterima
+    open   : request datang dengan laju tetap --rate R per detik (atau
+             Poisson), tidak bergantung pada kecepatan server; latensi diukur
+             dari jadwal kedatangan sehingga antrian di sisi klien ikut terhitung
+
+Setiap stage melaporkan throughput, error rate, latensi p50/p95/p99/p999 per
+endpoint dan timeline per interval dengan CPU/RSS pohon proses server (dari
+/proc, jika pid server diketahui). Beberapa nilai --concurrency atau --rate
+dijalankan berurutan untuk mencari titik saturasi.
+
+Contoh:
+    python loadtest.py --serve --workers 2 --mode open --rate 5,10,20,40 --output load.json
+    python loadtest.py --url http://127.0.0.1:8000 --pid 1234 --mode closed --concurrency 1,4,16
+    python loadtest.py --serve --compare load.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import queue
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmark import parse_sizes
+from solver import generate_random_scenario
+
+DEFAULT_MIX = "simulate=3,solve:Prevention=1,solve:Avoidance=2,solve:Detection=2,generate=1"
+STRATEGIES = ("Prevention", "Avoidance", "Detection")
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("p999", 0.999))
+
+# Batas thread pengirim mode open; jika semua sibuk request mengantri di klien
+DEFAULT_MAX_INFLIGHT = 256
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_mix(text):
+    """
+    Parse "simulate=3,solve:Detection=2,generate=1" menjadi [(jenis, bobot)]
+    """
+    mix = []
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        kind = kind.strip()
+        endpoint, _, strategy = kind.partition(':')
+        if endpoint not in ('simulate', 'solve', 'generate') or (endpoint == 'solve') != bool(strategy) \
+                or (strategy and strategy not in STRATEGIES):
+            raise ValueError(f"Jenis request tidak dikenal: {kind}")
+        mix.append((kind, float(weight or 1)))
+    return mix
+
+
+def _label(kind):
+    endpoint, _, strategy = kind.partition(':')
+    return f"{endpoint}[{strategy}]" if strategy else endpoint
+
+
+class RequestMix:
+    """
+    Sumber request ber-seed: jenis dipilih sesuai bobot, skenario dari pool
+    skenario yang dibangun di depan untuk setiap ukuran. Urutan request
+    sama untuk seed yang sama.
+    """
+
+    def __init__(self, mix, sizes, scenarios, seed):
+        self.kinds = [kind for kind, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.bodies = {}
+        pool = [
+            generate_random_scenario(n, m, 4, seed * 1000003 + k)
+            for n, m in sizes for k in range(scenarios)
+        ]
+        for kind in self.kinds:
+            endpoint, _, strategy = kind.partition(':')
+            if endpoint == 'generate':
+                bodies = [{"processes": n, "resources": m, "cores": 4, "seed": seed + k}
+                          for n, m in sizes for k in range(scenarios)]
+            elif endpoint == 'solve':
+                bodies = [dict(scenario, strategy=strategy) for scenario in pool]
+            else:
+                bodies = pool
+            self.bodies[kind] = [
+                (_label(kind), f"/api/{endpoint}", json.dumps(body).encode('utf-8'))
+                for body in bodies
+            ]
+
+    def next(self):
+        """
+        (label, path, body) berikutnya
+        """
+        with self.lock:
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            return self.rng.choice(self.bodies[kind])
+
+
+class Client:
+    """
+    Koneksi HTTP keep-alive milik satu thread; dibuka ulang setelah error
+    """
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connection = None
+
+    def send(self, path, body):
+        """
+        POST body JSON; mengembalikan status HTTP, atau 0 jika koneksi gagal
+        """
+        try:
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                self.connection.connect()
+                # Tanpa ini Nagle + delayed ACK menambah ~40 ms ke request kecil
+                self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = self.connection.getresponse()
+            response.read()
+            if response.will_close:
+                self.close()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.close()
+            return 0
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class Recorder:
+    """
+    Sampel (waktu selesai relatif, label, latensi, status) satu stage
+    """
+
+    def __init__(self, start):
+        self.start = start
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def add(self, done, label, latency, status):
+        with self.lock:
+            self.samples.append((done - self.start, label, latency, status))
+
+
+def run_closed(target, requests, concurrency, duration, timeout, recorder):
+    stop = time.perf_counter() + duration
+
+    def worker():
+        client = Client(*target, timeout)
+        while time.perf_counter() < stop:
+            label, path, body = requests.next()
+            sent = time.perf_counter()
+            status = client.send(path, body)
+            done = time.perf_counter()
+            recorder.add(done, label, done - sent, status)
+        client.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_open(target, requests, rate, duration, timeout, recorder, poisson=False,
+             max_inflight=DEFAULT_MAX_INFLIGHT, seed=0):
+    """
+    Jadwalkan request dengan laju rate per detik selama duration. Request
+    yang sudah menunggu lebih dari timeout sejak jadwalnya dicatat sebagai
+    error tanpa dikirim, sehingga stage tetap selesai walau server jenuh.
+    """
+    pending = queue.Queue()
+    start = time.perf_counter()
+
+    def worker():
+        client = Client(*target, timeout)
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            scheduled, (label, path, body) = item
+            if time.perf_counter() - scheduled > timeout:
+                recorder.add(time.perf_counter(), label, time.perf_counter() - scheduled, 0)
+                continue
+            status = client.send(path, body)
+            done = time.perf_counter()
+            recorder.add(done, label, done - scheduled, status)
+        client.close()
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(max(1, min(max_inflight, math.ceil(rate * timeout))))]
+    for thread in threads:
+        thread.start()
+
+    rng = random.Random(seed)
+    scheduled = start
+    while True:
+        scheduled += rng.expovariate(rate) if poisson else 1.0 / rate
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        pending.put((scheduled, requests.next()))
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+
+
+def _process_table():
+    """
+    {pid: (ppid, tick CPU user+system, RSS byte)} dari /proc
+    """
+    page = os.sysconf('SC_PAGE_SIZE')
+    table = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        fields = stat[stat.rfind(')') + 2:].split()
+        table[int(name)] = (int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21]) * page)
+    return table
+
+
+def _descendants(table, root):
+    children = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    tree = [root] if root in table else []
+    for pid in tree:
+        tree.extend(children.get(pid, ()))
+    return tree
+
+
+class ServerSampler(threading.Thread):
+    """
+    Sampel CPU (% satu core) dan RSS total pohon proses server (worker
+    pre-fork dan compute pool ikut) setiap interval detik
+    """
+
+    def __init__(self, pid, interval=1.0, start=None):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+        self.start_time = time.perf_counter() if start is None else start
+        self.ticks = os.sysconf('SC_CLK_TCK')
+
+    def run(self):
+        table = _process_table()
+        previous = {pid: table[pid][1] for pid in _descendants(table, self.pid)}
+        previous_time = time.perf_counter()
+        while not self.stopped.wait(self.interval):
+            table = _process_table()
+            now = time.perf_counter()
+            tree = _descendants(table, self.pid)
+            cpu = {pid: table[pid][1] for pid in tree}
+            # Proses baru dihitung penuh; proses yang mati di tengah interval terlewat
+            used = sum(ticks - previous.get(pid, 0) for pid, ticks in cpu.items())
+            self.samples.append({
+                "t": now - self.start_time,
+                "cpu_percent": 100.0 * used / self.ticks / (now - previous_time),
+                "rss_bytes": sum(table[pid][2] for pid in tree),
+                "processes": len(tree)
+            })
+            previous, previous_time = cpu, now
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        return self.samples
+
+
+def percentile(values, q):
+    """
+    Persentil nearest-rank dari list yang sudah terurut
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+
+def latency_summary(samples, duration):
+    latencies = sorted(latency for _, _, latency, _ in samples)
+    errors = sum(1 for _, _, _, status in samples if not 200 <= status < 400)
+    statuses = {}
+    for _, _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "throughput": (len(samples) - errors) / duration if duration else 0.0,
+        "status": statuses,
+        "mean_s": sum(latencies) / len(latencies) if latencies else None,
+        "max_s": latencies[-1] if latencies else None
+    }
+    for name, q in PERCENTILES:
+        summary[f"{name}_s"] = percentile(latencies, q)
+    return summary
+
+
+def timeline(samples, server_samples, duration, interval):
+    windows = []
+    for k in range(max(1, math.ceil(duration / interval))):
+        low, high = k * interval, (k + 1) * interval
+        window = [sample for sample in samples if low <= sample[0] < high]
+        latencies = sorted(latency for _, _, latency, _ in window)
+        entry = {
+            "t": high,
+            "requests": len(window),
+            "errors": sum(1 for _, _, _, status in window if not 200 <= status < 400),
+            "p50_s": percentile(latencies, 0.50),
+            "p99_s": percentile(latencies, 0.99)
+        }
+        server = [sample for sample in server_samples if low < sample["t"] <= high]
+        if server:
+            entry["cpu_percent"] = max(sample["cpu_percent"] for sample in server)
+            entry["rss_bytes"] = max(sample["rss_bytes"] for sample in server)
+        windows.append(entry)
+    return windows
+
+
+def run_stage(target, requests, mode, level, duration, timeout, pid=None, interval=1.0,
+              poisson=False, seed=0):
+    """
+    Jalankan satu stage (mode closed dengan concurrency level, atau open
+    dengan rate level) dan kembalikan ringkasannya
+    """
+    recorder = Recorder(time.perf_counter())
+    sampler = None
+    if pid is not None and os.path.isdir('/proc'):
+        sampler = ServerSampler(pid, interval, recorder.start)
+        sampler.start()
+    if mode == 'closed':
+        run_closed(target, requests, int(level), duration, timeout, recorder)
+    else:
+        run_open(target, requests, level, duration, timeout, recorder, poisson, seed=seed)
+    elapsed = time.perf_counter() - recorder.start
+    server_samples = sampler.stop() if sampler is not None else []
+
+    samples = recorder.samples
+    labels = sorted({label for _, label, _, _ in samples})
+    stage = {
+        "mode": mode,
+        "concurrency" if mode == 'closed' else "rate": level,
+        "duration_s": elapsed,
+        **latency_summary(samples, elapsed),
+        "endpoints": {
+            label: latency_summary([sample for sample in samples if sample[1] == label], elapsed)
+            for label in labels
+        },
+        "timeline": timeline(samples, server_samples, elapsed, interval),
+        "server": None
+    }
+    if server_samples:
+        stage["server"] = {
+            "cpu_percent_mean": sum(sample["cpu_percent"] for sample in server_samples) / len(server_samples),
+            "cpu_percent_max": max(sample["cpu_percent"] for sample in server_samples),
+            "rss_max_bytes": max(sample["rss_bytes"] for sample in server_samples),
+            "processes": max(sample["processes"] for sample in server_samples)
+        }
+    return stage
+
+
+def saturation(stages, error_threshold=0.01):
+    """
+    Stage pertama yang menunjukkan saturasi: mode open jika throughput
+    tercapai < 95% rate yang ditawarkan atau error rate di atas threshold;
+    mode closed jika throughput naik < 10% dari stage sebelumnya padahal
+    concurrency naik. None jika semua stage masih di bawah saturasi.
+    """
+    previous = None
+    for stage in stages:
+        if stage["error_rate"] > error_threshold:
+            return stage
+        if stage["mode"] == 'open' and stage["throughput"] < 0.95 * stage["rate"]:
+            return stage
+        if stage["mode"] == 'closed' and previous is not None \
+                and stage["concurrency"] > previous["concurrency"] \
+                and stage["throughput"] < 1.1 * previous["throughput"]:
+            return stage
+        previous = stage
+    return None
+
+
+def compare(report, baseline):
+    """
+    Rasio throughput dan latensi ekor terhadap baseline untuk stage dengan
+    mode dan level yang sama (< 1 berarti latensi lebih baik)
+    """
+    def level(stage):
+        return stage["mode"], stage.get("concurrency", stage.get("rate"))
+
+    previous = {level(stage): stage for stage in baseline["stages"]}
+    rows = []
+    for stage in report["stages"]:
+        base = previous.get(level(stage))
+        if base is None:
+            continue
+        row = {"mode": stage["mode"], "level": level(stage)[1]}
+        for metric in ("throughput", "p50_s", "p99_s", "p999_s"):
+            if base.get(metric) and stage.get(metric) is not None:
+                row[metric] = stage[metric] / base[metric]
+        rows.append(row)
+    return rows
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(port, workers, cache=False, wait=30.0):
+    """
+    Jalankan serve.py di 127.0.0.1:port dan tunggu sampai port menerima
+    koneksi. Cache hasil dimatikan kecuali cache=True agar yang diukur
+    solver, bukan cache.
+    """
+    env = dict(os.environ)
+    if not cache:
+        env['RESULT_CACHE_SIZE'] = '0'
+        env.pop('RESULT_CACHE_DIR', None)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, 'serve.py'), '--host', '127.0.0.1',
+         '--port', str(port), '--workers', str(workers)],
+        cwd=SERVER_DIR, env=env)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py berhenti dengan kode {process.returncode}")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1.0).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("serve.py tidak siap dalam batas waktu")
+
+
+def _float_list(text):
+    return [float(value) for value in text.split(',')]
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(',')]
+
+
+def _format(stage):
+    def ms(value):
+        return f"{value * 1000:9.1f}" if value is not None else f"{'-':>9}"
+
+    level = f"c={stage['concurrency']}" if stage["mode"] == 'closed' else f"r={stage['rate']:g}/s"
+    line = f"{stage['mode']:<6} {level:<10} {stage['throughput']:9.1f} req/s  err {stage['error_rate'] * 100:5.1f}%  " \
+           f"p50 {ms(stage['p50_s'])}  p95 {ms(stage['p95_s'])}  p99 {ms(stage['p99_s'])}  p999 {ms(stage['p999_s'])} ms"
+    if stage["server"]:
+        line += f"  cpu {stage['server']['cpu_percent_mean']:6.1f}%  rss {stage['server']['rss_max_bytes'] / 2 ** 20:7.1f} MiB"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test HTTP server simulator deadlock")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="Jalankan serve.py lokal untuk diuji")
+    parser.add_argument("--workers", type=int, default=2, help="Worker serve.py untuk --serve")
+    parser.add_argument("--cache", action="store_true", help="Biarkan cache hasil aktif pada --serve")
+    parser.add_argument("--pid", type=int, help="PID server untuk sampel CPU/RSS (otomatis dengan --serve)")
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 16],
+                        help="Klien per stage mode closed, mis. 1,4,16")
+    parser.add_argument("--rate", type=_float_list, default=[5.0, 10.0, 20.0],
+                        help="Request per detik per stage mode open, mis. 5,10,20")
+    parser.add_argument("--poisson", action="store_true", help="Kedatangan Poisson, bukan interval tetap")
+    parser.add_argument("--duration", type=float, default=10.0, help="Detik per stage")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Detik pemanasan sebelum stage pertama")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="Lebar jendela timeline dan sampel server")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--sizes", default="10x3,100x10", help="Ukuran skenario, mis. 10x3,1000x50")
+    parser.add_argument("--scenarios", type=int, default=16, help="Skenario per ukuran di pool request")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Tulis hasil JSON ke file ini")
+    parser.add_argument("--compare", help="File JSON hasil load test sebelumnya sebagai baseline")
+    args = parser.parse_args(argv)
+
+    requests = RequestMix(parse_mix(args.mix), parse_sizes(args.sizes), args.scenarios, args.seed)
+    server = None
+    if args.serve:
+        port = free_port()
+        server = spawn_server(port, args.workers, args.cache)
+        target = ('127.0.0.1', port)
+        pid = server.pid
+    else:
+        url = urlsplit(args.url)
+        target = (url.hostname, url.port or 80)
+        pid = args.pid
+
+    levels = args.concurrency if args.mode == 'closed' else args.rate
+    stages = []
+    try:
+        if args.warmup > 0:
+            run_stage(target, requests, args.mode, levels[0], args.warmup, args.timeout,
+                      poisson=args.poisson, seed=args.seed)
+        for level in levels:
+            stage = run_stage(target, requests, args.mode, level, args.duration, args.timeout, pid,
+                              args.interval, args.poisson, args.seed)
+            stages.append(stage)
+            print(_format(stage), file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    knee = saturation(stages)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": f"{target[0]}:{target[1]}",
+            "served": args.serve,
+            "workers": args.workers if args.serve else None,
+            "cache": args.cache if args.serve else None,
+            "mix": args.mix,
+            "sizes": args.sizes,
+            "scenarios": args.scenarios,
+            "seed": args.seed,
+            "duration_s": args.duration,
+            "poisson": args.poisson,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": stages,
+        "saturation": None if knee is None else knee.get("concurrency", knee.get("rate"))
+    }
+    if knee is not None:
+        print(f"Saturasi mulai pada {args.mode} {report['saturation']:g}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(report, baseline)
+        for row in report["comparison"]:
+            ratios = "  ".join(f"{metric} {row[metric]:.2f}x" for metric in ("throughput", "p50_s", "p99_s", "p999_s")
+                               if metric in row)
+            print(f"vs baseline {row['mode']} {row['level']:g}: {ratios}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,42 +1,414 @@
-from flask import Flask, jsonify, request, render_template, send_from_directory
-from solver import handle_deadlock, solve_deadlock, generate_random_scenario
+import json
+
+from flask import Flask, Response, g, jsonify, request, render_template, send_from_directory, stream_with_context
+from solver import cycle_limits, handle_deadlock, solve_deadlock, generate_random_scenario
+from session import SessionStore
+from banker import BankerStore
+from explorer import explore_safe_sequences
+from simulator import simulate_execution
+from cache import cache_from_env, scenario_key
+from batch import DEFAULT_WORKERS, get_executor, item_timeout, iter_ndjson, run_batch
+from compute import ComputeError, ComputeTimeout, InvalidInput, Overloaded
+from stream import DEFAULT_KEYFRAME_INTERVAL, format_ndjson, format_sse, iter_solution_events, with_deadline
+from scenario import Scenario
+from levels import VARIANTS, store_from_env
+from profiling import ProfileForbidden, profile_call
+import ingest
+import profiling
+import metrics
+import wire
 
 app = Flask(__name__, 
             static_folder='../static',
             template_folder='../templates')
+app.config.setdefault('BATCH_WORKERS', DEFAULT_WORKERS)
+# Diisi serve.py pada mode produksi; None berarti solver dijalankan inline
+app.config.setdefault('COMPUTE_POOL', None)
+
+sessions = SessionStore()
+banker_states = BankerStore()
+result_cache = cache_from_env()
+level_store = store_from_env()
+profiles = profiling.store_from_env()
+metrics.set_collector(metrics.collector_from_env())
+
+def cached_json(key, compute, binary=False, profile=False):
+    """
+    Kembalikan body JSON (atau format biner wire) dari cache, atau hitung lalu
+    simpan body-nya apa adanya. Jika metrics aktif, durasi fase solver dikirim
+    di header Server-Timing.
+    compute menerima flag profile; request yang diprofile tidak membaca cache
+    dan ID profile-nya dikirim di header X-Profile-Id.
+    """
+    mimetype = wire.MIMETYPE if binary else 'application/json'
+    with metrics.server_timing() as timing:
+        body = None if profile else result_cache.get(key)
+        if body is not None:
+            if timing is not None:
+                timing.note("cache", "hit")
+            response = app.response_class(body, mimetype=mimetype)
+        else:
+            result = compute(profile or profiles.sample())
+            response = app.response_class(wire.encode(result), mimetype=mimetype) if binary else jsonify(result)
+            result_cache.put(key, response.get_data())
+    if timing is not None:
+        response.headers['Server-Timing'] = timing.header()
+    if g.get('profile_id'):
+        response.headers['X-Profile-Id'] = g.profile_id
+    return response
+
+def profile_requested():
+    """Profiling on-demand lewat header X-Profile atau ?profile=1, hanya untuk admin"""
+    flag = request.headers.get('X-Profile') or request.args.get('profile')
+    if not flag or flag == '0':
+        return False
+    if not profiles.is_admin(request.headers.get('X-Admin-Token')):
+        raise ProfileForbidden()
+    return True
+
+def wants_wire():
+    """Response biner jika body request biner atau header Accept memintanya"""
+    return request.mimetype == wire.MIMETYPE or wire.MIMETYPE in request.headers.get('Accept', '')
+
+def read_scenario(endpoint):
+    """
+    Baca skenario dari body JSON atau biner. Mengembalikan (data, key) dengan
+    key berupa hash body untuk body biner (di-decode tanpa copy menjadi
+    Scenario) atau None untuk body JSON kecil. Body JSON besar, chunked atau
+    gzip di-parse streaming langsung menjadi Scenario dan key-nya hash body.
+    """
+    if request.mimetype == wire.MIMETYPE:
+        body = request.get_data()
+        return wire.decode_scenario(body), wire.body_key(endpoint, body)
+    encoding = request.headers.get('Content-Encoding')
+    if request.is_json and ingest.streamable(encoding, request.content_length):
+        prefix = f"{endpoint}.wire" if wants_wire() else endpoint
+        return ingest.read_scenario(request.stream, encoding, request.content_length,
+                                    key_prefix=f"{prefix}\0".encode('utf-8'))
+    return request.json, None
+
+def json_key(endpoint, data, binary, strategy=None):
+    """Key cache body JSON; response biner disimpan di bawah key terpisah"""
+    return scenario_key(f"{endpoint}.wire" if binary else endpoint, data, strategy)
+
+def run_solver(data, strategy=None, profile=False):
+    """
+    Jalankan solver inline, atau di compute pool jika mode produksi aktif.
+    Dengan profile=True solver dijalankan di bawah profiler dan report-nya
+    disimpan ke profiles.
+    """
+    pool = app.config['COMPUTE_POOL']
+    if pool is None:
+        if not profile:
+            return handle_deadlock(data) if strategy is None else solve_deadlock(data, strategy)
+        if strategy is None:
+            result, report = profile_call(handle_deadlock, data)
+        else:
+            result, report = profile_call(solve_deadlock, data, strategy)
+        save_profile(data, strategy, report)
+        return result
+    if isinstance(data, Scenario):
+        # Matriks dikirim ke worker sebagai buffer array, bukan list
+        item = data
+        item.options.pop('strategy', None)
+        if strategy is not None:
+            item.options['strategy'] = strategy
+    else:
+        item = {key: value for key, value in data.items() if key != 'strategy'}
+        if strategy is not None:
+            item['strategy'] = strategy
+    if not profile:
+        return pool.run(item)
+    result, report = pool.run_profiled(item)
+    save_profile(data, strategy, report)
+    return result
+
+def save_profile(data, strategy, report):
+    g.profile_id = profiles.save(report, {
+        "endpoint": request.path,
+        "strategy": strategy,
+        "processes": len(data['processes']),
+        "resources": len(data['resources']),
+        "sampled": request.headers.get('X-Profile') is None and request.args.get('profile') is None
+    })
+
+@app.errorhandler(wire.WireError)
+def wire_error(e):
+    return jsonify({"error": f"Body biner tidak valid: {e}"}), 400
+
+@app.errorhandler(ingest.PayloadTooLarge)
+def payload_too_large(e):
+    return jsonify({"error": f"Body terlalu besar: {e}"}), 413
+
+@app.errorhandler(ingest.IngestError)
+def ingest_error(e):
+    return jsonify({"error": f"Body skenario tidak valid: {e}"}), 400
+
+@app.errorhandler(ProfileForbidden)
+def profile_forbidden(e):
+    return jsonify({"error": "Profiling hanya untuk admin"}), 403
+
+@app.errorhandler(Overloaded)
+def overloaded(e):
+    response = jsonify({"error": "Server sedang sibuk, coba lagi nanti"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+@app.errorhandler(ComputeTimeout)
+def compute_timeout(e):
+    return jsonify({"error": str(e), "timeout": True, "deadline": e.deadline}), 504
+
+@app.errorhandler(ComputeError)
+def compute_error(e):
+    return jsonify({"error": str(e)}), 500
 
 @app.route('/api/simulate', methods=['POST'])
 def simulate():
-    data = request.json
+    data, key = read_scenario('simulate')
     if not data:
         return jsonify({"error": "Invalid input"}), 400
-    result = handle_deadlock(data)
-    return jsonify(result)
+    binary = wants_wire()
+    key = key or json_key('simulate', data, binary)
+    return cached_json(key, lambda profile: run_solver(data, profile=profile), binary, profile_requested())
 
 @app.route('/api/solve', methods=['POST'])
 def solve():
-    data = request.json
+    data, key = read_scenario('solve')
     if not data or 'strategy' not in data:
         return jsonify({"error": "Invalid input or missing strategy"}), 400
     
-    strategy = data.pop('strategy')
-    result = solve_deadlock(data, strategy)
-    return jsonify(result)
+    strategy = data.options.pop('strategy') if isinstance(data, Scenario) else data.pop('strategy')
+    try:
+        cycle_limits(data)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {e}"}), 400
+
+    # Mode streaming opsional: langkah dikirim begitu dihasilkan, state sebagai delta
+    stream = request.args.get('stream')
+    if stream:
+        if stream not in ('ndjson', 'sse'):
+            return jsonify({"error": "stream harus 'ndjson' atau 'sse'"}), 400
+        try:
+            keyframe_interval = int(request.args.get('keyframe', DEFAULT_KEYFRAME_INTERVAL))
+        except ValueError:
+            return jsonify({"error": "keyframe harus berupa angka"}), 400
+        events = iter_solution_events(data, strategy, keyframe_interval)
+        # Langkah dihasilkan di thread request, jadi stream memegang slot
+        # compute pool sampai response ditutup dan dibatasi deadline yang sama
+        pool = app.config['COMPUTE_POOL']
+        release = None
+        if pool is not None:
+            release = pool.admit()
+            events = with_deadline(events, pool.deadline, pool.note_timeout)
+        if stream == 'sse':
+            response = Response(stream_with_context(format_sse(events)), mimetype='text/event-stream',
+                                headers={'Cache-Control': 'no-cache'})
+        else:
+            response = Response(stream_with_context(format_ndjson(events)), mimetype='application/x-ndjson')
+        if release is not None:
+            response.call_on_close(release)
+        return response
+
+    binary = wants_wire()
+    key = key or json_key('solve', data, binary, strategy)
+    return cached_json(key, lambda profile: run_solver(data, strategy, profile), binary, profile_requested())
 
 @app.route('/api/generate', methods=['POST'])
 def generate():
     """Generate a random multi-core scenario with given parameters"""
-    data = request.json
+    data = wire.decode(request.get_data()) if request.mimetype == wire.MIMETYPE else request.json
     if not data:
         return jsonify({"error": "Invalid input"}), 400
     
     num_processes = data.get('processes', 5)
     num_resources = data.get('resources', 3)
     num_cores = data.get('cores', 2)
+    seed = data.get('seed')
     
-    scenario = generate_random_scenario(num_processes, num_resources, num_cores)
+    scenario = generate_random_scenario(num_processes, num_resources, num_cores, seed)
+    if wants_wire():
+        return app.response_class(wire.encode(scenario), mimetype=wire.MIMETYPE)
     return jsonify(scenario)
 
+@app.route('/api/cache', methods=['GET'])
+def cache_stats():
+    """Statistik hit/miss/eviction cache hasil /api/simulate dan /api/solve"""
+    return jsonify(result_cache.stats())
+
+@app.route('/api/compute', methods=['GET'])
+def compute_stats():
+    """Statistik antrian compute pool (mode produksi)"""
+    pool = app.config['COMPUTE_POOL']
+    if pool is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(pool.stats(), enabled=True))
+
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Histogram durasi fase dan counter solver dalam format teks Prometheus"""
+    collector = metrics.get_collector()
+    if not hasattr(collector, 'render'):
+        return jsonify({"error": "Metrics nonaktif"}), 404
+    return Response(collector.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """Daftar ringkasan profile yang tersimpan (admin)"""
+    if not profiles.is_admin(request.headers.get('X-Admin-Token')):
+        raise ProfileForbidden()
+    return jsonify(profiles.list())
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Ringkasan profile (JSON) atau dump pstats dengan ?format=pstats (admin)"""
+    if not profiles.is_admin(request.headers.get('X-Admin-Token')):
+        raise ProfileForbidden()
+    if request.args.get('format') == 'pstats':
+        filename = profiles.pstats_file(profile_id)
+        if filename is None:
+            return jsonify({"error": "Profile tidak ditemukan"}), 404
+        return send_from_directory(profiles.directory, filename, mimetype='application/octet-stream',
+                                   as_attachment=True)
+    summary = profiles.get(profile_id)
+    if summary is None:
+        return jsonify({"error": "Profile tidak ditemukan"}), 404
+    return jsonify(summary)
+
+@app.route('/api/request', methods=['POST'])
+def resource_request():
+    """Banker's resource-request: apakah request proses bisa dikabulkan dengan aman"""
+    data = request.json
+    if not data or 'process' not in data or 'request' not in data:
+        return jsonify({"error": "Invalid input or missing process/request"}), 400
+    try:
+        result = banker_states.handle(data)
+    except KeyError:
+        return jsonify({"error": "State not found, kirim ulang state lengkap"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+@app.route('/api/safe-sequences', methods=['POST'])
+def safe_sequences():
+    """Hitung, enumerasi dan optimasi safe sequence (dibatasi waktu dan jumlah state)"""
+    data = request.json
+    if not data:
+        return jsonify({"error": "Invalid input"}), 400
+    try:
+        result = explore_safe_sequences(data)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid input: {e}"}), 400
+    return jsonify(result)
+
+@app.route('/api/execute', methods=['POST'])
+def execute():
+    """
+    Simulasi eksekusi multi-core (discrete-event) dengan strategi Avoidance
+    atau Detection. Pada mode produksi dijalankan di compute pool dengan
+    deadline dan admisi yang sama seperti /api/solve.
+    """
+    data = request.json
+    if not data:
+        return jsonify({"error": "Invalid input"}), 400
+    pool = app.config['COMPUTE_POOL']
+    try:
+        if pool is None:
+            result = simulate_execution(data, data.get('strategy', 'Avoidance'))
+        else:
+            result = pool.execute(data)
+    except InvalidInput as e:
+        return jsonify({"error": str(e)}), 400
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid input: {e}"}), 400
+    return jsonify(result)
+
+@app.route('/api/session', methods=['POST'])
+def create_session():
+    """Buat sesi deadlock stateful dari skenario awal"""
+    data = request.json
+    if not data:
+        return jsonify({"error": "Invalid input"}), 400
+    try:
+        session_id, session = sessions.create(data)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid scenario: {e}"}), 400
+    state = session.state()
+    state["session_id"] = session_id
+    return jsonify(state), 201
+
+@app.route('/api/session/<session_id>', methods=['GET'])
+def query_session(session_id):
+    """Ambil state sesi: deadlock, wait-for edges dan status safe"""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(session.state())
+
+@app.route('/api/session/<session_id>/event', methods=['POST'])
+def session_event(session_id):
+    """Terapkan event request/release ke sesi"""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    event = request.json
+    if not event:
+        return jsonify({"error": "Invalid input"}), 400
+    try:
+        result = session.apply_event(event)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+@app.route('/api/session/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    if not sessions.delete(session_id):
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify({"deleted": session_id})
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Selesaikan banyak skenario sekaligus di process pool, hasil di-stream sebagai NDJSON"""
+    order = request.args.get('order', 'input')
+    if order not in ('input', 'completion'):
+        return jsonify({"error": "order harus 'input' atau 'completion'"}), 400
+    try:
+        timeout = item_timeout(request.args.get('timeout'))
+    except ValueError:
+        return jsonify({"error": "timeout harus berupa angka lebih dari 0"}), 400
+
+    if 'ndjson' in (request.content_type or ''):
+        items = iter_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('scenarios')
+        if not isinstance(data, list):
+            return jsonify({"error": "Body harus berupa array skenario atau NDJSON"}), 400
+        items = data
+
+    workers = app.config['BATCH_WORKERS']
+    results = run_batch(items, get_executor(workers), order, timeout, window=workers * 4)
+    lines = (json.dumps(result) + "\n" for result in results)
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+
+@app.route('/api/levels/<int:level_id>', methods=['GET'])
+def level_simulate(level_id):
+    """Hasil /api/simulate untuk state awal level bawaan, dari solusi yang dihitung di depan"""
+    return level_solution(level_id, "simulate")
+
+@app.route('/api/levels/<int:level_id>/<strategy>', methods=['GET'])
+def level_solve(level_id, strategy):
+    """Hasil /api/solve untuk level bawaan dengan strategi Prevention, Avoidance atau Detection"""
+    if strategy not in VARIANTS[1:]:
+        return jsonify({"error": "Strategi tidak valid", "valid_strategies": list(VARIANTS[1:])}), 400
+    return level_solution(level_id, strategy)
+
+def level_solution(level_id, variant):
+    body = level_store.get(level_id, variant) if level_store is not None else None
+    if body is None:
+        return jsonify({"error": "Level tidak ditemukan"}), 404
+    return app.response_class(body, mimetype='application/json')
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -0,0 +1,280 @@
+"""
+Instrumentasi solver: durasi per fase (reduction, wait_for, find_cycles,
+recovery, ordering, admission, dan solve untuk keseluruhan panggilan) serta
+counter (scan_passes, cycles_found, victims_terminated, single_instance),
+diberi label strategi dan bucket ukuran skenario.
+
+Tanpa collector (default) phase() mengembalikan context manager no-op yang
+sudah dibuat sebelumnya dan count() langsung kembali, sehingga overhead di
+hot path hanya satu pengecekan global. Collector sendiri cukup memiliki
+method observe(phase, seconds, labels) dan count(name, value, labels):
+
+    set_collector(PrometheusCollector())
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Batas atas bucket histogram (detik)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Bucket ukuran skenario berdasarkan jumlah proses
+SIZE_BUCKETS = (10, 100, 1000, 10000)
+
+_collector = None
+_local = threading.local()
+_DEFAULT_LABELS = ("none", "unknown")
+
+
+def size_bucket(num_processes):
+    for limit in SIZE_BUCKETS:
+        if num_processes <= limit:
+            return f"le{limit}"
+    return f"gt{SIZE_BUCKETS[-1]}"
+
+
+def set_collector(collector):
+    """
+    Pasang collector global (None untuk menonaktifkan); mengembalikan
+    collector sebelumnya
+    """
+    global _collector
+    previous = _collector
+    _collector = collector
+    return previous
+
+
+def get_collector():
+    return _collector
+
+
+def current_labels():
+    return getattr(_local, 'labels', _DEFAULT_LABELS)
+
+
+def _observe(name, seconds):
+    labels = getattr(_local, 'labels', _DEFAULT_LABELS)
+    _collector.observe(name, seconds, labels)
+    timings = getattr(_local, 'timings', None)
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+class _Phase:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if _collector is not None:
+            _observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Disabled:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_DISABLED = _Disabled()
+
+
+def phase(name):
+    """
+    Context manager yang mengukur durasi satu fase solver
+    """
+    if _collector is None:
+        return _DISABLED
+    return _Phase(name)
+
+
+def count(name, value=1):
+    if _collector is None or not value:
+        return
+    _collector.count(name, value, getattr(_local, 'labels', _DEFAULT_LABELS))
+
+
+@contextmanager
+def solve(strategy, num_processes):
+    """
+    Label (strategi, bucket ukuran) untuk semua fase di dalam blok, plus
+    durasi keseluruhan sebagai fase "solve"
+    """
+    if _collector is None:
+        yield
+        return
+    previous = getattr(_local, 'labels', None)
+    _local.labels = (strategy, size_bucket(num_processes))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _collector is not None:
+            _observe("solve", time.perf_counter() - start)
+        if previous is None:
+            del _local.labels
+        else:
+            _local.labels = previous
+
+
+class ServerTiming:
+    """
+    Total durasi per fase untuk satu request, diformat sebagai header
+    Server-Timing
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.notes = []
+        self.start = time.perf_counter()
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def note(self, name, description):
+        self.notes.append(f'{name};desc="{description}"')
+
+    def header(self):
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.phases.items()]
+        entries.extend(self.notes)
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def server_timing():
+    """
+    Kumpulkan durasi fase di thread ini selama blok berjalan. Tanpa
+    collector blok menerima None dan tidak ada yang dicatat.
+    """
+    if _collector is None:
+        yield None
+        return
+    timing = ServerTiming()
+    previous = getattr(_local, 'timings', None)
+    _local.timings = timing
+    try:
+        yield timing
+    finally:
+        _local.timings = previous
+
+
+class Recorder:
+    """
+    Collector yang hanya mencatat observasi, dipakai di worker compute pool
+    agar metrik bisa dikirim balik dan diputar ulang di proses server
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def observe(self, phase, seconds, labels):
+        self.events.append(("observe", phase, seconds, labels))
+
+    def count(self, name, value, labels):
+        self.events.append(("count", name, value, labels))
+
+
+def replay(events, labels=None):
+    """
+    Teruskan observasi dari Recorder ke collector dan Server-Timing thread ini.
+    Jika labels diberikan, label hasil rekaman diganti dengan labels.
+    """
+    if _collector is None:
+        return
+    timings = getattr(_local, 'timings', None)
+    override = labels
+    for kind, name, value, labels in events:
+        labels = tuple(override or labels)
+        if kind == "observe":
+            _collector.observe(name, value, labels)
+            if timings is not None:
+                timings.add(name, value)
+        else:
+            _collector.count(name, value, labels)
+
+
+class PrometheusCollector:
+    """
+    Agregasi histogram durasi fase dan counter per (strategi, bucket ukuran),
+    dirender dalam format teks Prometheus. Metrik dihitung per proses, jadi
+    pada mode pre-fork setiap worker server memiliki angka sendiri.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="deadlock_solver"):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def observe(self, phase, seconds, labels):
+        key = (phase,) + tuple(labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # Hitungan per bucket (non-kumulatif), lalu sum dan count
+                histogram = self.histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts = histogram[0]
+            for b, limit in enumerate(self.buckets):
+                if seconds <= limit:
+                    counts[b] += 1
+                    break
+            else:
+                counts[-1] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def count(self, name, value, labels):
+        key = (name,) + tuple(labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def render(self):
+        lines = []
+        name = f"{self.prefix}_phase_seconds"
+        with self.lock:
+            histograms = sorted((key, [counts[:], total, n]) for key, (counts, total, n) in self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        lines.append(f"# HELP {name} Durasi fase solver dalam detik")
+        lines.append(f"# TYPE {name} histogram")
+        for (phase, strategy, size), (counts, total, n) in histograms:
+            labels = f'phase="{phase}",strategy="{strategy}",size="{size}"'
+            cumulative = 0
+            for limit, c in zip(self.buckets, counts):
+                cumulative += c
+                lines.append(f'{name}_bucket{{{labels},le="{limit}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {n}')
+            lines.append(f"{name}_sum{{{labels}}} {total}")
+            lines.append(f"{name}_count{{{labels}}} {n}")
+
+        declared = set()
+        for (counter, strategy, size), value in counters:
+            metric = f"{self.prefix}_{counter}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f'{metric}{{strategy="{strategy}",size="{size}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def collector_from_env():
+    """
+    PrometheusCollector jika METRICS=1; tanpa itu metrics nonaktif dan hot
+    path memakai jalur no-op
+    """
+    if os.environ.get('METRICS', '0') != '1':
+        return None
+    return PrometheusCollector()
@@ -0,0 +1,161 @@
+"""
+Deteksi deadlock batch untuk studi Monte-Carlo offline.
+
+B skenario berukuran sama ditumpuk menjadi array B x n x m dan direduksi
+sekaligus: setiap pass menandai semua proses yang kebutuhannya muat di work
+skenarionya lalu melepas alokasinya, sampai tidak ada skenario yang berubah.
+Hasilnya sama dengan detect_deadlock / bankers_algorithm per skenario
+(himpunan proses yang bisa selesai tidak bergantung urutan reduksi), tanpa
+overhead interpreter per panggilan.
+
+Contoh:
+    python montecarlo.py --processes 5,10,20 --resources 3,5 --cores 2 --samples 10000
+"""
+import argparse
+import itertools
+import json
+import math
+import sys
+
+from generator import generate_matrices
+from reduction import run_reduction
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional; tanpa NumPy dipakai jalur pure-Python
+    np = None
+
+DEFAULT_BATCH_SIZE = 4096
+
+
+def _reduce_numpy(allocation, max_need, available):
+    allocation = np.asarray(allocation, dtype=np.int64)
+    need = np.asarray(max_need, dtype=np.int64) - allocation
+    work = np.array(available, dtype=np.int64)
+    finish = np.zeros(allocation.shape[:2], dtype=bool)
+    active = np.arange(len(allocation))
+    while len(active):
+        # Proses runnable: belum selesai dan seluruh kebutuhannya muat di work
+        runnable = ~finish[active] & (need[active] <= work[active, None, :]).all(axis=2)
+        progressed = runnable.any(axis=1)
+        if not progressed.any():
+            break
+        active, runnable = active[progressed], runnable[progressed]
+        finish[active] |= runnable
+        work[active] += np.einsum('bn,bnm->bm', runnable.astype(np.int64), allocation[active])
+    return ~finish
+
+
+def _reduce_python(allocation, max_need, available):
+    deadlocked = []
+    for alloc, max_, avail in zip(allocation, max_need, available):
+        engine = run_reduction(alloc, max_, avail)
+        deadlocked.append([not done for done in engine.finish])
+    return deadlocked
+
+
+def detect_deadlock_batch(allocation, max_need, available):
+    """
+    Reduksi B skenario sekaligus. allocation dan max_need berbentuk B x n x m,
+    available B x m. Mengembalikan mask proses deadlock B x n (array bool
+    dengan NumPy, list of list tanpa NumPy).
+    """
+    if np is not None:
+        return _reduce_numpy(allocation, max_need, available)
+    return _reduce_python(allocation, max_need, available)
+
+
+def bankers_batch(allocation, max_need, available):
+    """
+    Flag state aman per skenario (B): aman jika semua proses bisa selesai
+    """
+    deadlocked = detect_deadlock_batch(allocation, max_need, available)
+    if np is not None:
+        return ~deadlocked.any(axis=1)
+    return [not any(row) for row in deadlocked]
+
+
+def generate_batch(batch_size, num_processes, num_resources, num_cores, seed=None, start=0):
+    """
+    Tumpuk batch_size skenario generate_matrices; skenario ke-k sama dengan
+    generate_scenario(..., seed, start + k). Mengembalikan (allocation,
+    max_need, available) berbentuk B x n x m, B x n x m dan B x m.
+    """
+    matrices = [generate_matrices(num_processes, num_resources, num_cores, seed, start + k)
+                for k in range(batch_size)]
+    allocation = [alloc for alloc, _, _, _ in matrices]
+    max_need = [max_ for _, max_, _, _ in matrices]
+    available = [avail for _, _, avail, _ in matrices]
+    if np is not None:
+        return np.stack(allocation), np.stack(max_need), np.stack(available)
+    return allocation, max_need, available
+
+
+def estimate(num_processes, num_resources, num_cores, samples, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Estimasi peluang deadlock untuk satu titik parameter dari samples
+    skenario acak
+    """
+    deadlocks = 0
+    deadlocked_processes = 0
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        mask = detect_deadlock_batch(*generate_batch(size, num_processes, num_resources, num_cores, seed, start))
+        if np is not None:
+            deadlocks += int(mask.any(axis=1).sum())
+            deadlocked_processes += int(mask.sum())
+        else:
+            deadlocks += sum(1 for row in mask if any(row))
+            deadlocked_processes += sum(sum(row) for row in mask)
+    rate = deadlocks / samples if samples else 0.0
+    return {
+        "processes": num_processes,
+        "resources": num_resources,
+        "cores": num_cores,
+        "samples": samples,
+        "deadlock_rate": rate,
+        "stderr": math.sqrt(rate * (1 - rate) / samples) if samples else 0.0,
+        "mean_deadlocked": deadlocked_processes / samples if samples else 0.0
+    }
+
+
+def sweep(processes, resources, cores, samples, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Tabel peluang deadlock untuk setiap kombinasi (processes, resources,
+    cores). Setiap titik grid memakai stream skenario yang sama untuk seed
+    yang sama sehingga hasilnya bisa diulang.
+    """
+    return [
+        estimate(n, m, c, samples, seed, batch_size)
+        for n, m, c in itertools.product(processes, resources, cores)
+    ]
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep peluang deadlock skenario acak")
+    parser.add_argument("--processes", type=_int_list, default=[5, 10, 20])
+    parser.add_argument("--resources", type=_int_list, default=[3, 5])
+    parser.add_argument("--cores", type=_int_list, default=[2])
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--output", help="Tulis tabel sebagai JSON ke file ini")
+    args = parser.parse_args(argv)
+
+    table = sweep(args.processes, args.resources, args.cores, args.samples, args.seed, args.batch_size)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(table, f, indent=2)
+    print(f"{'proses':>8} {'resource':>9} {'core':>5} {'rate':>8} {'stderr':>8} {'rata2 deadlock':>15}")
+    for row in table:
+        print(f"{row['processes']:>8} {row['resources']:>9} {row['cores']:>5} "
+              f"{row['deadlock_rate']:>8.4f} {row['stderr']:>8.4f} {row['mean_deadlocked']:>15.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Strategi Prevention: urutan resource global dan eliminasi Hold & Wait.
+
+Urutan resource diturunkan dari graph proses-resource: resource yang
+dipegang sebuah proses harus mendahului resource yang masih dibutuhkannya
+(held -> proses -> needed). Urutan topologis kondensasi SCC graph ini
+konsisten dengan semua holding yang ada; pasangan hold/need yang tetap
+melanggar hanya ada di dalam SCC bersiklus, yaitu calon circular wait.
+Semua langkah O(P + R + E) dengan E jumlah sel allocation/need yang tidak nol.
+
+Eliminasi Hold & Wait disimulasikan: setiap proses meminta seluruh
+max_need-nya sekaligus dari antrian admisi FIFO per core dan baru berjalan
+jika semuanya tersedia, lalu melepas semuanya saat selesai.
+"""
+import heapq
+import random
+from collections import deque
+from itertools import compress
+
+import metrics
+from cycles import strongly_connected_components
+
+# Batas total pasangan pelanggaran yang dicantumkan satu per satu
+MAX_VIOLATION_PAIRS = 10000
+
+
+def _sparse_rows(matrix, num_resources):
+    columns = range(num_resources)
+    return [list(compress(columns, row)) for row in matrix]
+
+
+def resource_order(allocation, need, num_resources):
+    """
+    Rank setiap resource (0 = diminta paling awal) dari urutan topologis SCC
+    graph held -> proses -> needed. Resource dalam satu SCC diurutkan
+    berdasarkan indeks. Mengembalikan (rank per resource, SCC bersiklus
+    berupa list indeks resource).
+    """
+    m = num_resources
+    graph = {j: [] for j in range(m)}
+    for i, (held, needed) in enumerate(zip(allocation, need)):
+        node = m + i
+        graph[node] = needed
+        for j in held:
+            graph[j].append(node)
+
+    # Tarjan menghasilkan SCC dari sink ke source
+    rank = [0] * m
+    cyclic = []
+    position = 0
+    for component in reversed(strongly_connected_components(graph)):
+        members = [v for v in component if v < m]
+        for j in members:
+            rank[j] = position
+            position += 1
+        if len(members) > 1:
+            cyclic.append(members)
+    return rank, cyclic
+
+
+def ordering_violations(processes, resources, allocation, need, rank, max_pairs=MAX_VIOLATION_PAIRS):
+    """
+    Pasangan (held, needed) yang melanggar urutan: proses memegang resource
+    dengan rank lebih tinggi dari resource yang masih dibutuhkannya.
+    Mengembalikan (pelanggaran per proses, total pasangan); daftar pasangan
+    dipotong setelah max_pairs, tetapi pair_count per proses selalu lengkap.
+    """
+    m = len(rank)
+    by_rank = [0] * m
+    for j, r in enumerate(rank):
+        by_rank[r] = j
+    # Bucket per resource lalu satu lintasan urutan global: held/needed
+    # setiap proses langsung terurut rank tanpa sort per proses
+    holders = [[] for _ in range(m)]
+    needers = [[] for _ in range(m)]
+    for i, (held, needed) in enumerate(zip(allocation, need)):
+        if held and needed:
+            for j in held:
+                holders[j].append(i)
+            for j in needed:
+                needers[j].append(i)
+    held_by_rank = [[] for _ in allocation]
+    need_by_rank = [[] for _ in need]
+    for j in by_rank:
+        for i in holders[j]:
+            held_by_rank[i].append(j)
+        for i in needers[j]:
+            need_by_rank[i].append(j)
+
+    violations = []
+    total = 0
+    for i, (held, needed) in enumerate(zip(held_by_rank, need_by_rank)):
+        if not held or rank[needed[0]] > rank[held[-1]]:
+            continue
+        lowest = rank[needed[0]]
+        pairs = []
+        count = 0
+        k = 0
+        for h in held:
+            # Two-pointer: needed dengan rank < rank[h] adalah prefiks needed
+            while k < len(needed) and rank[needed[k]] < rank[h]:
+                k += 1
+            count += k
+            for n in needed[:min(k, max(0, max_pairs - total - len(pairs)))]:
+                pairs.append([resources[h], resources[n]])
+        if count:
+            violations.append({
+                "process": processes[i],
+                "pair_count": count,
+                "pairs": pairs,
+                "release": [resources[h] for h in allocation[i] if rank[h] > lowest]
+            })
+            total += count
+    return violations, total
+
+
+class AdmissionSimulator:
+    """
+    Simulasi alokasi all-at-once: setiap core punya antrian FIFO proses;
+    kepala antrian di core yang idle diadmisi jika seluruh max_need-nya muat
+    di resource bebas, berjalan selama burst-nya lalu melepas semuanya.
+    Proses dengan max_need melebihi total resource ditolak.
+    """
+
+    def __init__(self, claims, amounts, total, core_of, num_cores, burst):
+        self.claims = claims
+        self.amounts = amounts
+        self.free = total[:]
+        self.burst = burst
+        n = len(claims)
+        self.rejected = [i for i in range(n)
+                         if any(a > total[j] for j, a in zip(claims[i], amounts[i]))]
+        rejected = set(self.rejected)
+        self.queues = [deque() for _ in range(num_cores)]
+        for i in range(n):
+            if i not in rejected:
+                self.queues[core_of[i]].append(i)
+        self.idle = [True] * num_cores
+        self.start = [None] * n
+        self.finish = [None] * n
+        self.events = []
+        self.max_queue = max((len(q) for q in self.queues), default=0)
+
+    def _fits(self, i):
+        free = self.free
+        return all(free[j] >= a for j, a in zip(self.claims[i], self.amounts[i]))
+
+    def _admit(self, now):
+        admitted = []
+        for c, queue in enumerate(self.queues):
+            if not self.idle[c] or not queue or not self._fits(queue[0]):
+                continue
+            i = queue.popleft()
+            for j, a in zip(self.claims[i], self.amounts[i]):
+                self.free[j] -= a
+            self.idle[c] = False
+            self.start[i] = now
+            heapq.heappush(self.events, (now + self.burst[i], i, c))
+            admitted.append(i)
+        return admitted
+
+    def run(self):
+        """
+        Jalankan sampai semua proses selesai. Mengembalikan proses yang
+        diadmisi pada t=0.
+        """
+        initial = self._admit(0.0)
+        while self.events:
+            now, i, c = heapq.heappop(self.events)
+            self.finish[i] = now
+            for j, a in zip(self.claims[i], self.amounts[i]):
+                self.free[j] += a
+            self.idle[c] = True
+            self._admit(now)
+        return initial
+
+    def report(self):
+        done = [i for i in range(len(self.claims)) if self.finish[i] is not None]
+        makespan = max((self.finish[i] for i in done), default=0.0)
+        waits = sorted(self.start[i] for i in done)
+        busy = sum(self.burst[i] for i in done)
+        return {
+            "completed": len(done),
+            "rejected": len(self.rejected),
+            "makespan": makespan,
+            "throughput": len(done) / makespan if makespan else 0.0,
+            "mean_wait": sum(waits) / len(waits) if waits else 0.0,
+            "p95_wait": waits[min(len(waits) - 1, int(0.95 * len(waits)))] if waits else 0.0,
+            "max_wait": waits[-1] if waits else 0.0,
+            "mean_turnaround": sum(self.finish[i] for i in done) / len(done) if done else 0.0,
+            "core_utilization": busy / (makespan * len(self.queues)) if makespan else 0.0,
+            "max_queue": self.max_queue
+        }
+
+
+def _format_claim(resources, claims, amounts):
+    return ", ".join(f"{a} {resources[j]}" for j, a in zip(claims, amounts))
+
+
+def apply_prevention(data):
+    """
+    Hasil strategi Prevention untuk satu skenario: urutan resource,
+    pelanggaran urutan, dan simulasi alokasi all-at-once
+    """
+    processes = data['processes']
+    resources = data['resources']
+    allocation = data['allocation']
+    max_need = data['max_need']
+    available = data['available']
+    n = len(processes)
+    m = len(resources)
+
+    with metrics.phase("ordering"):
+        held = _sparse_rows(allocation, m)
+        need = [
+            [j for j in compress(range(m), max_row) if max_row[j] > alloc_row[j]]
+            for alloc_row, max_row in zip(allocation, max_need)
+        ]
+        rank, cyclic = resource_order(held, need, m)
+        violations, pair_count = ordering_violations(processes, resources, held, need, rank)
+
+    total = list(available)
+    for row, columns in zip(allocation, held):
+        for j in columns:
+            total[j] += row[j]
+    claims = _sparse_rows(max_need, m)
+    amounts = [[row[j] for j in columns] for row, columns in zip(max_need, claims)]
+
+    mapping = data.get('process_core_mapping') or {}
+    cores = list(data.get('cores') or sorted(set(mapping.values())) or ['Core1'])
+    core_index = {core: c for c, core in enumerate(cores)}
+    core_of = [core_index.get(mapping.get(p), i % len(cores)) for i, p in enumerate(processes)]
+    rng = random.Random(data.get('seed', 0))
+    burst_times = data.get('burst_times') or {}
+    burst = [float(burst_times.get(p, 0)) or rng.uniform(1.0, 10.0) for p in processes]
+
+    with metrics.phase("admission"):
+        simulator = AdmissionSimulator(claims, amounts, total, core_of, len(cores), burst)
+        initial = simulator.run()
+
+    # State setelah putaran admisi pertama: proses yang diadmisi memegang
+    # seluruh klaimnya, proses lain tidak memegang apa pun
+    modified_allocation = [[0] * m for _ in range(n)]
+    modified_available = total[:]
+    for i in initial:
+        for j, a in zip(claims[i], amounts[i]):
+            modified_allocation[i][j] = a
+            modified_available[j] -= a
+
+    order = sorted(range(m), key=rank.__getitem__)
+    steps = [{
+        "type": "ordering",
+        "action": "Resource Ordering",
+        "order": [resources[j] for j in order],
+        "detail": "Urutan resource global: " + " < ".join(resources[j] for j in order)
+    }]
+    for violation in violations:
+        steps.append({
+            "type": "violation",
+            "process": violation["process"],
+            "action": "Prevent Hold & Wait",
+            "release": violation["release"],
+            "detail": f"Proses {violation['process']} harus melepas {', '.join(violation['release'])} "
+                      f"sebelum meminta resource dengan urutan lebih rendah"
+        })
+    for i in sorted((i for i in range(n) if simulator.start[i] is not None),
+                    key=lambda i: (simulator.start[i], i)):
+        steps.append({
+            "type": "admission",
+            "process": processes[i],
+            "action": "Allocate All",
+            "core": cores[core_of[i]],
+            "start": simulator.start[i],
+            "finish": simulator.finish[i],
+            "detail": f"Proses {processes[i]} menerima semua resource "
+                      f"({_format_claim(resources, claims[i], amounts[i])}) sekaligus pada t={simulator.start[i]:.2f}"
+        })
+    for i in simulator.rejected:
+        steps.append({
+            "type": "rejected",
+            "process": processes[i],
+            "action": "Reject",
+            "detail": f"Proses {processes[i]} membutuhkan lebih dari total resource dan tidak pernah bisa diadmisi"
+        })
+
+    report = simulator.report()
+    explanation = "Menghilangkan kondisi Hold & Wait dengan mengalokasikan semua resource di awal"
+    if violations:
+        explanation += f". {len(violations)} proses melanggar urutan resource ({pair_count} pasangan hold/need)"
+    explanation += f". {report['completed']} proses selesai dalam {report['makespan']:.2f} satuan waktu, " \
+                   f"rata-rata menunggu {report['mean_wait']:.2f}"
+    return {
+        "strategy": "Prevention",
+        "explanation": explanation,
+        "steps": steps,
+        "resource_order": [resources[j] for j in order],
+        "ordering_cycles": [[resources[j] for j in members] for members in cyclic],
+        "violations": violations,
+        "violation_pairs": pair_count,
+        "violations_truncated": pair_count > sum(len(v["pairs"]) for v in violations),
+        "simulation": report,
+        "modified_allocation": modified_allocation,
+        "modified_available": modified_available
+    }
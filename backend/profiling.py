@@ -0,0 +1,188 @@
+"""
+Profiling per request untuk /api/simulate dan /api/solve.
+
+Panggilan solver dijalankan di bawah cProfile dan tracemalloc; hasilnya
+(dump pstats, fungsi termahal, lokasi alokasi terbesar, peak memori)
+disimpan di direktori dengan ID dan dibaca lewat /api/profiles/<id>.
+
+Profiling on-demand (header X-Profile: 1 atau ?profile=1) hanya untuk admin
+(header X-Admin-Token sama dengan ADMIN_TOKEN). Dengan PROFILE_SAMPLE_RATE=N
+satu dari N request yang benar-benar menjalankan solver diprofile otomatis.
+Jumlah profile di disk dibatasi PROFILE_RETENTION; yang tertua dihapus.
+
+File <id>.prof bisa dibuka langsung:
+    python -m pstats <id>.prof
+"""
+import cProfile
+import hmac
+import itertools
+import json
+import marshal
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Jumlah fungsi dan lokasi alokasi yang dicantumkan di ringkasan
+TOP_ENTRIES = 25
+
+_ID = re.compile(r"^[0-9a-f]{16}-[0-9a-f]{8}$")
+
+# tracemalloc bersifat global per proses: profiling dijalankan bergantian
+_lock = threading.Lock()
+
+
+class ProfileForbidden(Exception):
+    """Profiling diminta oleh pemanggil yang bukan admin"""
+
+
+def profile_call(fn, *args):
+    """
+    Jalankan fn(*args) di bawah cProfile dan tracemalloc. Mengembalikan
+    (hasil, report) dengan report berisi stats pstats (bytes marshal) dan
+    ringkasannya. Alokasi thread lain selama panggilan ikut terhitung.
+    """
+    with _lock:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            result = fn(*args)
+        finally:
+            profiler.disable()
+            wall = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+
+    profiler.create_stats()
+    functions = sorted(profiler.stats.items(), key=lambda item: item[1][3], reverse=True)
+    report = {
+        "wall_seconds": wall,
+        "peak_bytes": max(0, peak - baseline),
+        "functions": [
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "tottime": tottime,
+                "cumtime": cumtime
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in functions[:TOP_ENTRIES]
+        ],
+        "allocations": [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "bytes": stat.size,
+                "count": stat.count
+            }
+            for stat in snapshot.statistics('lineno')[:TOP_ENTRIES]
+        ],
+        "pstats": marshal.dumps(profiler.stats)
+    }
+    return result, report
+
+
+class ProfileStore:
+    """
+    Direktori profile: <id>.prof (dump pstats) dan <id>.json (ringkasan),
+    dibatasi retention file terbaru
+    """
+
+    def __init__(self, directory, retention=50, sample_rate=0, admin_token=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.retention = retention
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def is_admin(self, token):
+        return bool(self.admin_token) and token is not None \
+            and hmac.compare_digest(token.encode('utf-8'), self.admin_token.encode('utf-8'))
+
+    def sample(self):
+        """
+        True untuk satu dari sample_rate panggilan
+        """
+        if self.sample_rate <= 0:
+            return False
+        with self.lock:
+            return next(self.counter) % self.sample_rate == 0
+
+    def _path(self, profile_id, extension):
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, report, meta):
+        """
+        Simpan report profile_call beserta metadata request; mengembalikan ID
+        """
+        profile_id = f"{time.time_ns():016x}-{secrets.token_hex(4)}"
+        summary = {key: value for key, value in report.items() if key != "pstats"}
+        summary.update(meta, id=profile_id, created=time.time())
+        with open(self._path(profile_id, 'prof'), 'wb') as f:
+            f.write(report["pstats"])
+        # Ringkasan ditulis terakhir: profile dianggap ada jika .json ada
+        temporary = self._path(profile_id, 'json.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(summary, f)
+        os.replace(temporary, self._path(profile_id, 'json'))
+        self._prune()
+        return profile_id
+
+    def _prune(self):
+        with self.lock:
+            ids = sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith('.json'))
+            for profile_id in ids[:max(0, len(ids) - self.retention)]:
+                for extension in ('json', 'prof'):
+                    try:
+                        os.remove(self._path(profile_id, extension))
+                    except FileNotFoundError:
+                        pass
+
+    def get(self, profile_id):
+        """
+        Ringkasan profile, atau None jika ID tidak valid atau sudah dihapus
+        """
+        if not _ID.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id, 'json')) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def pstats_file(self, profile_id):
+        """
+        Nama file dump pstats di directory, atau None
+        """
+        if not _ID.match(profile_id) or not os.path.exists(self._path(profile_id, 'prof')):
+            return None
+        return f"{profile_id}.prof"
+
+    def list(self):
+        ids = sorted((name[:-5] for name in os.listdir(self.directory) if name.endswith('.json')), reverse=True)
+        return [summary for summary in map(self.get, ids) if summary is not None]
+
+
+def store_from_env():
+    """
+    ProfileStore dari environment: PROFILE_DIR, PROFILE_RETENTION,
+    PROFILE_SAMPLE_RATE dan ADMIN_TOKEN
+    """
+    directory = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'deadlock-profiles'))
+    return ProfileStore(
+        directory,
+        retention=int(os.environ.get('PROFILE_RETENTION', 50)),
+        sample_rate=int(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+        admin_token=os.environ.get('ADMIN_TOKEN')
+    )
@@ -0,0 +1,132 @@
+import time
+
+from reduction import Reduction
+
+
+class RecoveryEngine:
+    """
+    Engine recovery inkremental: setiap terminasi korban melepas resource-nya
+    ke work dan reduksi dilanjutkan dari state saat ini, bukan diulang dari awal.
+    """
+
+    def __init__(self, allocation, max_need, available):
+        self.allocation = [list(row) for row in allocation]
+        self.available = list(available)
+        self.engine = Reduction(self.allocation, max_need, self.available)
+        self.engine.run()
+        self.terminated = set()
+
+    def deadlocked(self, candidates):
+        """
+        Subset candidates (indeks proses) yang masih belum bisa selesai
+        """
+        finish = self.engine.finish
+        return [i for i in candidates if not finish[i]]
+
+    def terminate(self, i):
+        """
+        Terminasi proses i: lepaskan seluruh alokasinya dan lanjutkan reduksi
+        """
+        engine = self.engine
+        freed = self.allocation[i][:]
+        row = self.allocation[i]
+        for j in range(len(row)):
+            self.available[j] += row[j]
+            row[j] = 0
+        self.terminated.add(i)
+        if engine.finish[i]:
+            # Resource proses ini sudah terhitung di work saat ia selesai;
+            # cukup periksa ulang apakah max_need-nya masih bisa dipenuhi
+            engine.finish[i] = False
+            engine.requeue(i)
+        else:
+            # Proses yang diterminasi kini membutuhkan max_need penuh
+            engine.requeue(i)
+            engine.release(freed)
+        engine.run()
+        return freed
+
+
+def _recovers(allocation, max_need, work, deadlocked, victims):
+    """
+    Cek apakah terminasi victims menghilangkan seluruh deadlock. Proses yang
+    sudah selesai pada reduksi awal tidak perlu diperiksa ulang; cukup reduksi
+    proses deadlock dengan work akhir reduksi awal.
+    """
+    sub_allocation = []
+    sub_max_need = []
+    sub_work = work[:]
+    for i in deadlocked:
+        if i in victims:
+            for j, amount in enumerate(allocation[i]):
+                sub_work[j] += amount
+            sub_allocation.append([0] * len(work))
+        else:
+            sub_allocation.append(allocation[i])
+        sub_max_need.append(max_need[i])
+    engine = Reduction(sub_allocation, sub_max_need, sub_work)
+    engine.run()
+    return all(engine.finish)
+
+
+def minimum_cost_victims(allocation, max_need, available, priorities, index, time_budget=1.0):
+    """
+    Cari himpunan korban dengan total skor prioritas minimum menggunakan
+    branch-and-bound. priorities adalah output calculate_process_priority
+    (terurut naik) dan index memetakan nama proses ke indeks.
+
+    Mengembalikan (korban terurut berdasarkan prioritas, optimal) dengan
+    optimal=False jika time_budget (detik) habis sebelum pencarian selesai.
+    Korban bernilai None jika terminasi semua kandidat pun tidak menolong.
+    """
+    engine = Reduction(allocation, max_need, available)
+    engine.run()
+    work = engine.work
+    deadlocked = engine.unfinished()
+
+    candidates = [(index[proc], score) for proc, score in priorities]
+    deadline = time.perf_counter() + time_budget
+
+    # Solusi awal: terminasi greedy sesuai urutan prioritas
+    best = None
+    best_cost = float('inf')
+    chosen = set()
+    cost = 0
+    for i, score in candidates:
+        chosen.add(i)
+        cost += score
+        if _recovers(allocation, max_need, work, deadlocked, chosen):
+            best = set(chosen)
+            best_cost = cost
+            break
+    if best is None:
+        # Tidak ada himpunan korban yang menyelesaikan deadlock
+        return None, True
+
+    timed_out = False
+    chosen = set()
+
+    def search(k, cost):
+        nonlocal best, best_cost, timed_out
+        if time.perf_counter() > deadline:
+            timed_out = True
+            return
+        if chosen and _recovers(allocation, max_need, work, deadlocked, chosen):
+            if cost < best_cost:
+                best = set(chosen)
+                best_cost = cost
+            return
+        for t in range(k, len(candidates)):
+            i, score = candidates[t]
+            # Kandidat terurut naik, sehingga kandidat berikutnya tidak lebih murah
+            if cost + score >= best_cost:
+                return
+            chosen.add(i)
+            search(t + 1, cost + score)
+            chosen.discard(i)
+            if timed_out:
+                return
+
+    search(0, 0)
+    victims = [(proc, score) for proc, score in priorities if index[proc] in best]
+    return victims, not timed_out
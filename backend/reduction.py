@@ -0,0 +1,159 @@
+import heapq
+from contextlib import contextmanager
+
+# Daftar engine yang sedang dilacak (None = pelacakan nonaktif)
+_tracked = None
+
+
+@contextmanager
+def track_reductions():
+    """
+    Kumpulkan semua engine Reduction yang dibuat di dalam blok ini, misalnya
+    untuk menghitung total iterasi pada benchmark
+    """
+    global _tracked
+    previous = _tracked
+    _tracked = engines = []
+    try:
+        yield engines
+    finally:
+        _tracked = previous
+        if previous is not None:
+            previous.extend(engines)
+
+
+class Reduction:
+    """
+    Engine reduksi worklist (gaya Holt) yang dipakai bersama oleh
+    detect_deadlock, detect_deadlock_dependencies dan bankers_algorithm.
+
+    Untuk setiap resource disimpan heap proses yang belum selesai, diurutkan
+    berdasarkan sisa kebutuhan, ditambah hitungan resource yang belum
+    terpenuhi per proses. Saat resource dilepas ke work, hanya proses yang
+    benar-benar menjadi runnable yang dibangunkan.
+    """
+
+    def __init__(self, allocation, max_need, available):
+        n = len(allocation)
+        m = len(available)
+        self.n = n
+        self.m = m
+        self.allocation = allocation
+        self.max_need = max_need
+        self.work = list(available)
+        self.finish = [False] * n
+        self.need = [[max_need[i][j] - allocation[i][j] for j in range(m)] for i in range(n)]
+        # Jumlah resource yang kebutuhannya masih melebihi work
+        self.blocked = [0] * n
+        # Heap per resource berisi (sisa kebutuhan, indeks proses, versi)
+        self.waiting = [[] for _ in range(m)]
+        # Versi baris need per proses; entri heap dengan versi lama diabaikan
+        self.version = [0] * n
+        # Heap indeks proses yang siap dieksekusi (indeks terkecil dulu)
+        self.ready = []
+        # Jumlah operasi bangun/pop untuk keperluan pengukuran
+        self.iterations = 0
+        if _tracked is not None:
+            _tracked.append(self)
+
+        for i in range(n):
+            self._enqueue(i, list.append)
+        for heap in self.waiting:
+            heapq.heapify(heap)
+
+    def _enqueue(self, i, push=heapq.heappush):
+        """
+        Daftarkan proses i ke heap resource yang kebutuhannya belum terpenuhi
+        """
+        work = self.work
+        need_i = self.need[i]
+        version = self.version[i]
+        blocked = 0
+        self.iterations += self.m
+        for j in range(self.m):
+            if need_i[j] > work[j]:
+                push(self.waiting[j], (need_i[j], i, version))
+                blocked += 1
+        self.blocked[i] = blocked
+        if blocked == 0:
+            heapq.heappush(self.ready, i)
+
+    def _wake(self, j):
+        """
+        Bangunkan proses yang kebutuhan resource j-nya kini terpenuhi
+        """
+        heap = self.waiting[j]
+        limit = self.work[j]
+        blocked = self.blocked
+        version = self.version
+        while heap and heap[0][0] <= limit:
+            _, i, v = heapq.heappop(heap)
+            self.iterations += 1
+            if self.finish[i] or v != version[i]:
+                continue
+            blocked[i] -= 1
+            if blocked[i] == 0:
+                heapq.heappush(self.ready, i)
+
+    def requeue(self, i):
+        """
+        Hitung ulang baris need proses i setelah allocation/max_need-nya berubah
+        """
+        self.need[i] = [self.max_need[i][j] - self.allocation[i][j] for j in range(self.m)]
+        self.version[i] += 1
+        if not self.finish[i]:
+            self._enqueue(i)
+
+    def release(self, amounts):
+        """
+        Tambahkan vektor resource ke work dan bangunkan proses yang terdampak
+        """
+        for j in range(self.m):
+            if amounts[j]:
+                self.work[j] += amounts[j]
+                self._wake(j)
+
+    def next_runnable(self):
+        """
+        Ambil indeks proses runnable terkecil, atau None jika tidak ada
+        """
+        ready = self.ready
+        while ready:
+            i = heapq.heappop(ready)
+            self.iterations += 1
+            if not self.finish[i] and self.blocked[i] == 0:
+                return i
+        return None
+
+    def complete(self, i):
+        """
+        Tandai proses i selesai dan kembalikan resource-nya ke work
+        """
+        self.finish[i] = True
+        self.release(self.allocation[i])
+
+    def run(self, on_finish=None):
+        """
+        Jalankan reduksi sampai tidak ada proses yang bisa selesai.
+        on_finish(i, work_before) dipanggil sebelum resource proses i dilepas.
+        """
+        while True:
+            i = self.next_runnable()
+            if i is None:
+                break
+            if on_finish is not None:
+                on_finish(i, self.work)
+            self.complete(i)
+        return self.finish
+
+    def unfinished(self):
+        return [i for i in range(self.n) if not self.finish[i]]
+
+
+def run_reduction(allocation, max_need, available, on_finish=None):
+    """
+    Helper untuk menjalankan reduksi penuh dan mengembalikan engine-nya
+    """
+    engine = Reduction(allocation, max_need, available)
+    engine.run(on_finish)
+    return engine
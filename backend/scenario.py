@@ -0,0 +1,153 @@
+from array import array
+from operator import sub
+
+# Key skenario yang dipetakan ke atribut Scenario
+_MATRIX_KEYS = ('allocation', 'max_need', 'need')
+
+
+class Matrix:
+    """
+    Matriks n x m dalam satu buffer int32 kontigu. matrix[i] mengembalikan
+    memoryview baris (tanpa copy) sehingga kode yang memakai matrix[i][j],
+    len(matrix) dan iterasi baris tetap berjalan.
+    """
+
+    __slots__ = ('data', 'rows', 'cols', '_view')
+
+    def __init__(self, data, rows, cols):
+        if len(data) != rows * cols:
+            raise ValueError("Ukuran buffer tidak sesuai dengan dimensi matriks")
+        self.data = data
+        self.rows = rows
+        self.cols = cols
+        self._view = memoryview(data)
+
+    @classmethod
+    def from_rows(cls, rows, cols):
+        data = array('i')
+        for row in rows:
+            if len(row) != cols:
+                raise ValueError("Setiap baris matriks harus memiliki panjang yang sama")
+            data.extend(row)
+        return cls(data, len(data) // cols if cols else len(rows), cols)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Indeks baris di luar jangkauan")
+        start = i * self.cols
+        return self._view[start:start + self.cols]
+
+    def __iter__(self):
+        view = self._view
+        cols = self.cols
+        for start in range(0, self.rows * cols, cols):
+            yield view[start:start + cols]
+
+    def tolist(self):
+        cols = self.cols
+        return [self.data[start:start + cols].tolist() for start in range(0, self.rows * cols, cols)]
+
+    def copy(self):
+        return self.tolist()
+
+    def __reduce__(self):
+        # memoryview tidak bisa di-pickle (mis. saat dikirim ke compute pool)
+        return (Matrix, (array('i', self.data), self.rows, self.cols))
+
+
+class Scenario:
+    """
+    Skenario kompak: allocation dan max_need disimpan sebagai buffer int32
+    kontigu, dengan peta nama -> indeks. need baru dihitung (sekali) saat
+    dibaca; engine solver menghitung need sendiri, jadi request biasa tidak
+    membayar buffer n x m tambahan.
+
+    Scenario bisa dipakai langsung di fungsi yang menerima dict data
+    (handle_deadlock, solve_deadlock, apply_*) karena mendukung data[key] dan
+    data.get(key); matriksnya bisa diteruskan ke fungsi solver lain lewat
+    arguments().
+    """
+
+    __slots__ = ('processes', 'resources', 'allocation', 'max_need', '_need',
+                 'available', 'process_index', 'resource_index', 'options')
+
+    def __init__(self, processes, resources, allocation, max_need, available, options=None):
+        n = len(processes)
+        m = len(resources)
+        if not isinstance(allocation, Matrix):
+            allocation = Matrix.from_rows(allocation, m)
+        if not isinstance(max_need, Matrix):
+            max_need = Matrix.from_rows(max_need, m)
+        if len(allocation) != n or len(max_need) != n or len(available) != m:
+            raise ValueError("Ukuran matriks tidak sesuai dengan jumlah proses/resource")
+
+        self.processes = list(processes)
+        self.resources = list(resources)
+        self.allocation = allocation
+        self.max_need = max_need
+        self._need = None
+        self.available = array('i', available)
+        self.process_index = {proc: i for i, proc in enumerate(self.processes)}
+        self.resource_index = {res: j for j, res in enumerate(self.resources)}
+        self.options = dict(options or {})
+
+    @property
+    def need(self):
+        if self._need is None:
+            # map tanpa list perantara: tidak ada n x m int ter-box sekaligus
+            self._need = Matrix(array('i', map(sub, self.max_need.data, self.allocation.data)),
+                                len(self.processes), len(self.resources))
+        return self._need
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Adapter dari dict JSON request; key lain disimpan sebagai opsi solver
+        """
+        options = {key: value for key, value in data.items()
+                   if key not in ('processes', 'resources', 'allocation', 'max_need', 'available', 'need')}
+        return cls(data['processes'], data['resources'], data['allocation'],
+                   data['max_need'], data['available'], options)
+
+    def to_dict(self):
+        return {
+            "processes": self.processes,
+            "resources": self.resources,
+            "allocation": self.allocation.tolist(),
+            "max_need": self.max_need.tolist(),
+            "need": self.need.tolist(),
+            "available": self.available.tolist()
+        }
+
+    def arguments(self):
+        """
+        Argumen (processes, resources, allocation, max_need, available) untuk
+        detect_deadlock, detect_deadlock_dependencies dan bankers_algorithm
+        """
+        return self.processes, self.resources, self.allocation, self.max_need, self.available
+
+    # Protokol mapping minimal agar Scenario bisa menggantikan dict data
+
+    def __getitem__(self, key):
+        if key in ('processes', 'resources', 'available') or key in _MATRIX_KEYS:
+            return getattr(self, key)
+        return self.options[key]
+
+    def __contains__(self, key):
+        return key in ('processes', 'resources', 'available') or key in _MATRIX_KEYS or key in self.options
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def nbytes(self):
+        """
+        Ukuran buffer matriks dalam byte (need hanya jika sudah dihitung)
+        """
+        matrices = [matrix for matrix in (self.allocation, self.max_need, self._need) if matrix is not None]
+        total = sum(matrix.data.itemsize * len(matrix.data) for matrix in matrices)
+        return total + self.available.itemsize * len(self.available)
@@ -0,0 +1,162 @@
+"""
+Entry point produksi. Socket dibuka sekali lalu beberapa worker proses
+(pre-fork) melayani port yang sama; tiap worker memakai server WSGI
+berthread dan menjalankan solver di compute pool proses terpisah, sehingga
+request ringan seperti /game tidak menunggu solve yang berat.
+
+Contoh:
+    python serve.py --port 8000 --workers 4
+    COMPUTE_DEADLINE=10 COMPUTE_QUEUE=32 python serve.py
+
+Sesi /api/session disimpan di memori tiap worker, jadi pemakai sesi perlu
+--workers 1 atau routing yang sticky.
+
+Dengan gunicorn, pakai objek app dari modul ini:
+    gunicorn -w 4 --threads 32 -b 0.0.0.0:8000 serve:app
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+from werkzeug.serving import make_server
+
+from compute import pool_from_env
+from main import app
+
+MAX_REQUEST_BYTES = int(os.environ.get('MAX_REQUEST_BYTES', 16 * 1024 * 1024))
+
+
+def configure(app):
+    """
+    Aktifkan mode produksi: batas ukuran body (413 dari Flask) dan compute
+    pool untuk /api/simulate dan /api/solve
+    """
+    app.config['DEBUG'] = False
+    app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
+    if app.config.get('COMPUTE_POOL') is None:
+        app.config['COMPUTE_POOL'] = pool_from_env()
+    return app
+
+
+configure(app)
+
+
+def bind(host, port, backlog=1024):
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class RespawnLimiter:
+    """
+    Jeda respawn worker. Worker yang mati kurang dari min_uptime detik setelah
+    start dihitung crash cepat: jeda berlipat dua per crash cepat beruntun
+    (maksimum max_delay) dan setelah max_crashes crash cepat beruntun
+    supervisor menyerah. Worker yang sempat hidup lama mereset hitungan.
+    """
+
+    def __init__(self, min_uptime=5.0, base_delay=0.5, max_delay=30.0, max_crashes=5):
+        self.min_uptime = min_uptime
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_crashes = max_crashes
+        self.crashes = 0
+
+    def died(self, uptime):
+        """
+        Jeda (detik) sebelum respawn, atau None jika supervisor harus berhenti
+        """
+        if uptime >= self.min_uptime:
+            self.crashes = 0
+            return 0.0
+        self.crashes += 1
+        if self.crashes >= self.max_crashes:
+            return None
+        return min(self.base_delay * 2 ** (self.crashes - 1), self.max_delay)
+
+
+def run_worker(host, port, sock):
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    server.serve_forever()
+
+
+def serve(host, port, workers):
+    sock = bind(host, port)
+    if workers <= 1 or not hasattr(os, 'fork'):
+        run_worker(host, port, sock)
+        return 0
+
+    started = {}
+    limiter = RespawnLimiter()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 1
+            try:
+                run_worker(host, port, sock)
+                code = 0
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        started[pid] = time.monotonic()
+
+    def terminate():
+        for pid in started:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame):
+        terminate()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    print(f"Melayani http://{host}:{port} dengan {workers} worker", file=sys.stderr)
+
+    # Ganti worker yang mati agar jumlah worker tetap, dengan jeda jika
+    # worker terus mati segera setelah start
+    while True:
+        pid, status = os.wait()
+        if pid not in started:
+            continue
+        uptime = time.monotonic() - started.pop(pid)
+        delay = limiter.died(uptime)
+        if delay is None:
+            print(f"Worker terus mati segera setelah start (status {status}); server berhenti",
+                  file=sys.stderr)
+            terminate()
+            return 1
+        if delay:
+            print(f"Worker {pid} mati setelah {uptime:.1f} detik; respawn dalam {delay:.1f} detik",
+                  file=sys.stderr)
+            time.sleep(delay)
+        spawn()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server produksi simulator deadlock")
+    parser.add_argument("--host", default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument("--port", type=int, default=int(os.environ.get('PORT', 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get('WEB_WORKERS', 2)))
+    args = parser.parse_args(argv)
+    return serve(args.host, args.port, args.workers)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
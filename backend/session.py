@@ -0,0 +1,306 @@
+import threading
+import uuid
+
+from reduction import Reduction
+from solver import find_cycles
+from graph import resource_holders
+
+
+class DeadlockSession:
+    """
+    Sesi deadlock stateful yang menyimpan matriks dan menerapkan event
+    request/release secara inkremental.
+
+    Safe sequence terakhir dipakai sebagai sertifikat: selama event tidak
+    merusak urutan tersebut, himpunan deadlock tidak perlu dihitung ulang dan
+    hanya edge wait-for dari/ke proses yang terdampak yang diperbarui.
+    """
+
+    def __init__(self, data):
+        self.processes = list(data['processes'])
+        self.resources = list(data['resources'])
+        self.allocation = [list(row) for row in data['allocation']]
+        self.max_need = [list(row) for row in data['max_need']]
+        self.available = list(data['available'])
+
+        n = len(self.processes)
+        m = len(self.resources)
+        if len(self.allocation) != n or len(self.max_need) != n or len(self.available) != m:
+            raise ValueError("Ukuran matriks tidak sesuai dengan jumlah proses/resource")
+        for i in range(n):
+            if len(self.allocation[i]) != m or len(self.max_need[i]) != m:
+                raise ValueError(f"Baris matriks untuk {self.processes[i]} tidak sesuai jumlah resource")
+
+        self.process_index = {p: i for i, p in enumerate(self.processes)}
+        self.resource_index = {r: j for j, r in enumerate(self.resources)}
+
+        # Indeks resource -> proses yang memegangnya
+        self.holders = [set(h) for h in resource_holders(self.allocation, m, range(n))]
+
+        self.lock = threading.Lock()
+        self.version = 0
+        self.full_recomputes = 0
+        self._recompute()
+
+    # ------------------------------------------------------------------
+    # Reduksi dan wait-for graph
+    # ------------------------------------------------------------------
+
+    def _recompute(self):
+        """
+        Reduksi penuh: hitung ulang safe sequence, himpunan deadlock dan edge
+        """
+        self.engine = Reduction(self.allocation, self.max_need, self.available)
+        self.sequence = []
+        self.position = {}
+        self.waits_for = {}
+        self._continue_reduction()
+        for i in self.engine.unfinished():
+            self.waits_for[i] = self._out_edges(i)
+        self.full_recomputes += 1
+
+    def _continue_reduction(self):
+        """
+        Lanjutkan reduksi dari work saat ini dan catat proses yang selesai
+        """
+        finished = []
+
+        def record(i, work):
+            self.position[i] = len(self.sequence)
+            self.sequence.append(i)
+            finished.append(i)
+
+        self.engine.run(record)
+        # Proses yang selesai keluar dari wait-for graph
+        for i in finished:
+            self.waits_for.pop(i, None)
+        for i in finished:
+            for edges in self.waits_for.values():
+                edges.discard(i)
+        return finished
+
+    def _out_edges(self, i):
+        """
+        Proses deadlock lain yang memegang resource yang dibutuhkan proses i
+        """
+        finish = self.engine.finish
+        need_i = self.engine.need[i]
+        edges = set()
+        for j in range(len(self.resources)):
+            if need_i[j] > 0:
+                for h in self.holders[j]:
+                    if h != i and not finish[h]:
+                        edges.add(h)
+        return edges
+
+    def _refresh_edges(self, i, j):
+        """
+        Perbarui edge yang terdampak perubahan baris proses i pada resource j
+        """
+        finish = self.engine.finish
+        if not finish[i]:
+            self.waits_for[i] = self._out_edges(i)
+        # Edge masuk ke i hanya bisa berubah untuk proses deadlock yang butuh resource j
+        for q, edges in self.waits_for.items():
+            if q == i or self.engine.need[q][j] <= 0:
+                continue
+            if finish[i]:
+                edges.discard(i)
+            elif any(self.engine.need[q][k] > 0 and self.allocation[i][k] > 0
+                     for k in range(len(self.resources))):
+                edges.add(i)
+            else:
+                edges.discard(i)
+
+    def _certificate_holds(self, j, amount, upto):
+        """
+        Cek apakah safe sequence (sampai posisi upto) tetap valid jika
+        available[j] berkurang sebanyak amount
+        """
+        w = self.available[j] - amount
+        allocation = self.allocation
+        need = self.engine.need
+        for q in self.sequence[:upto]:
+            if need[q][j] > w:
+                return False
+            w += allocation[q][j]
+        return True
+
+    # ------------------------------------------------------------------
+    # Event
+    # ------------------------------------------------------------------
+
+    def _lookup(self, event):
+        proc = event.get('process')
+        res = event.get('resource')
+        if proc not in self.process_index:
+            raise ValueError(f"Proses {proc} tidak dikenal")
+        if res not in self.resource_index:
+            raise ValueError(f"Resource {res} tidak dikenal")
+        amount = event.get('amount', 1)
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+            raise ValueError("Jumlah resource harus bilangan bulat positif")
+        return self.process_index[proc], self.resource_index[res], amount
+
+    def apply_event(self, event):
+        """
+        Terapkan satu event {"type": "request"|"release", "process", "resource", "amount"}
+        """
+        event_type = event.get('type')
+        if event_type not in ("request", "release"):
+            raise ValueError("Tipe event harus 'request' atau 'release'")
+        i, j, amount = self._lookup(event)
+
+        with self.lock:
+            if event_type == "request":
+                result = self._request(i, j, amount)
+            else:
+                result = self._release(i, j, amount)
+            self.version += 1
+            result["version"] = self.version
+            result["safe"] = not self.waits_for
+            result["deadlocked"] = self._deadlocked_names()
+            return result
+
+    def _request(self, i, j, amount):
+        proc = self.processes[i]
+        res = self.resources[j]
+        if amount > self.engine.need[i][j]:
+            raise ValueError(f"Request {proc} untuk {res} melebihi kebutuhan maksimum")
+        if amount > self.available[j]:
+            return {
+                "status": "blocked",
+                "detail": f"Proses {proc} harus menunggu {amount} unit {res}"
+            }
+
+        finish = self.engine.finish
+        if finish[i]:
+            # Hanya urutan sebelum proses i yang kehilangan resource
+            valid = self._certificate_holds(j, amount, self.position[i])
+        else:
+            valid = self._certificate_holds(j, amount, len(self.sequence))
+
+        self.allocation[i][j] += amount
+        self.available[j] -= amount
+        self.holders[j].add(i)
+
+        if not valid:
+            self._recompute()
+        elif finish[i]:
+            # Work akhir tidak berubah, cukup perbarui baris need proses i
+            self.engine.requeue(i)
+        else:
+            # Work akhir berkurang: daftarkan ulang proses deadlock yang status
+            # resource j-nya berubah dari terpenuhi menjadi belum terpenuhi
+            work = self.engine.work
+            before = work[j]
+            work[j] -= amount
+            need = self.engine.need
+            for q in self.waits_for:
+                if q == i or before >= need[q][j] > work[j]:
+                    self.engine.requeue(q)
+            self._refresh_edges(i, j)
+
+        return {
+            "status": "granted",
+            "detail": f"{amount} unit {res} dialokasikan ke {proc}",
+            "full_recompute": not valid
+        }
+
+    def _release(self, i, j, amount):
+        proc = self.processes[i]
+        res = self.resources[j]
+        if amount > self.allocation[i][j]:
+            raise ValueError(f"Proses {proc} hanya memegang {self.allocation[i][j]} unit {res}")
+
+        self.allocation[i][j] -= amount
+        self.available[j] += amount
+        if self.allocation[i][j] == 0:
+            self.holders[j].discard(i)
+
+        self.engine.requeue(i)
+        if self.engine.finish[i]:
+            # Urutan tetap valid dan himpunan deadlock tidak berubah
+            finished = []
+        else:
+            # Resource dari proses deadlock menambah work akhir
+            amounts = [0] * len(self.resources)
+            amounts[j] = amount
+            self.engine.release(amounts)
+            finished = self._continue_reduction()
+            self._refresh_edges(i, j)
+
+        return {
+            "status": "released",
+            "detail": f"{proc} melepas {amount} unit {res}",
+            "unblocked": [self.processes[q] for q in finished]
+        }
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _deadlocked_names(self):
+        return [self.processes[i] for i in sorted(self.waits_for)]
+
+    def state(self):
+        """
+        Snapshot state sesi dengan format yang sama seperti /api/solve
+        """
+        with self.lock:
+            processes = self.processes
+            resources = self.resources
+            deadlocked = self._deadlocked_names()
+            dependencies = {}
+            for i in sorted(self.waits_for):
+                dependencies[processes[i]] = {
+                    "waits_for": [processes[q] for q in sorted(self.waits_for[i])],
+                    "holds": [
+                        {"resource": resources[j], "amount": self.allocation[i][j]}
+                        for j in range(len(resources)) if self.allocation[i][j] > 0
+                    ]
+                }
+            circular_waits = find_cycles(dependencies) if deadlocked else []
+            safe = not deadlocked
+            return {
+                "version": self.version,
+                "processes": processes,
+                "resources": resources,
+                "allocation": [row[:] for row in self.allocation],
+                "max_need": [row[:] for row in self.max_need],
+                "available": self.available[:],
+                "safe": safe,
+                "safe_sequence": [processes[i] for i in self.sequence] if safe else [],
+                "deadlocked": deadlocked,
+                "deadlock_dependencies": dependencies,
+                "circular_waits": circular_waits
+            }
+
+
+class SessionStore:
+    """
+    Penyimpanan sesi in-process dengan batas jumlah sesi
+    """
+
+    def __init__(self, max_sessions=1024):
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def create(self, data):
+        session = DeadlockSession(data)
+        with self.lock:
+            if len(self.sessions) >= self.max_sessions:
+                # Buang sesi tertua
+                self.sessions.pop(next(iter(self.sessions)))
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = session
+        return session_id, session
+
+    def get(self, session_id):
+        with self.lock:
+            return self.sessions.get(session_id)
+
+    def delete(self, session_id):
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
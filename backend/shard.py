@@ -0,0 +1,396 @@
+"""
+Deteksi dan recovery deadlock per komponen untuk skenario sangat besar.
+
+Proses yang tidak berbagi resource (langsung maupun lewat proses lain) tidak
+saling mempengaruhi: apakah sebuah proses deadlock hanya bergantung pada
+resource di komponennya sendiri. Komponen terhubung graph bipartit
+proses-resource dicari dengan union-find, setiap komponen mendapat potongan
+available-nya sendiri, lalu komponen dikelompokkan menjadi shard dan
+diselesaikan paralel di process pool.
+
+Hasil digabung kembali berdasarkan indeks proses global sehingga deadlocked,
+dependencies, circular_waits dan langkah recovery (termasuk salinan matriks
+per langkah) sama dengan jalur serial. solver.detect_deadlock,
+detect_deadlock_dependencies dan apply_detection_recovery_strategy memakai
+modul ini mulai SHARD_MIN_PROCESSES proses.
+"""
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from operator import itemgetter, or_
+
+import metrics
+from solver import (
+    analyze_deadlock_resource_relations,
+    calculate_process_priority,
+    continue_steps,
+    deadlock_wait_for,
+    detect_deadlock as serial_detect_deadlock,
+    detection_result,
+    detection_step,
+    finish_explanation,
+    recovery_step,
+    remaining_dependencies,
+    rooted_cycles,
+)
+from recovery import RecoveryEngine
+
+DEFAULT_WORKERS = int(os.environ.get('SHARD_WORKERS', os.cpu_count() or 1))
+
+# Kedalaman solve_component: hanya proses deadlock, plus dependencies dan
+# siklus, atau plus lintasan recovery
+DETECT = 0
+CYCLES = 1
+RECOVERY = 2
+
+_executor = None
+_executor_workers = None
+
+
+def get_executor(max_workers=None):
+    """
+    Process pool untuk shard, dibuat saat pertama kali dipakai
+    """
+    global _executor, _executor_workers
+    max_workers = max_workers or DEFAULT_WORKERS
+    if _executor is None or _executor_workers != max_workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+        _executor_workers = max_workers
+    return _executor
+
+
+def components(allocation, max_need, num_resources):
+    """
+    Komponen terhubung graph bipartit proses-resource (edge jika proses
+    memegang atau mengklaim resource) dengan union-find. Mengembalikan list
+    (indeks proses, indeks resource), keduanya terurut, dalam urutan proses
+    pertama tiap komponen. Proses tanpa resource sama sekali tidak pernah
+    deadlock sehingga tidak dimasukkan.
+    """
+    n = len(allocation)
+    parent = list(range(n + num_resources))
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    columns = range(num_resources)
+    members = []
+    for i in range(n):
+        touched = list(compress(columns, map(or_, allocation[i], max_need[i])))
+        if not touched:
+            continue
+        members.append(i)
+        root = find(i)
+        for j in touched:
+            other = find(n + j)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for i in members:
+        groups.setdefault(find(i), ([], []))[0].append(i)
+    for j in columns:
+        group = groups.get(find(n + j))
+        if group is not None:
+            group[1].append(j)
+    return list(groups.values())
+
+
+def _submatrix(matrix, rows, cols):
+    if len(cols) == 1:
+        j = cols[0]
+        return [[matrix[i][j]] for i in rows]
+    pick = itemgetter(*cols)
+    return [list(pick(matrix[i])) for i in rows]
+
+
+def split_scenario(data, parts):
+    """
+    Potong skenario menjadi sub-skenario per komponen (hasil components())
+    """
+    processes = data['processes']
+    resources = data['resources']
+    available = data['available']
+    return [
+        {
+            "processes": [processes[i] for i in rows],
+            "resources": [resources[j] for j in cols],
+            "allocation": _submatrix(data['allocation'], rows, cols),
+            "max_need": _submatrix(data['max_need'], rows, cols),
+            "available": [available[j] for j in cols]
+        }
+        for rows, cols in parts
+    ]
+
+
+def pack(sizes, num_shards):
+    """
+    Bagi komponen ke num_shards shard secara greedy (komponen terbesar ke
+    shard paling ringan). Mengembalikan list posisi komponen per shard.
+    """
+    shards = [(0, s, []) for s in range(num_shards)]
+    for k in sorted(range(len(sizes)), key=lambda k: -sizes[k]):
+        load, s, members = heapq.heappop(shards)
+        members.append(k)
+        heapq.heappush(shards, (load + sizes[k], s, members))
+    return [sorted(members) for _, _, members in sorted(shards, key=lambda shard: shard[1]) if members]
+
+
+def solve_component(scenario, level=RECOVERY):
+    """
+    Deteksi satu komponen. Dengan level=RECOVERY juga dihitung lintasan
+    recovery: state deadlock komponen setelah setiap korban (dalam urutan
+    prioritas komponen) diterminasi, sampai semua proses deadlock-nya habis.
+    """
+    processes = scenario['processes']
+    resources = scenario['resources']
+    allocation = scenario['allocation']
+    max_need = scenario['max_need']
+    available = scenario['available']
+
+    if level == DETECT:
+        return {"deadlocked": serial_detect_deadlock(processes, resources, allocation, max_need, available,
+                                                     shard=False)}
+    deadlocked, dependencies = deadlock_wait_for(processes, resources, allocation, max_need, available)
+    cycles = []
+    if deadlocked:
+        with metrics.phase("find_cycles"):
+            cycles = list(rooted_cycles(dependencies))
+        metrics.count("cycles_found", len(cycles))
+    result = {"deadlocked": deadlocked, "dependencies": dependencies, "cycles": cycles}
+    if level < RECOVERY or not deadlocked:
+        return result
+
+    result["relations"] = analyze_deadlock_resource_relations(
+        processes, resources, allocation, max_need, deadlocked
+    )
+    priorities = calculate_process_priority(processes, allocation, max_need, deadlocked)
+    result["priorities"] = priorities
+
+    engine = RecoveryEngine(allocation, max_need, available)
+    index = {proc: i for i, proc in enumerate(processes)}
+    deadlocked_idx = [index[proc] for proc in deadlocked]
+    initial_waits_for = {proc: dependencies[proc]["waits_for"] for proc in deadlocked}
+    trajectory = []
+    for victim, _ in priorities:
+        i = index[victim]
+        row = engine.allocation[i]
+        state = {
+            "freed": [
+                {"resource": resources[j], "amount": row[j]}
+                for j in range(len(resources)) if row[j] > 0
+            ]
+        }
+        with metrics.phase("recovery"):
+            engine.terminate(i)
+        remaining_idx = engine.deadlocked(deadlocked_idx)
+        state["remaining"] = [processes[q] for q in remaining_idx]
+        if remaining_idx:
+            state["dependencies"] = remaining_dependencies(
+                processes, resources, engine.allocation, max_need,
+                remaining_idx, engine.terminated, initial_waits_for
+            )
+            with metrics.phase("find_cycles"):
+                state["cycles"] = list(rooted_cycles(state["dependencies"]))
+        trajectory.append(state)
+    metrics.count("scan_passes", engine.engine.iterations)
+    result["trajectory"] = trajectory
+    return result
+
+
+def solve_shard(scenarios, level=RECOVERY, record=False):
+    """
+    Jalankan solve_component untuk setiap sub-skenario satu shard di worker.
+    Dengan record=True observasi metrik ikut dikembalikan untuk diputar ulang.
+    """
+    recorder = metrics.Recorder() if record else None
+    previous = metrics.set_collector(recorder)
+    try:
+        results = [solve_component(scenario, level) for scenario in scenarios]
+    finally:
+        metrics.set_collector(previous)
+    return results, recorder.events if recorder else []
+
+
+def run_shards(data, level=RECOVERY, workers=None):
+    """
+    Pecah data per komponen dan selesaikan paralel. Mengembalikan (indeks
+    proses per komponen, hasil solve_component per komponen), atau None jika
+    skenario hanya memiliki satu komponen.
+    """
+    parts = components(data['allocation'], data['max_need'], len(data['resources']))
+    if len(parts) < 2:
+        return None
+    scenarios = split_scenario(data, parts)
+
+    workers = workers or DEFAULT_WORKERS
+    shards = pack([len(rows) * (len(cols) + 1) for rows, cols in parts], min(len(parts), workers * 4))
+    record = metrics.get_collector() is not None
+    results = [None] * len(parts)
+    if workers == 1 or len(shards) == 1:
+        outcomes = [solve_shard([scenarios[k] for k in shard], level, record) for shard in shards]
+    else:
+        executor = get_executor(workers)
+        futures = [executor.submit(solve_shard, [scenarios[k] for k in shard], level, record)
+                   for shard in shards]
+        outcomes = [future.result() for future in futures]
+
+    metrics.count("shard_components", len(parts))
+    labels = metrics.current_labels()
+    for shard, (shard_results, events) in zip(shards, outcomes):
+        metrics.replay(events, labels)
+        for k, result in zip(shard, shard_results):
+            results[k] = result
+    return [rows for rows, _ in parts], results
+
+
+def _merge(index, parts):
+    """
+    Gabungkan (deadlocked, dependencies, rooted cycles) beberapa komponen
+    sesuai urutan indeks proses global. Siklus diurutkan berdasarkan akar DFS
+    yang menemukannya, sama seperti find_cycles pada graph gabungan.
+    """
+    deadlocked = sorted((proc for names, _, _ in parts for proc in names), key=index.__getitem__)
+    dependencies = {}
+    for proc, dependency in sorted((item for _, deps, _ in parts for item in deps.items()),
+                                   key=lambda item: index[item[0]]):
+        dependencies[proc] = dependency
+    rooted = heapq.merge(*(cycles for _, _, cycles in parts), key=lambda rc: index[rc[0]])
+    return deadlocked, dependencies, [cycle for _, cycle in rooted]
+
+
+def _scenario(processes, resources, allocation, max_need, available):
+    return {
+        "processes": processes,
+        "resources": resources,
+        "allocation": allocation,
+        "max_need": max_need,
+        "available": available
+    }
+
+
+def detect_deadlock(processes, resources, allocation, max_need, available, workers=None):
+    """
+    Versi per komponen dari solver.detect_deadlock, atau None jika skenario
+    tidak bisa dipecah
+    """
+    sharded = run_shards(_scenario(processes, resources, allocation, max_need, available), DETECT, workers)
+    if sharded is None:
+        return None
+    _, results = sharded
+    index = {proc: i for i, proc in enumerate(processes)}
+    return sorted((proc for r in results for proc in r["deadlocked"]), key=index.__getitem__)
+
+
+def detect_deadlock_dependencies(processes, resources, allocation, max_need, available, workers=None):
+    """
+    Versi per komponen dari solver.detect_deadlock_dependencies, atau None
+    jika skenario tidak bisa dipecah
+    """
+    sharded = run_shards(_scenario(processes, resources, allocation, max_need, available), CYCLES, workers)
+    if sharded is None:
+        return None
+    _, results = sharded
+    index = {proc: i for i, proc in enumerate(processes)}
+    return _merge(index, [(r["deadlocked"], r["dependencies"], r["cycles"]) for r in results])
+
+
+def apply_detection_recovery_strategy(data, workers=None):
+    """
+    Versi per komponen dari solver.apply_detection_recovery_strategy, atau
+    None jika skenario tidak bisa dipecah.
+
+    Korban diterminasi dalam urutan prioritas global seperti jalur serial;
+    state komponen setelah korban ke-k miliknya diambil dari lintasan
+    recovery komponen tersebut, dan state seluruh sistem adalah gabungan
+    state semua komponen.
+    """
+    processes = data['processes']
+    resources = data['resources']
+    sharded = run_shards(data, RECOVERY, workers)
+    if sharded is None:
+        return None
+    rows, results = sharded
+    index = {proc: i for i, proc in enumerate(processes)}
+
+    deadlocked, dependencies, circular_waits = _merge(
+        index, [(r["deadlocked"], r["dependencies"], r["cycles"]) for r in results]
+    )
+    result = {}
+    detection_result(data, result, dependencies, circular_waits)
+    if not deadlocked:
+        result["explanation"] = "Tidak ada deadlock yang terdeteksi"
+        result["recovered"] = True
+        return result
+
+    steps = result["steps"]
+    steps.append(detection_step(deadlocked, dependencies, circular_waits))
+
+    relations = {}
+    for proc, relation in sorted((item for r in results if r["deadlocked"] for item in r["relations"].items()),
+                                 key=lambda item: index[item[0]]):
+        relations[proc] = relation
+    result["resource_relations"] = relations
+
+    # Urutan prioritas global: sorted() stabil, jadi skor sama diurutkan
+    # berdasarkan indeks proses seperti calculate_process_priority
+    owner = {}
+    for c, r in enumerate(results):
+        for proc in r["deadlocked"]:
+            owner[proc] = c
+    priorities = heapq.merge(*(r["priorities"] for r in results if r["deadlocked"]),
+                             key=lambda item: (item[1], index[item[0]]))
+
+    # State terkini per komponen yang masih deadlock: (remaining, dependencies, rooted cycles)
+    live = {c: (r["deadlocked"], r["dependencies"], r["cycles"]) for c, r in enumerate(results) if r["deadlocked"]}
+    progress = [0] * len(results)
+    modified_allocation = [list(row) for row in data['allocation']]
+    modified_available = list(data['available'])
+    terminated_processes = []
+
+    for victim, priority_score in priorities:
+        c = owner[victim]
+        state = results[c]["trajectory"][progress[c]]
+        progress[c] += 1
+
+        step = recovery_step(victim, priority_score, state["freed"])
+        row = modified_allocation[index[victim]]
+        for j in range(len(resources)):
+            modified_available[j] += row[j]
+            row[j] = 0
+        terminated_processes.append(victim)
+        metrics.count("victims_terminated")
+        step["modified_allocation"] = [row[:] for row in modified_allocation]
+        step["modified_available"] = modified_available.copy()
+
+        if state["remaining"]:
+            live[c] = (state["remaining"], state["dependencies"], state["cycles"])
+        else:
+            live.pop(c, None)
+
+        if live:
+            remaining_deadlock, remaining_deps, remaining_cycles = _merge(index, live.values())
+            step["remaining_deadlock"] = remaining_deadlock
+            step["remaining_dependencies"] = remaining_deps
+            step["remaining_cycles"] = remaining_cycles
+            steps.append(step)
+        else:
+            result["recovered"] = True
+            step["detail"] += f". Deadlock teratasi!"
+            steps.append(step)
+            steps.extend(continue_steps(deadlocked, victim, []))
+            break
+
+    finish_explanation(result, terminated_processes)
+
+    result["modified_allocation"] = modified_allocation
+    result["modified_available"] = modified_available
+    return result
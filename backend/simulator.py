@@ -0,0 +1,535 @@
+import heapq
+import random
+import time
+from collections import deque
+
+from banker import BankerState
+from reduction import Reduction
+from solver import calculate_process_priority
+
+# Jenis event, diurutkan dengan (waktu, urutan) di heap
+SEGMENT_END = 0
+DETECT = 1
+
+READY = 0
+RUNNING = 1
+BLOCKED = 2
+DONE = 3
+REJECTED = 4
+
+# Batas event per simulasi dari request; max_events klien tidak bisa melewatinya
+MAX_EVENTS = 1_000_000
+
+
+class MultiCoreSimulator:
+    """
+    Simulator discrete-event untuk eksekusi proses di core masing-masing
+    (process_core_mapping). Setiap proses meminta sisa kebutuhannya per
+    resource dalam urutan acak (ter-seed); burst dibagi rata menjadi satu
+    segmen per request ditambah segmen akhir, lalu semua resource dilepas.
+
+    Proses yang tidak mendapat resource berstatus blocked dan melepas core-nya.
+    Strategi "Avoidance" mengabulkan request hanya jika sesuai sertifikat safe
+    sequence BankerState (O(m log n), tanpa safety scan); request lain
+    menunggu sampai sertifikat berubah karena proses lain melepas resource.
+    Proses terdepan di sertifikat selalu bisa dilayani, jadi simulasi selalu
+    maju. Dari state awal yang tidak aman hanya proses yang bisa diselesaikan
+    reduksi yang ikut sertifikat; sisanya tidak pernah bisa selesai dan
+    dilaporkan di unsafe_at_start.
+
+    "Detection" mengabulkan selama resource tersedia dan menjalankan deteksi
+    setiap detection_interval. Setiap deteksi menghentikan semua core
+    selama detection_cost waktu simulasi (tidak dihitung busy), jadi
+    overhead-nya ikut menambah makespan. Setelah itu korban (skor terendah
+    calculate_process_priority) diterminasi lalu diulang dari awal. Korban
+    dijalankan ulang satu per satu, satu setiap ada proses yang selesai;
+    jika semuanya dilepas sekaligus mereka kembali saling merebut resource
+    dan membentuk deadlock yang sama.
+
+    Proses dengan max_need melebihi total resource tidak pernah bisa selesai
+    dan ditolak di awal (alokasinya dilepas). Dengan initial="empty" semua
+    proses mulai tanpa alokasi, berguna untuk membandingkan strategi dari
+    state yang sama-sama aman.
+    """
+
+    def __init__(self, data, strategy="Avoidance", burst_times=None, detection_interval=5.0,
+                 detection_cost=0.01, seed=None, max_events=1_000_000, initial="allocation"):
+        if strategy not in ("Avoidance", "Detection"):
+            raise ValueError("Strategi simulasi harus 'Avoidance' atau 'Detection'")
+        self.strategy = strategy
+        self.processes = list(data['processes'])
+        self.process_index = {p: i for i, p in enumerate(self.processes)}
+        self.resources = list(data['resources'])
+        self.allocation = [list(row) for row in data['allocation']]
+        self.max_need = [list(row) for row in data['max_need']]
+        self.available = list(data['available'])
+        n = len(self.processes)
+        m = len(self.resources)
+        if len(self.allocation) != n or len(self.max_need) != n or len(self.available) != m:
+            raise ValueError("Ukuran matriks tidak sesuai dengan jumlah proses/resource")
+        if initial not in ("allocation", "empty"):
+            raise ValueError("initial harus 'allocation' atau 'empty'")
+
+        total = self.available[:]
+        for row in self.allocation:
+            for j, a in enumerate(row):
+                total[j] += a
+        self.total = total
+        if initial == "empty":
+            self.allocation = [[0] * m for _ in range(n)]
+            self.available = total[:]
+        self.rejected = [i for i in range(n) if any(self.max_need[i][j] > total[j] for j in range(m))]
+        for i in self.rejected:
+            for j in range(m):
+                self.available[j] += self.allocation[i][j]
+                self.allocation[i][j] = 0
+                self.max_need[i][j] = 0
+        # Kolom dengan alokasi tak nol per proses (alokasi umumnya jarang)
+        self.held_columns = [{j for j, a in enumerate(row) if a > 0} for row in self.allocation]
+
+        mapping = data.get('process_core_mapping') or {}
+        self.cores = list(data.get('cores') or sorted(set(mapping.values())) or ['Core1'])
+        core_index = {core: c for c, core in enumerate(self.cores)}
+        self.core_of = [core_index.get(mapping.get(p), i % len(self.cores))
+                        for i, p in enumerate(self.processes)]
+
+        self.rng = random.Random(seed)
+        burst_times = burst_times or {}
+        self.burst = [float(burst_times.get(p, 0)) or self.rng.uniform(1.0, 10.0) for p in self.processes]
+
+        self.detection_interval = detection_interval
+        self.detection_cost = detection_cost
+        self.max_events = max_events
+        self.bank = None
+        self.bank_index = {}
+        self.unsafe_at_start = []
+        if strategy == "Avoidance":
+            self.bank = self._certified_bank()
+            self.initial_safe = not self.unsafe_at_start
+        else:
+            self.initial_safe = BankerState(self.processes, self.resources, self.allocation,
+                                            self.max_need, self.available).sequence is not None
+
+        self.plan = [self._plan(i) for i in range(n)]
+        self.segment = [0] * n
+        self.holding = [False] * n
+        self.status = [READY] * n
+        for i in self.rejected:
+            self.status[i] = REJECTED
+        for i in self.unsafe_at_start:
+            self.status[i] = BLOCKED
+        self.blocked_since = [0.0] * n
+        self.blocked_time = [0.0] * n
+        self.finish_time = [None] * n
+        self.restarts = [0] * n
+
+        self.ready = [deque() for _ in self.cores]
+        self.running = [None] * len(self.cores)
+        self.busy_since = [0.0] * len(self.cores)
+        self.busy = [0.0] * len(self.cores)
+        self.waiting = [deque() for _ in self.resources]
+        # Avoidance: per resource, {jumlah request: heap (posisi di sertifikat, proses)}
+        self.certified_waiting = [{} for _ in self.resources]
+        self.held = deque()
+
+        self.events = []
+        self.seq = 0
+        self.pending = 0
+        self.processed = 0
+        self.now = 0.0
+        self.detections = 0
+        # Ada proses yang baru blocked sejak deteksi terakhir
+        self.blocked_changed = False
+        self.deadlocks = 0
+        self.terminated = []
+        self.detection_wall = 0.0
+
+    # ------------------------------------------------------------------
+    # Helper
+    # ------------------------------------------------------------------
+
+    def _certified_bank(self):
+        """
+        BankerState untuk proses yang bisa diselesaikan reduksi dari state
+        awal, dengan urutan reduksi sebagai sertifikat (diverifikasi O(n*m),
+        tanpa scan ulang). Proses sisanya tidak ikut dan tetap memegang
+        alokasinya.
+        """
+        order = []
+        Reduction(self.allocation, self.max_need, self.available).run(lambda i, work: order.append(i))
+        finishable = sorted(order)
+        self.bank_index = {i: k for k, i in enumerate(finishable)}
+        self.unsafe_at_start = [i for i in range(len(self.processes)) if i not in self.bank_index]
+        return BankerState([self.processes[i] for i in finishable], self.resources,
+                           [self.allocation[i] for i in finishable], [self.max_need[i] for i in finishable],
+                           self.available, safe_sequence=[self.processes[i] for i in order])
+
+    def _plan(self, i):
+        """
+        Urutan request (resource, jumlah) untuk sisa kebutuhan proses i
+        """
+        requests = [(j, mx - a) for j, (mx, a) in enumerate(zip(self.max_need[i], self.allocation[i]))
+                    if mx - a > 0]
+        self.rng.shuffle(requests)
+        return requests
+
+    def _schedule(self, at, kind, i=None):
+        self.seq += 1
+        if kind == SEGMENT_END:
+            self.pending += 1
+        heapq.heappush(self.events, (at, self.seq, kind, i))
+
+    def _segment_length(self, i):
+        return self.burst[i] / (len(self.plan[i]) + 1)
+
+    def _try_grant(self, i):
+        j, amount = self.plan[i][self.segment[i]]
+        if amount > self.available[j]:
+            return False
+        if self.bank is not None and self.bank.request_one(self.bank_index[i], j, amount) != "granted":
+            return False
+        self.allocation[i][j] += amount
+        self.available[j] -= amount
+        self.held_columns[i].add(j)
+        self.holding[i] = True
+        return True
+
+    # ------------------------------------------------------------------
+    # Core dan proses
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, c):
+        while self.running[c] is None and self.ready[c]:
+            i = self.ready[c].popleft()
+            self.running[c] = i
+            self.busy_since[c] = self.now
+            self.status[i] = RUNNING
+            self._advance(i)
+
+    def _release_core(self, i):
+        c = self.core_of[i]
+        self.busy[c] += self.now - self.busy_since[c]
+        self.running[c] = None
+
+    def _advance(self, i):
+        """
+        Proses i memegang core: mulai segmen berikutnya atau block pada request
+        """
+        s = self.segment[i]
+        if s < len(self.plan[i]) and not self.holding[i] and not self._try_grant(i):
+            self._block(i)
+            return
+        self._schedule(self.now + self._segment_length(i), SEGMENT_END, i)
+
+    def _block(self, i):
+        self.status[i] = BLOCKED
+        self.blocked_changed = True
+        self.blocked_since[i] = self.now
+        # Untuk Avoidance, resource bisa cukup tetapi state menjadi tidak aman
+        self._requeue(i)
+        self._release_core(i)
+
+    def _wake(self, i):
+        self.blocked_time[i] += self.now - self.blocked_since[i]
+        self.status[i] = READY
+        self.ready[self.core_of[i]].append(i)
+
+    def _retry(self, released):
+        """
+        Coba kabulkan request proses yang menunggu resource yang baru dilepas
+        (Detection) atau yang kini sesuai sertifikat (Avoidance)
+        """
+        woken = set()
+        if self.bank is not None:
+            self._retry_certified(woken)
+            released = ()
+        for j in released:
+            queue = self.waiting[j]
+            for _ in range(len(queue)):
+                i = queue.popleft()
+                if self.status[i] != BLOCKED:
+                    continue
+                if self._try_grant(i):
+                    self._wake(i)
+                    woken.add(self.core_of[i])
+                else:
+                    self._requeue(i)
+        for c in woken:
+            self._dispatch(c)
+
+    def _retry_certified(self, woken):
+        """
+        Request satu resource j sebesar r sesuai sertifikat jika r tidak
+        melebihi available[j] dan min slack prefix kolom j di posisi proses.
+        Min prefix tidak naik seiring posisi, jadi untuk (j, r) yang sama
+        proses yang bisa dikabulkan adalah awalan urutan posisi: cukup cek
+        kepala heap sampai yang pertama gagal, bukan semua proses menunggu.
+        """
+        for groups in self.certified_waiting:
+            for amount in sorted(groups):
+                heap = groups[amount]
+                while heap and self._try_grant(heap[0][1]):
+                    i = heapq.heappop(heap)[1]
+                    self._wake(i)
+                    woken.add(self.core_of[i])
+                if not heap:
+                    del groups[amount]
+
+    def _requeue(self, i):
+        j, amount = self.plan[i][self.segment[i]]
+        if self.bank is not None:
+            position = self.bank.position[self.bank_index[i]]
+            heapq.heappush(self.certified_waiting[j].setdefault(amount, []), (position, i))
+        else:
+            self.waiting[j].append(i)
+
+    def _release_all(self, i):
+        released = list(self.held_columns[i])
+        for j in released:
+            self.available[j] += self.allocation[i][j]
+            self.allocation[i][j] = 0
+        self.held_columns[i].clear()
+        return released
+
+    def _segment_end(self, i):
+        self.holding[i] = False
+        self.segment[i] += 1
+        if self.segment[i] <= len(self.plan[i]):
+            self._advance(i)
+            if self.status[i] == BLOCKED:
+                self._dispatch(self.core_of[i])
+            return
+        # Segmen terakhir selesai: proses selesai dan melepas semua resource
+        self.status[i] = DONE
+        self.finish_time[i] = self.now
+        released = self._release_all(i)
+        if self.bank is not None:
+            self.bank.retire(self.bank_index[i])
+        self._release_core(i)
+        self._dispatch(self.core_of[i])
+        self._retry(released)
+        self._restart_held()
+
+    # ------------------------------------------------------------------
+    # Deteksi dan recovery
+    # ------------------------------------------------------------------
+
+    def _victims(self):
+        """
+        Algoritma deteksi dengan matriks request: hanya proses blocked yang
+        memiliki request, proses lain dianggap bisa selesai sehingga
+        alokasinya langsung masuk work (total dikurangi alokasi proses
+        blocked). Setiap proses blocked menunggu tepat satu resource, jadi
+        reduksi cukup memakai heap (jumlah, proses) per resource dan hanya
+        kolom yang benar-benar dipegang: O(B log B + alokasi tak nol) per
+        deteksi, bukan O(B*m).
+        Korban (skor terendah calculate_process_priority) dipilih satu per
+        satu; terminasi korban sama dengan melepas alokasinya ke reduksi yang
+        sama, jadi cukup satu reduksi dan satu perhitungan skor per deteksi.
+        """
+        blocked = [i for i, status in enumerate(self.status) if status == BLOCKED]
+        if not blocked:
+            return []
+        allocation = self.allocation
+        work = self.total[:]
+        queues = {}
+        for i in blocked:
+            for j in self.held_columns[i]:
+                work[j] -= allocation[i][j]
+            j, amount = self.plan[i][self.segment[i]]
+            queues.setdefault(j, []).append((amount, i))
+        for heap in queues.values():
+            heapq.heapify(heap)
+        finished = set()
+
+        def release(columns):
+            stack = list(columns)
+            while stack:
+                j = stack.pop()
+                heap = queues.get(j)
+                while heap and heap[0][0] <= work[j]:
+                    i = heapq.heappop(heap)[1]
+                    if i in finished:
+                        continue
+                    finished.add(i)
+                    for h in self.held_columns[i]:
+                        work[h] += allocation[i][h]
+                        stack.append(h)
+
+        release(queues)
+        stuck = [i for i in blocked if i not in finished]
+        if not stuck:
+            return []
+
+        # Skor hanya bergantung pada allocation dan max_need yang tidak
+        # berubah selama pemilihan korban
+        names = [self.processes[i] for i in stuck]
+        ranking = calculate_process_priority(
+            names, [allocation[i] for i in stuck], [self.max_need[i] for i in stuck], names)
+        victims = []
+        for name, _ in ranking:
+            i = self.process_index[name]
+            # Korban tanpa alokasi tidak melepas apa pun: terminasinya tidak
+            # memutus deadlock, hanya menambah restart
+            if i in finished or not self.held_columns[i]:
+                continue
+            self.deadlocks += 1
+            victims.append(i)
+            finished.add(i)
+            for h in self.held_columns[i]:
+                work[h] += allocation[i][h]
+            release(self.held_columns[i])
+        return victims
+
+    def _detect(self):
+        start = time.perf_counter()
+        self.detections += 1
+        cost = self.detection_cost
+        if cost:
+            # Semua core berhenti selama deteksi: event tertunda mundur
+            # seragam (urutan heap tetap) dan waktu henti bukan waktu busy
+            self.events[:] = [(at + cost, seq, kind, i) for at, seq, kind, i in self.events]
+            for c, i in enumerate(self.running):
+                if i is not None:
+                    self.busy_since[c] += cost
+            self.now += cost
+        # Tanpa proses yang baru blocked, himpunan blocked hanya menyusut dan
+        # alokasinya tetap, jadi hasil deteksi sebelumnya (tanpa deadlock) berlaku
+        if self.blocked_changed:
+            self.blocked_changed = False
+            for victim in self._victims():
+                self._terminate(victim)
+        if not self.pending:
+            # Tidak ada proses yang berjalan: korban tidak akan dilepas oleh proses selesai
+            self._restart_held()
+        self.detection_wall += time.perf_counter() - start
+
+    def _terminate(self, i):
+        j, _ = self.plan[i][self.segment[i]]
+        try:
+            self.waiting[j].remove(i)
+        except ValueError:
+            pass
+        self.blocked_time[i] += self.now - self.blocked_since[i]
+        self.terminated.append(self.processes[i])
+        self.restarts[i] += 1
+        released = self._release_all(i)
+
+        # Diulang dari awal: seluruh max_need harus diminta lagi
+        self.plan[i] = self._plan(i)
+        self.segment[i] = 0
+        self.holding[i] = False
+        self.status[i] = READY
+        self.held.append(i)
+        self._retry(released)
+
+    def _restart_held(self):
+        """
+        Jalankan ulang korban yang paling lama ditahan
+        """
+        if not self.held:
+            return
+        i = self.held.popleft()
+        self.ready[self.core_of[i]].append(i)
+        self._dispatch(self.core_of[i])
+
+    # ------------------------------------------------------------------
+    # Loop utama
+    # ------------------------------------------------------------------
+
+    def run(self):
+        wall_start = time.perf_counter()
+        for i in range(len(self.processes)):
+            if self.status[i] == READY:
+                self.ready[self.core_of[i]].append(i)
+        for c in range(len(self.cores)):
+            self._dispatch(c)
+        if self.strategy == "Detection" and self.detection_interval:
+            self._schedule(self.detection_interval, DETECT)
+
+        events = self.events
+        unfinished = sum(1 for status in self.status if status not in (DONE, REJECTED))
+        while events and self.processed < self.max_events:
+            at, _, kind, i = heapq.heappop(events)
+            self.now = at
+            self.processed += 1
+            if kind == SEGMENT_END:
+                self.pending -= 1
+                self._segment_end(i)
+                if self.status[i] == DONE:
+                    unfinished -= 1
+            else:
+                self._detect()
+                # Tanpa segmen yang berjalan setelah deteksi, simulasi macet
+                if self.pending:
+                    self._schedule(self.now + self.detection_interval, DETECT)
+            if not unfinished:
+                break
+
+        wall = time.perf_counter() - wall_start
+        return self._report(wall)
+
+    def _report(self, wall):
+        makespan = max((t for t in self.finish_time if t is not None), default=0.0)
+        for c, i in enumerate(self.running):
+            if i is not None:
+                self.busy[c] += self.now - self.busy_since[c]
+                self.busy_since[c] = self.now
+        stalled = [self.processes[i] for i, status in enumerate(self.status) if status not in (DONE, REJECTED)]
+        horizon = max(makespan, self.now)
+        return {
+            "strategy": self.strategy,
+            "initial_safe": self.initial_safe,
+            "makespan": makespan,
+            "completed": sum(1 for status in self.status if status == DONE),
+            "stalled": stalled,
+            "rejected": [self.processes[i] for i in self.rejected],
+            "unsafe_at_start": [self.processes[i] for i in self.unsafe_at_start],
+            "truncated": bool(self.events) and self.processed >= self.max_events,
+            "events": self.processed,
+            "events_per_second": self.processed / wall if wall else None,
+            "wall_time": wall,
+            "cores": {
+                core: {
+                    "busy": self.busy[c],
+                    "utilization": self.busy[c] / horizon if horizon else 0.0
+                }
+                for c, core in enumerate(self.cores)
+            },
+            "blocked_time": sum(self.blocked_time),
+            "processes": {
+                p: {
+                    "core": self.cores[self.core_of[i]],
+                    "burst": self.burst[i],
+                    "finish_time": self.finish_time[i],
+                    "blocked_time": self.blocked_time[i],
+                    "restarts": self.restarts[i]
+                }
+                for i, p in enumerate(self.processes)
+            },
+            "detection": {
+                "runs": self.detections,
+                "deadlocks": self.deadlocks,
+                "terminated": self.terminated,
+                "overhead": self.detections * self.detection_cost,
+                "wall_time": self.detection_wall
+            } if self.strategy == "Detection" else None
+        }
+
+
+def simulate_execution(data, strategy="Avoidance"):
+    """
+    Jalankan simulasi multi-core untuk skenario data. Opsi: burst_times
+    (dict proses -> durasi), detection_interval, detection_cost, seed,
+    initial ("allocation" atau "empty") dan max_events (dibatasi MAX_EVENTS).
+    """
+    simulator = MultiCoreSimulator(
+        data, strategy,
+        burst_times=data.get('burst_times'),
+        detection_interval=data.get('detection_interval', 5.0),
+        detection_cost=data.get('detection_cost', 0.01),
+        seed=data.get('seed'),
+        max_events=min(int(data.get('max_events') or MAX_EVENTS), MAX_EVENTS),
+        initial=data.get('initial', 'allocation')
+    )
+    return simulator.run()
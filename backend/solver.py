@@ -1,164 +1,158 @@
-import random
+import os
+from reduction import Reduction, run_reduction
+from recovery import RecoveryEngine, minimum_cost_victims
+from cycles import wait_for_graph, cyclic_components, elementary_cycles
+from graph import resource_holders, build_wait_for
+from waitfor import is_single_instance, single_instance_deadlock
+from generator import generate_scenario
+from prevention import apply_prevention
+import metrics
 
-def detect_deadlock(processes, resources, allocation, max_need, available):
+# Mulai jumlah proses ini deteksi dan Detection & Recovery dipecah per komponen (shard.py)
+SHARD_MIN_PROCESSES = int(os.environ.get('SHARD_MIN_PROCESSES', 20000))
+# Batas sisi server enumerasi siklus elementer (opsi max_cycles/max_cycle_length)
+MAX_CYCLES = 1000
+MAX_CYCLE_LENGTH = 32
+
+def detect_deadlock(processes, resources, allocation, max_need, available, single_instance=True,
+                    shard=True):
     """
     Mendeteksi deadlock menggunakan Resource Allocation Graph
     """
-    n = len(processes)
-    m = len(resources)
-    finish = [False] * n
-    work = available[:]
+    if shard and len(processes) >= SHARD_MIN_PROCESSES:
+        # Skenario sangat besar: komponen independen dideteksi paralel
+        import shard as sharding
+        deadlocked = sharding.detect_deadlock(processes, resources, allocation, max_need, available)
+        if deadlocked is not None:
+            return deadlocked
 
-    # Algoritma deteksi deadlock
-    while True:
-        found = False
-        for i in range(n):
-            if not finish[i] and all(max_need[i][j] - allocation[i][j] <= work[j] for j in range(m)):
-                # Proses bisa selesai
-                for j in range(m):
-                    work[j] += allocation[i][j]
-                finish[i] = True
-                found = True
-        if not found:
-            break
+    # Semua resource satu unit: deadlock = proses yang mencapai siklus wait-for
+    if single_instance and is_single_instance(allocation, max_need, available):
+        with metrics.phase("wait_for"):
+            deadlocked_idx, _ = single_instance_deadlock(allocation, max_need, available)
+        metrics.count("single_instance")
+        return [processes[i] for i in deadlocked_idx]
+
+    # Algoritma deteksi deadlock (reduksi worklist)
+    with metrics.phase("reduction"):
+        engine = run_reduction(allocation, max_need, available)
+    metrics.count("scan_passes", engine.iterations)
 
     # Proses yang tidak bisa selesai adalah deadlock
-    deadlock_processes = [processes[i] for i in range(n) if not finish[i]]
+    deadlock_processes = [processes[i] for i in engine.unfinished()]
     return deadlock_processes
 
-def detect_deadlock_dependencies(processes, resources, allocation, max_need, available):
+def detect_deadlock_dependencies(processes, resources, allocation, max_need, available, single_instance=True,
+                                 shard=True):
     """
     Mendeteksi deadlock dengan algoritma yang lebih robust untuk jumlah proses berapapun
     """
-    n = len(processes)
-    m = len(resources)
-    finish = [False] * n
-    work = available[:]
-    
-    # Resource Allocation Graph dependencies
-    dependencies = {}
-    for i in range(n):
-        dependencies[processes[i]] = {
-            "waits_for": [],
-            "holds": []
-        }
+    if shard and len(processes) >= SHARD_MIN_PROCESSES:
+        import shard as sharding
+        sharded = sharding.detect_deadlock_dependencies(processes, resources, allocation, max_need, available)
+        if sharded is not None:
+            return sharded
+
+    deadlock_processes, deadlock_dependencies = deadlock_wait_for(
+        processes, resources, allocation, max_need, available, single_instance
+    )
     
-    # Identifikasi resource yang dipegang oleh proses
-    for i in range(n):
-        for j in range(m):
-            if allocation[i][j] > 0:
-                dependencies[processes[i]]["holds"].append({
-                    "resource": resources[j],
-                    "amount": allocation[i][j]
-                })
+    # Identifikasi circular wait untuk visualisasi
+    circular_waits = []
+    if deadlock_processes:
+        # Temukan semua siklus dalam wait-for graph
+        with metrics.phase("find_cycles"):
+            circular_waits = find_cycles(deadlock_dependencies)
+        metrics.count("cycles_found", len(circular_waits))
     
-    # Algoritma deteksi dengan pendekatan Need Matrix
-    # Work = Available
-    work = available[:]
+    return deadlock_processes, deadlock_dependencies, circular_waits
+
+def deadlock_wait_for(processes, resources, allocation, max_need, available, single_instance=True):
+    """
+    Proses deadlock beserta dependencies-nya (waits_for dan holds), tanpa
+    pencarian siklus
+    """
+    m = len(resources)
     
-    # Cari proses yang bisa selesai
-    while True:
-        found = False
-        for i in range(n):
-            if not finish[i]:
-                # Cek apakah proses dapat dieksekusi dengan resource yang tersedia
-                can_finish = True
-                for j in range(m):
-                    if max_need[i][j] - allocation[i][j] > work[j]:
-                        can_finish = False
-                        break
-                
-                if can_finish:
-                    # Proses dapat selesai, tambahkan resource-nya ke work
-                    for j in range(m):
-                        work[j] += allocation[i][j]
-                    finish[i] = True
-                    found = True
+    if single_instance and is_single_instance(allocation, max_need, available):
+        # Jalur cepat: proses deadlock dan wait-for graph-nya dalam satu pass linear
+        with metrics.phase("wait_for"):
+            deadlocked_idx, waits_for = single_instance_deadlock(allocation, max_need, available)
+        metrics.count("single_instance")
+    else:
+        # Algoritma deteksi dengan pendekatan Need Matrix (reduksi worklist)
+        with metrics.phase("reduction"):
+            engine = run_reduction(allocation, max_need, available)
+        metrics.count("scan_passes", engine.iterations)
+        deadlocked_idx = engine.unfinished()
         
-        # Jika tidak ada proses yang bisa dieksekusi, keluar dari loop
-        if not found:
-            break
-    
-    # Build waits_for graph berdasarkan resource yang dibutuhkan dan ditahan
-    for i in range(n):
-        if not finish[i]:  # Deadlocked process
-            needs = {}
-            
-            # Identifikasi resource yang dibutuhkan
-            for j in range(m):
-                remaining_need = max_need[i][j] - allocation[i][j]
-                if remaining_need > 0:
-                    needs[resources[j]] = remaining_need
-            
-            # Cari proses yang memegang resource yang dibutuhkan
-            for j in range(n):
-                if i != j:  # Bukan diri sendiri
-                    holds_needed_resource = False
-                    for k in range(m):
-                        if allocation[j][k] > 0 and resources[k] in needs:
-                            holds_needed_resource = True
-                            break
-                    
-                    if holds_needed_resource and processes[j] not in dependencies[processes[i]]["waits_for"]:
-                        dependencies[processes[i]]["waits_for"].append(processes[j])
+        # Build waits_for graph lewat indeks resource -> holder; hanya proses
+        # deadlock yang relevan karena dependencies difilter ke himpunan deadlock
+        with metrics.phase("wait_for"):
+            holders = resource_holders(allocation, m, deadlocked_idx)
+            waits_for = build_wait_for(engine.need, holders, deadlocked_idx)
     
     # Proses yang tidak bisa selesai adalah deadlock
-    deadlock_processes = [processes[i] for i in range(n) if not finish[i]]
+    deadlock_processes = [processes[i] for i in deadlocked_idx]
     
-    # Filter dependencies untuk hanya menunjukkan yang relevan dengan deadlock
     deadlock_dependencies = {}
-    for proc in deadlock_processes:
-        deadlock_dependencies[proc] = {
-            "waits_for": [p for p in dependencies[proc]["waits_for"] if p in deadlock_processes],
-            "holds": dependencies[proc]["holds"]
+    for i in deadlocked_idx:
+        deadlock_dependencies[processes[i]] = {
+            "waits_for": [processes[q] for q in sorted(waits_for[i])],
+            "holds": [
+                {"resource": resources[j], "amount": allocation[i][j]}
+                for j in range(m) if allocation[i][j] > 0
+            ]
         }
     
-    # Identifikasi circular wait untuk visualisasi
-    circular_waits = []
-    if deadlock_processes:
-        # Temukan semua siklus dalam wait-for graph
-        circular_waits = find_cycles(deadlock_dependencies)
-    
-    return deadlock_processes, deadlock_dependencies, circular_waits
+    return deadlock_processes, deadlock_dependencies
 
 def find_cycles(dependencies):
     """
     Temukan semua siklus dalam wait-for graph menggunakan DFS
     """
-    cycles = []
-    visited = {}
-    rec_stack = {}
-    
-    def dfs_cycle(node, path=None):
-        if path is None:
-            path = []
-        
-        if node in rec_stack and rec_stack[node]:
-            # Ditemukan cycle, cek apakah valid
-            cycle_start = path.index(node)
-            cycle = path[cycle_start:] + [node]
-            if len(cycle) > 1 and cycle not in cycles:
-                cycles.append(cycle)
-            return
-        
-        if node in visited and visited[node]:
-            return
-        
-        visited[node] = True
-        rec_stack[node] = True
-        path.append(node)
-        
-        for neighbor in dependencies.get(node, {}).get("waits_for", []):
-            dfs_cycle(neighbor, path[:])
+    return [cycle for _, cycle in rooted_cycles(dependencies)]
+
+def rooted_cycles(dependencies):
+    """
+    Generator (root, cycle) dengan root adalah akar DFS yang menemukan siklus
+    tersebut, dalam urutan yang sama dengan find_cycles
+    """
+    seen = set()
+    visited = set()
+    
+    # DFS iteratif: path adalah stack DFS, on_stack memetakan node ke posisinya
+    for root in dependencies:
+        if root in visited:
+            continue
+        visited.add(root)
+        path = [root]
+        on_stack = {root: 0}
+        stack = [iter(dependencies[root].get("waits_for", []))]
         
-        rec_stack[node] = False
-    
-    # Mulai DFS dari setiap node
-    for node in dependencies:
-        if node not in visited:
-            dfs_cycle(node)
-    
-    return cycles
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                stack.pop()
+                del on_stack[path.pop()]
+                continue
+            
+            if neighbor in on_stack:
+                # Ditemukan cycle, cek apakah valid
+                cycle = path[on_stack[neighbor]:] + [neighbor]
+                key = tuple(cycle)
+                if len(cycle) > 1 and key not in seen:
+                    seen.add(key)
+                    yield root, cycle
+                continue
+            
+            if neighbor in visited:
+                continue
+            
+            visited.add(neighbor)
+            on_stack[neighbor] = len(path)
+            path.append(neighbor)
+            stack.append(iter(dependencies.get(neighbor, {}).get("waits_for", [])))
 
 def calculate_process_priority(processes, allocation, max_need, deadlocked):
     """
@@ -167,9 +161,10 @@ def calculate_process_priority(processes, allocation, max_need, deadlocked):
     - Proses dengan kebutuhan yang sudah hampir terpenuhi = prioritas lebih rendah
     """
     priorities = {}
+    index = {proc: i for i, proc in enumerate(processes)}
     
     for proc in deadlocked:
-        idx = processes.index(proc)
+        idx = index[proc]
         
         # Hitung resource yang ditahan
         held_resources = sum(allocation[idx])
@@ -228,65 +223,126 @@ def analyze_deadlock_resource_relations(processes, resources, allocation, max_ne
     """
     Menganalisis relasi resource dan proses dalam deadlock untuk visualisasi yang lebih baik
     """
-    resource_needs = get_resource_needs(processes, resources, allocation, max_need)
-    resource_holdings = get_resource_holdings(processes, resources, allocation)
+    index = {proc: i for i, proc in enumerate(processes)}
+    deadlocked_idx = [index[proc] for proc in deadlocked]
+    m = len(resources)
+    
+    # Indeks resource -> proses deadlock yang memegangnya
+    holders = resource_holders(allocation, m, deadlocked_idx)
     
     relations = {}
-    for proc in deadlocked:
-        relations[proc] = {
-            "needs": resource_needs.get(proc, {}),
-            "holds": resource_holdings.get(proc, {}),
+    for i in deadlocked_idx:
+        relations[processes[i]] = {
+            "needs": {},
+            "holds": {},
             "waits_for_resources": [],
             "blocks": []
         }
     
     # Identifikasi proses yang menunggu resource dan proses yang memblokir
-    for proc1 in deadlocked:
-        needs = resource_needs.get(proc1, {})
-        for resource, amount in needs.items():
-            for proc2 in deadlocked:
-                if proc1 != proc2:
-                    holdings = resource_holdings.get(proc2, {})
-                    if resource in holdings and holdings[resource] > 0:
-                        # proc1 menunggu resource yang dipegang oleh proc2
-                        if resource not in relations[proc1]["waits_for_resources"]:
-                            relations[proc1]["waits_for_resources"].append(resource)
-                        
-                        if proc2 not in relations[proc1]["blocks"]:
-                            relations[proc1]["blocks"].append(proc2)
+    for i in deadlocked_idx:
+        relation = relations[processes[i]]
+        blocks = set()
+        for j in range(m):
+            if allocation[i][j] > 0:
+                relation["holds"][resources[j]] = allocation[i][j]
+            need = max_need[i][j] - allocation[i][j]
+            if need <= 0:
+                continue
+            relation["needs"][resources[j]] = need
+            waiting = False
+            for q in holders[j]:
+                if q != i:
+                    # proses i menunggu resource yang dipegang oleh proses q
+                    waiting = True
+                    if q not in blocks:
+                        blocks.add(q)
+                        relation["blocks"].append(processes[q])
+            if waiting:
+                relation["waits_for_resources"].append(resources[j])
     
     return relations
 
-def apply_detection_recovery_strategy(data):
+def remaining_dependencies(processes, resources, allocation, max_need, remaining, terminated, initial_waits_for):
     """
-    Menerapkan strategi deteksi dan recovery dari deadlock yang lebih robust
+    Turunkan dependencies deadlock yang tersisa setelah terminasi tanpa
+    membangun ulang wait-for graph seluruh sistem. Proses yang tidak
+    diterminasi tetap memiliki kebutuhan dan alokasi yang sama, sehingga
+    edge-nya cukup difilter dari wait-for graph awal.
     """
-    processes = data['processes']
-    resources = data['resources']
-    allocation = data['allocation']
-    max_need = data['max_need']
-    available = data['available']
+    m = len(resources)
+    alive_idx = [i for i in remaining if i not in terminated]
+    alive = {processes[i] for i in alive_idx}
     
-    # Deteksi deadlock dan dependencies
-    deadlocked, dependencies, circular_waits = detect_deadlock_dependencies(
-        processes, resources, allocation, max_need, available
-    )
+    # Proses yang diterminasi kini membutuhkan seluruh max_need-nya; edge-nya
+    # dibangun dari indeks resource -> holder yang masih hidup
+    holders = resource_holders(allocation, m, alive_idx)
+    victim_waits = build_wait_for(max_need, holders, [i for i in remaining if i in terminated])
     
-    result = {
+    dependencies = {}
+    for i in remaining:
+        proc = processes[i]
+        if i in victim_waits:
+            waits_for = [processes[q] for q in sorted(victim_waits[i])]
+        else:
+            waits_for = [p for p in initial_waits_for[proc] if p in alive]
+        dependencies[proc] = {
+            "waits_for": waits_for,
+            "holds": [
+                {"resource": resources[j], "amount": allocation[i][j]}
+                for j in range(m) if allocation[i][j] > 0
+            ]
+        }
+    return dependencies
+
+def _limit(data, key, maximum):
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{key} harus berupa bilangan bulat")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} harus berupa bilangan bulat")
+    if value < 0:
+        raise ValueError(f"{key} tidak boleh negatif")
+    return min(value, maximum)
+
+def cycle_limits(data):
+    """
+    (max_cycles, max_cycle_length) dari request sebagai int, dibatasi
+    MAX_CYCLES dan MAX_CYCLE_LENGTH. None berarti opsi tidak diberikan;
+    nilai bukan bilangan bulat atau negatif melempar ValueError.
+    """
+    return _limit(data, 'max_cycles', MAX_CYCLES), _limit(data, 'max_cycle_length', MAX_CYCLE_LENGTH)
+
+def detection_result(data, result, dependencies, circular_waits):
+    """
+    Isi ringkasan awal strategi Detection & Recovery ke dict result
+    """
+    result.update({
         "strategy": "Detection & Recovery",
         "explanation": "Mendeteksi deadlock dan melakukan recovery dengan terminasi proses",
         "steps": [],
         "recovered": False,
         "deadlock_dependencies": dependencies,
         "circular_waits": circular_waits
-    }
+    })
     
-    if not deadlocked:
-        result["explanation"] = "Tidak ada deadlock yang terdeteksi"
-        result["recovered"] = True
-        return result
+    # Komponen SCC wait-for graph: kelompok proses yang saling menunggu
+    graph = wait_for_graph(dependencies)
+    result["deadlock_components"] = cyclic_components(graph)
     
-    # Visualisasi awal deadlock
+    # Enumerasi siklus elementer hanya jika diminta (dibatasi jumlah dan panjang)
+    max_cycles, max_cycle_length = cycle_limits(data)
+    if max_cycles:
+        result["elementary_cycles"] = list(elementary_cycles(graph, max_cycles, max_cycle_length))
+
+def detection_step(deadlocked, dependencies, circular_waits):
+    """
+    Langkah pertama Detection & Recovery: visualisasi awal deadlock
+    """
     cycle_descriptions = []
     for cycle in circular_waits:
         if len(cycle) > 1:
@@ -296,7 +352,7 @@ def apply_detection_recovery_strategy(data):
     if not cycle_text:
         cycle_text = "Tidak ada siklus wait-for yang terdeteksi secara langsung, namun deadlock ada karena tidak ada proses yang bisa selesai."
     
-    step1 = {
+    return {
         "type": "detection",
         "description": f"Deteksi deadlock pada proses: {', '.join(deadlocked)}",
         "deadlocked": deadlocked,
@@ -304,7 +360,65 @@ def apply_detection_recovery_strategy(data):
         "circular_waits": circular_waits,
         "detail": f"Resource Allocation Graph menunjukkan circular wait: {cycle_text}"
     }
-    result["steps"].append(step1)
+
+def recovery_step(victim, priority_score, freed_resources):
+    return {
+        "type": "recovery",
+        "process": victim,
+        "action": "Terminate",
+        "priority_score": priority_score,
+        "resources_freed": freed_resources,
+        "detail": f"Terminasi proses {victim} dan lepaskan resource-nya"
+    }
+
+def continue_steps(deadlocked, victim, remaining_deadlock):
+    """
+    Langkah untuk proses yang bisa dilanjutkan setelah deadlock teratasi
+    """
+    other_processes = [p for p in deadlocked if p != victim and p not in remaining_deadlock]
+    return [
+        {
+            "type": "continue",
+            "process": proc,
+            "action": "Continue",
+            "detail": f"Proses {proc} dapat melanjutkan eksekusi"
+        }
+        for proc in other_processes
+    ]
+
+def finish_explanation(result, terminated_processes):
+    if not result["recovered"]:
+        result["explanation"] += ". Deadlock masih terjadi meskipun beberapa proses telah diterminasi"
+    else:
+        result["explanation"] += f". Deadlock teratasi setelah terminasi proses: {', '.join(terminated_processes)}"
+
+def iter_detection_recovery(data, result, snapshots=True):
+    """
+    Generator langkah strategi Detection & Recovery. Ringkasan hasil diisi ke
+    dict result; setiap langkah di-yield sebagai (step, allocation, available,
+    changed_rows) dengan allocation/available berupa state terkini (bukan
+    salinan) dan changed_rows baris allocation yang berubah pada langkah itu.
+    Dengan snapshots=False langkah recovery tidak menyimpan salinan matriks.
+    """
+    processes = data['processes']
+    resources = data['resources']
+    allocation = data['allocation']
+    max_need = data['max_need']
+    available = data['available']
+    
+    # Deteksi deadlock dan dependencies
+    deadlocked, dependencies, circular_waits = detect_deadlock_dependencies(
+        processes, resources, allocation, max_need, available
+    )
+    
+    detection_result(data, result, dependencies, circular_waits)
+    
+    if not deadlocked:
+        result["explanation"] = "Tidak ada deadlock yang terdeteksi"
+        result["recovered"] = True
+        return
+    
+    step1 = detection_step(deadlocked, dependencies, circular_waits)
     
     # Analisis relasi resource dalam deadlock
     resource_relations = analyze_deadlock_resource_relations(
@@ -315,12 +429,32 @@ def apply_detection_recovery_strategy(data):
     # Hitung prioritas proses untuk terminasi
     process_priorities = calculate_process_priority(processes, allocation, max_need, deadlocked)
     
-    modified_allocation = [row[:] for row in allocation]
-    modified_available = available.copy()
+    index = {proc: i for i, proc in enumerate(processes)}
+    
+    # Mode "min_cost": cari himpunan korban dengan total skor minimum
+    if data.get('recovery_mode') == 'min_cost':
+        victims, optimal = minimum_cost_victims(
+            allocation, max_need, available, process_priorities, index,
+            data.get('time_budget', 1.0)
+        )
+        result["recovery_mode"] = "min_cost"
+        result["optimal"] = optimal
+        if victims is not None:
+            process_priorities = victims
+    
+    # Recovery inkremental: reduksi dilanjutkan setelah setiap terminasi
+    recovery = RecoveryEngine(allocation, max_need, available)
+    modified_allocation = recovery.allocation
+    modified_available = recovery.available
+    deadlocked_idx = [index[proc] for proc in deadlocked]
+    initial_waits_for = {proc: dependencies[proc]["waits_for"] for proc in deadlocked}
+    terminated_processes = []
+    
+    yield step1, modified_allocation, modified_available, ()
     
     # Coba terminasi satu per satu sampai deadlock teratasi
     for victim, priority_score in process_priorities:
-        process_idx = processes.index(victim)
+        process_idx = index[victim]
         
         # Kumpulkan detail resource yang akan dibebaskan
         freed_resources = []
@@ -332,121 +466,120 @@ def apply_detection_recovery_strategy(data):
                 })
                 
         # Catat langkah recovery
-        step = {
-            "type": "recovery",
-            "process": victim,
-            "action": "Terminate",
-            "priority_score": priority_score,
-            "resources_freed": freed_resources,
-            "detail": f"Terminasi proses {victim} dan lepaskan resource-nya"
-        }
+        step = recovery_step(victim, priority_score, freed_resources)
         
         # Lepaskan resource yang dipegang oleh proses yang diterminasi
-        for j in range(len(resources)):
-            modified_available[j] += modified_allocation[process_idx][j]
-            modified_allocation[process_idx][j] = 0
-        
-        step["modified_allocation"] = [row[:] for row in modified_allocation]
-        step["modified_available"] = modified_available.copy()
+        with metrics.phase("recovery"):
+            recovery.terminate(process_idx)
+        terminated_processes.append(victim)
+        metrics.count("victims_terminated")
         
-        result["steps"].append(step)
+        if snapshots:
+            step["modified_allocation"] = [row[:] for row in modified_allocation]
+            step["modified_available"] = modified_available.copy()
         
         # Cek apakah deadlock masih ada setelah terminasi
-        remaining_deadlock, remaining_deps, remaining_cycles = detect_deadlock_dependencies(
-            processes, resources, modified_allocation, max_need, modified_available
-        )
+        remaining_idx = recovery.deadlocked(deadlocked_idx)
+        remaining_deadlock = [processes[i] for i in remaining_idx]
         
         if remaining_deadlock:
             # Deadlock masih ada, catat deadlock yang tersisa
+            remaining_deps = remaining_dependencies(
+                processes, resources, modified_allocation, max_need,
+                remaining_idx, recovery.terminated, initial_waits_for
+            )
             step["remaining_deadlock"] = remaining_deadlock
             step["remaining_dependencies"] = remaining_deps
-            step["remaining_cycles"] = remaining_cycles
+            with metrics.phase("find_cycles"):
+                step["remaining_cycles"] = find_cycles(remaining_deps)
+            yield step, modified_allocation, modified_available, (process_idx,)
         else:
             # Deadlock teratasi
             result["recovered"] = True
             step["detail"] += f". Deadlock teratasi!"
+            yield step, modified_allocation, modified_available, (process_idx,)
             
             # Tambahkan langkah untuk menunjukkan proses yang bisa dilanjutkan
-            other_processes = [p for p in deadlocked if p != victim and p not in remaining_deadlock]
-            for proc in other_processes:
-                continue_step = {
-                    "type": "continue",
-                    "process": proc,
-                    "action": "Continue",
-                    "detail": f"Proses {proc} dapat melanjutkan eksekusi"
-                }
-                result["steps"].append(continue_step)
+            for continue_step in continue_steps(deadlocked, victim, remaining_deadlock):
+                yield continue_step, modified_allocation, modified_available, ()
             
             break
     
-    if not result["recovered"]:
-        result["explanation"] += ". Deadlock masih terjadi meskipun beberapa proses telah diterminasi"
-    else:
-        terminated_processes = [step["process"] for step in result["steps"] if step["type"] == "recovery"]
-        result["explanation"] += f". Deadlock teratasi setelah terminasi proses: {', '.join(terminated_processes)}"
+    metrics.count("scan_passes", recovery.engine.iterations)
+    
+    finish_explanation(result, terminated_processes)
     
     result["modified_allocation"] = modified_allocation
     result["modified_available"] = modified_available
-    
+
+def apply_detection_recovery_strategy(data):
+    """
+    Menerapkan strategi deteksi dan recovery dari deadlock yang lebih robust
+    """
+    if len(data['processes']) >= SHARD_MIN_PROCESSES and data.get('recovery_mode') != 'min_cost':
+        # Skenario sangat besar: komponen independen diselesaikan paralel
+        import shard
+        result = shard.apply_detection_recovery_strategy(data)
+        if result is not None:
+            return result
+    
+    result = {}
+    for step, _, _, _ in iter_detection_recovery(data, result):
+        result["steps"].append(step)
     return result
 
-def bankers_algorithm(processes, resources, allocation, max_need, available):
+def iter_bankers(processes, allocation, max_need, available, result, snapshots=True):
     """
-    Implementasi Banker's Algorithm untuk avoidance yang lebih fleksibel
+    Generator langkah Banker's Algorithm: yield (step, work) per proses yang
+    dieksekusi, lalu isi safe, safe_sequence dan deadlocked ke dict result.
+    Dengan snapshots=False langkah tidak menyimpan salinan work.
     """
     n = len(processes)
-    m = len(resources)
-    work = available[:]
-    finish = [False] * n
     safe_sequence = []
-    steps = []
     
-    # Step by step execution
+    # Step by step execution: selalu eksekusi proses runnable dengan indeks terkecil
+    engine = Reduction(allocation, max_need, available)
     step_count = 1
     
     while True:
-        found = False
-        for i in range(n):
-            if not finish[i]:
-                # Cek apakah proses dapat dieksekusi
-                can_execute = True
-                needs = []
-                for j in range(m):
-                    need = max_need[i][j] - allocation[i][j]
-                    needs.append(need)
-                    if need > work[j]:
-                        can_execute = False
-                        break
-                
-                if can_execute:
-                    # Proses bisa dieksekusi
-                    step = {
-                        "step": step_count,
-                        "process": processes[i],
-                        "work_before": work.copy(),
-                        "need": needs
-                    }
-                    
-                    # Simulasikan eksekusi proses
-                    for j in range(m):
-                        work[j] += allocation[i][j]
-                    
-                    step["work_after"] = work.copy()
-                    
-                    finish[i] = True
-                    safe_sequence.append(processes[i])
-                    found = True
-                    
-                    steps.append(step)
-                    step_count += 1
-                    break
-        
-        if not found:
+        i = engine.next_runnable()
+        if i is None:
             break
+        
+        # Proses bisa dieksekusi
+        step = {"step": step_count, "process": processes[i]}
+        if snapshots:
+            step["work_before"] = engine.work.copy()
+        step["need"] = engine.need[i][:]
+        
+        # Simulasikan eksekusi proses
+        engine.complete(i)
+        
+        if snapshots:
+            step["work_after"] = engine.work.copy()
+        
+        safe_sequence.append(processes[i])
+        yield step, engine.work
+        step_count += 1
+    
+    metrics.count("scan_passes", engine.iterations)
+    result["safe"] = len(safe_sequence) == n
+    result["safe_sequence"] = safe_sequence
+    if not result["safe"]:
+        result["deadlocked"] = [processes[i] for i in range(n) if not engine.finish[i]]
+
+def bankers_algorithm(processes, resources, allocation, max_need, available):
+    """
+    Implementasi Banker's Algorithm untuk avoidance yang lebih fleksibel
+    """
+    outcome = {}
+    with metrics.phase("reduction"):
+        steps = [step for step, _ in iter_bankers(processes, allocation, max_need, available, outcome)]
+    safe_sequence = outcome["safe_sequence"]
     
     # Cek apakah semua proses berhasil dieksekusi
     result = {
-        "safe": len(safe_sequence) == n,
+        "safe": outcome["safe"],
         "steps": steps,
         "safe_sequence": safe_sequence
     }
@@ -454,7 +587,7 @@ def bankers_algorithm(processes, resources, allocation, max_need, available):
     if result["safe"]:
         result["explanation"] = f"State aman ditemukan dengan sequence: {' → '.join(safe_sequence)}"
     else:
-        deadlocked = [processes[i] for i in range(n) if not finish[i]]
+        deadlocked = outcome["deadlocked"]
         result["deadlocked"] = deadlocked
         result["explanation"] = f"State tidak aman. Proses yang mungkin deadlock: {', '.join(deadlocked)}"
     
@@ -471,7 +604,8 @@ def handle_deadlock(data):
     available = data['available']
 
     # Deteksi deadlock
-    deadlock_processes = detect_deadlock(processes, resources, allocation, max_need, available)
+    with metrics.solve("simulate", len(processes)):
+        deadlock_processes = detect_deadlock(processes, resources, allocation, max_need, available)
 
     if deadlock_processes:
         return {
@@ -491,37 +625,10 @@ def handle_deadlock(data):
 
 def apply_prevention_strategy(data):
     """
-    Menerapkan strategi pencegahan deadlock dengan mengeliminasi Hold & Wait
+    Menerapkan strategi pencegahan deadlock: urutan resource global dan
+    eliminasi Hold & Wait dengan alokasi semua resource sekaligus
     """
-    processes = data['processes']
-    resources = data['resources']
-    allocation = data['allocation']
-    max_need = data['max_need']
-    available = data['available']
-    
-    # Identifikasi proses yang potensial deadlock
-    potential_deadlocks = detect_deadlock(processes, resources, allocation, max_need, available)
-    
-    # Strategi prevention: Alokasikan semua resource yang dibutuhkan sekaligus
-    result = {
-        "strategy": "Prevention",
-        "explanation": "Menghilangkan kondisi Hold & Wait dengan mengalokasikan semua resource di awal",
-        "steps": [],
-        "modified_allocation": allocation.copy(),
-        "modified_available": available.copy()
-    }
-    
-    # Simulasi langkah preventif
-    for i, process in enumerate(processes):
-        if process in potential_deadlocks:
-            step = {
-                "process": process,
-                "action": "Prevent Hold & Wait",
-                "detail": f"Proses {process} menunggu semua resource tersedia sekaligus"
-            }
-            result["steps"].append(step)
-    
-    return result
+    return apply_prevention(data)
 
 def apply_avoidance_strategy(data):
     """
@@ -534,11 +641,16 @@ def apply_avoidance_strategy(data):
     available = data['available']
     
     banker_result = bankers_algorithm(processes, resources, allocation, max_need, available)
-    
+    return avoidance_result(banker_result)
+
+def avoidance_result(banker_result):
+    """
+    Susun hasil strategi Avoidance dari hasil bankers_algorithm/iter_bankers
+    """
     result = {
         "strategy": "Avoidance (Banker's Algorithm)",
         "explanation": "Menggunakan Banker's Algorithm untuk menentukan state aman",
-        "steps": banker_result["steps"],
+        "steps": banker_result.get("steps", []),
         "safe": banker_result["safe"],
         "safe_sequence": banker_result.get("safe_sequence", [])
     }
@@ -557,102 +669,23 @@ def solve_deadlock(data, strategy):
     Fungsi utama untuk menyelesaikan deadlock berdasarkan strategi yang dipilih
     """
     if strategy == "Prevention":
-        return apply_prevention_strategy(data)
+        with metrics.solve(strategy, len(data['processes'])):
+            return apply_prevention_strategy(data)
     elif strategy == "Avoidance":
-        return apply_avoidance_strategy(data)
+        with metrics.solve(strategy, len(data['processes'])):
+            return apply_avoidance_strategy(data)
     elif strategy == "Detection":
-        return apply_detection_recovery_strategy(data)
+        with metrics.solve(strategy, len(data['processes'])):
+            return apply_detection_recovery_strategy(data)
     else:
         return {
             "error": "Strategi tidak valid",
             "valid_strategies": ["Prevention", "Avoidance", "Detection"]
         }
 
-def generate_random_scenario(num_processes, num_resources, num_cores):
+def generate_random_scenario(num_processes, num_resources, num_cores, seed=None):
     """
-    Generate a random multi-core scenario dengan parameter yang diberikan
+    Generate a random multi-core scenario dengan parameter yang diberikan.
+    Dengan seed yang sama skenario yang dihasilkan selalu sama.
     """
-    # Buat list nama proses (P1, P2, ..., Pn)
-    processes = [f'P{i+1}' for i in range(num_processes)]
-    
-    # Buat list nama resource (R1, R2, ..., Rm)
-    resources = [f'R{i+1}' for i in range(num_resources)]
-    
-    # Buat list nama core (Core1, Core2, ..., CoreC)
-    cores = [f'Core{i+1}' for i in range(num_cores)]
-    
-    # Tentukan jumlah instance untuk setiap resource (1-5)
-    total_resources = {resource: random.randint(2, 5) for resource in resources}
-    
-    # Alokasikan proses ke core secara random
-    process_core_mapping = {process: random.choice(cores) for process in processes}
-    
-    # Inisialisasi alokasi dan kebutuhan maksimum untuk setiap proses
-    allocation = []
-    max_need = []
-    
-    for _ in range(num_processes):
-        # Untuk setiap proses, alokasikan beberapa resource secara random
-        alloc = []
-        max_req = []
-        
-        for r in range(num_resources):
-            # Resource yang dialokasikan tidak boleh melebihi total
-            max_possible = min(total_resources[resources[r]], 3)  # Max 3 per proses
-            allocated = random.randint(0, max_possible)
-            
-            # Kebutuhan maksimum harus >= alokasi yang sudah ada
-            max_required = random.randint(allocated, allocated + 2)
-            
-            alloc.append(allocated)
-            max_req.append(max_required)
-            
-            # Kurangi resource yang tersedia
-            total_resources[resources[r]] -= allocated
-        
-        allocation.append(alloc)
-        max_need.append(max_req)
-    
-    # Hitung resource yang tersedia
-    available = []
-    for r in range(num_resources):
-        available.append(total_resources[resources[r]])
-    
-    # Buat skenario yang mungkin menghasilkan deadlock
-    # Dengan membuat beberapa proses memiliki ketergantungan circular
-    if random.random() < 0.7:  # 70% kemungkinan ada deadlock
-        potential_deadlock_processes = random.sample(range(num_processes), min(3, num_processes))
-        
-        if len(potential_deadlock_processes) >= 2:
-            for i in range(len(potential_deadlock_processes)):
-                p1 = potential_deadlock_processes[i]
-                p2 = potential_deadlock_processes[(i+1) % len(potential_deadlock_processes)]
-                
-                # Buat ketergantungan circular antara p1 dan p2
-                for r in range(num_resources):
-                    if allocation[p1][r] > 0 and max_need[p2][r] > allocation[p2][r]:
-                        # p1 memegang resource yang dibutuhkan p2
-                        # dan p2 memegang resource yang dibutuhkan p1
-                        if r+1 < num_resources:
-                            if allocation[p2][r+1] > 0 and max_need[p1][r+1] > allocation[p1][r+1]:
-                                # Tingkatkan kebutuhan untuk membuat deadlock lebih mungkin
-                                max_need[p1][r] = allocation[p1][r] + 1
-                                max_need[p2][r+1] = allocation[p2][r+1] + 1
-    
-    # Hitung kebutuhan yang tersisa
-    need = []
-    for i in range(num_processes):
-        need.append([max_need[i][j] - allocation[i][j] for j in range(num_resources)])
-    
-    return {
-        "processes": processes,
-        "resources": resources,
-        "cores": cores,
-        "process_core_mapping": process_core_mapping,
-        "allocation": allocation,
-        "max_need": max_need,
-        "need": need,
-        "available": available,
-        "total_resources": {res: sum(allocation[p][i] for p in range(num_processes)) + available[i] 
-                            for i, res in enumerate(resources)}
-    }
+    return generate_scenario(num_processes, num_resources, num_cores, seed)
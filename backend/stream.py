@@ -0,0 +1,136 @@
+import json
+import time
+
+from solver import avoidance_result, iter_bankers, iter_detection_recovery, solve_deadlock
+
+DEFAULT_KEYFRAME_INTERVAL = 32
+
+
+class DeltaEncoder:
+    """
+    Encode state per langkah (vektor dan matriks) sebagai delta terhadap
+    langkah sebelumnya, dengan keyframe penuh setiap keyframe_interval
+    langkah. Hanya satu salinan state terakhir yang disimpan, jadi memori
+    tidak bertambah dengan jumlah langkah.
+
+    Delta vektor berupa [[j, nilai], ...], delta matriks [[i, j, nilai], ...].
+    """
+
+    def __init__(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.count = 0
+        self.last = {}
+
+    def encode(self, state, changed_rows=None):
+        """
+        state: dict nama -> list (vektor) atau list of list (matriks).
+        changed_rows: dict nama matriks -> baris yang mungkin berubah; tanpa
+        petunjuk seluruh matriks dibandingkan.
+        """
+        keyframe = self.count % self.keyframe_interval == 0
+        self.count += 1
+        if keyframe:
+            frame = {}
+            for name, value in state.items():
+                if value and isinstance(value[0], list):
+                    frame[name] = [list(row) for row in value]
+                    self.last[name] = [list(row) for row in value]
+                else:
+                    frame[name] = list(value)
+                    self.last[name] = list(value)
+            return {"keyframe": frame}
+
+        changed_rows = changed_rows or {}
+        delta = {}
+        for name, value in state.items():
+            previous = self.last[name]
+            cells = []
+            if value and isinstance(value[0], list):
+                rows = changed_rows.get(name)
+                for i in (range(len(value)) if rows is None else rows):
+                    row, old = value[i], previous[i]
+                    for j, cell in enumerate(row):
+                        if cell != old[j]:
+                            cells.append([i, j, cell])
+                            old[j] = cell
+            else:
+                for j, cell in enumerate(value):
+                    if cell != previous[j]:
+                        cells.append([j, cell])
+                        previous[j] = cell
+            if cells:
+                delta[name] = cells
+        return {"delta": delta}
+
+
+def iter_solution_events(data, strategy, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """
+    Stream event solusi: {"event": "start"}, lalu satu {"event": "step"} per
+    langkah segera setelah dihasilkan, lalu {"event": "end"} berisi ringkasan
+    tanpa steps. Avoidance membawa state work, Detection membawa allocation
+    dan available; strategi lain dikirim tanpa state.
+    """
+    yield {
+        "event": "start",
+        "strategy": strategy,
+        "processes": data['processes'],
+        "resources": data['resources'],
+        "keyframe_interval": keyframe_interval
+    }
+    encoder = DeltaEncoder(keyframe_interval)
+    seq = 0
+
+    if strategy == "Avoidance":
+        outcome = {}
+        steps = iter_bankers(data['processes'], data['allocation'], data['max_need'],
+                             data['available'], outcome, snapshots=False)
+        for step, work in steps:
+            event = {"event": "step", "seq": seq, "step": step}
+            event.update(encoder.encode({"work": work}))
+            yield event
+            seq += 1
+        result = avoidance_result(outcome)
+    elif strategy == "Detection":
+        result = {}
+        steps = iter_detection_recovery(data, result, snapshots=False)
+        for step, allocation, available, changed in steps:
+            event = {"event": "step", "seq": seq, "step": step}
+            event.update(encoder.encode({"allocation": allocation, "available": available},
+                                        {"allocation": changed}))
+            yield event
+            seq += 1
+    else:
+        result = solve_deadlock(data, strategy)
+        for step in result.get("steps", []):
+            yield {"event": "step", "seq": seq, "step": step}
+            seq += 1
+
+    summary = {key: value for key, value in result.items() if key != "steps"}
+    yield {"event": "end", "steps": seq, "result": summary}
+
+
+def with_deadline(events, deadline, on_timeout=None, clock=time.monotonic):
+    """
+    Teruskan event sampai deadline detik terlewati, lalu akhiri stream dengan
+    {"event": "error", "timeout": True}. Deadline dicek di antara langkah,
+    jadi satu langkah tidak bisa dipotong di tengah.
+    """
+    end = clock() + deadline
+    for event in events:
+        if clock() > end:
+            if on_timeout is not None:
+                on_timeout()
+            yield {"event": "error", "timeout": True, "deadline": deadline,
+                   "error": f"Komputasi melewati batas {deadline} detik"}
+            return
+        yield event
+
+
+def format_ndjson(events):
+    for event in events:
+        yield json.dumps(event) + "\n"
+
+
+def format_sse(events):
+    for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
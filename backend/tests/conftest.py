@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul backend diimpor flat (from cache import ...), sama seperti di main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
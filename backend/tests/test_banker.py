@@ -0,0 +1,119 @@
+import random
+from itertools import permutations
+
+from banker import BankerState, _PrefixMin
+
+
+def is_safe_sequence(allocation, need, available, order):
+    work = list(available)
+    for i in order:
+        if any(n > w for n, w in zip(need[i], work)):
+            return False
+        work = [w + a for w, a in zip(work, allocation[i])]
+    return True
+
+
+def brute_force_safe(allocation, need, available):
+    # Coba semua urutan; skenario uji cukup kecil
+    return any(is_safe_sequence(allocation, need, available, order)
+               for order in permutations(range(len(allocation))))
+
+
+def brute_force_request(allocation, need, available, i, amounts):
+    if any(r > a for r, a in zip(amounts, available)):
+        return "wait"
+    allocation = [row[:] for row in allocation]
+    need = [row[:] for row in need]
+    allocation[i] = [a + r for a, r in zip(allocation[i], amounts)]
+    need[i] = [n - r for n, r in zip(need[i], amounts)]
+    available = [a - r for a, r in zip(available, amounts)]
+    return "granted" if brute_force_safe(allocation, need, available) else "denied"
+
+
+def random_state(rng, n, m):
+    allocation = [[rng.randint(0, 2) for _ in range(m)] for _ in range(n)]
+    max_need = [[a + rng.randint(0, 3) for a in row] for row in allocation]
+    available = [rng.randint(0, 3) for _ in range(m)]
+    return BankerState([f"P{i}" for i in range(n)], [f"R{j}" for j in range(m)],
+                       allocation, max_need, available)
+
+
+def check_certificate(state):
+    safe = brute_force_safe(state.allocation, state.need, state.available)
+    assert (state.sequence is not None) == safe
+    if state.sequence is None:
+        return
+    assert is_safe_sequence(state.allocation, state.need, state.available, state.sequence)
+    # Slack prefix di segment tree sama dengan hitungan langsung
+    for j, column in enumerate(state.slack):
+        w = state.available[j]
+        low = float('inf')
+        for p, q in enumerate(state.sequence):
+            assert column.min(p) == low
+            low = min(low, w - state.need[q][j])
+            w += state.allocation[q][j]
+        assert column.min(len(state.sequence)) == low
+
+
+def test_requests_match_brute_force_and_keep_a_valid_certificate():
+    rng = random.Random(13)
+    for _ in range(300):
+        n, m = rng.randint(1, 5), rng.randint(1, 3)
+        state = random_state(rng, n, m)
+        check_certificate(state)
+        for _ in range(20):
+            i = rng.randrange(n)
+            op = rng.random()
+            if op < 0.4:
+                amounts = [rng.randint(0, x) for x in state.need[i]]
+                expected = brute_force_request(state.allocation, state.need, state.available, i, amounts)
+                verdict, _ = state.request(i, amounts)
+                assert verdict == expected
+            elif op < 0.7:
+                j = rng.randrange(m)
+                amount = rng.randint(0, state.need[i][j])
+                expected = brute_force_request(state.allocation, state.need, state.available, i,
+                                               [amount if k == j else 0 for k in range(m)])
+                verdict = state.request_one(i, j, amount)
+                # request_one konservatif: tidak pernah mengabulkan yang tidak aman
+                assert verdict == expected or (verdict, expected) == ("denied", "granted")
+            elif op < 0.9:
+                state.release(i, [rng.randint(0, a) for a in state.allocation[i]])
+            else:
+                state.retire(i)
+            check_certificate(state)
+
+
+def test_repair_moves_requester_forward_without_full_scan():
+    state = BankerState(["A", "B"], ["R"], [[0], [0]], [[1], [1]], [1])
+    assert state.sequence == [0, 1]
+    assert not state.fits_certificate(1, [1])
+    assert state.request(1, [1]) == ("granted", True)
+    assert state.sequence == [1, 0]
+    assert state.full_scans == 1
+    check_certificate(state)
+
+
+def test_repair_gives_up_when_prefix_breaks():
+    state = BankerState(["A", "B"], ["R"], [[0], [0]], [[1], [2]], [1])
+    assert state._repair(1, [1]) is None
+    assert state.request(1, [1]) == ("denied", False)
+    assert state.allocation == [[0], [0]]
+
+
+def test_prefix_min_matches_list():
+    rng = random.Random(3)
+    for _ in range(200):
+        values = [rng.randint(-5, 5) for _ in range(rng.randint(1, 20))]
+        tree = _PrefixMin(values[:])
+        for _ in range(30):
+            p = rng.randint(0, len(values))
+            delta = rng.randint(-3, 3)
+            if rng.random() < 0.5:
+                tree.shift(p, delta)
+                values[:p] = [v + delta for v in values[:p]]
+            elif p < len(values):
+                tree.bump(p, delta)
+                values[p] += delta
+            for q in range(len(values) + 1):
+                assert tree.min(q) == min(values[:q], default=float('inf'))
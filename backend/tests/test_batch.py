@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+import batch
+
+
+class StubExecutor:
+    """
+    Executor palsu: item {"delay": d} selesai setelah d detik, item
+    {"stuck": True} tidak pernah selesai (worker macet melewati alarm)
+    """
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, item, timeout):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.futures.append(future)
+        if not item.get("stuck"):
+            timer = threading.Timer(item["delay"], future.set_result, ({"result": item["delay"]},))
+            timer.daemon = True
+            timer.start()
+        return future
+
+
+def test_item_timeout_rejects_non_positive_and_caps_large_values():
+    for value in ("0", "-1", "nan", "abc"):
+        with pytest.raises(ValueError):
+            batch.item_timeout(value)
+    assert batch.item_timeout("1e9") == batch.DEFAULT_TIMEOUT
+    assert batch.item_timeout(None) == batch.DEFAULT_TIMEOUT
+    assert batch.item_timeout("0.5") == 0.5
+
+
+def test_completion_order_times_out_the_stuck_item_not_the_oldest():
+    items = [{"delay": 1.0}, {"stuck": True}, {"delay": 0.01}]
+    results = list(batch.run_batch(items, StubExecutor(), "completion", timeout=0.2, window=8))
+    by_index = {result["index"]: result for result in results}
+    assert by_index[0] == {"result": 1.0, "index": 0}
+    assert by_index[1]["timeout"] is True
+    assert by_index[2]["result"] == 0.01
+    assert [result["index"] for result in results] == [2, 0, 1]
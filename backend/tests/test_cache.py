@@ -0,0 +1,42 @@
+import hashlib
+import time
+
+from cache import DiskStore, scenario_key
+
+
+def key(name):
+    return hashlib.sha256(name.encode('utf-8')).digest()
+
+
+def body(name):
+    return f"body-{name}-".encode('utf-8') * 20
+
+
+def test_disk_store_shared_file_survives_compaction_by_other_store(tmp_path):
+    expires = time.time() + 3600
+    reader = DiskStore(str(tmp_path), max_bytes=4096)
+    writer = DiskStore(str(tmp_path), max_bytes=4096)
+    for k in range(8):
+        reader.put(key(f"x{k}"), body(f"x{k}"), expires)
+    assert reader.get(key("x0")) == body("x0")
+
+    # writer memadatkan file berulang kali lalu menulis sampai file lebih
+    # besar dari posisi scan reader
+    for k in range(8, 200):
+        writer.put(key(f"x{k}"), body(f"x{k}"), expires)
+
+    for k in range(200):
+        found = reader.get(key(f"x{k}"))
+        assert found is None or found == body(f"x{k}"), k
+    assert reader.get(key("x199")) == body("x199")
+
+
+def test_scenario_key_includes_prevention_options():
+    base = {"processes": ["P1"], "resources": ["R1"], "allocation": [[0]],
+            "max_need": [[1]], "available": [1]}
+    keys = {
+        scenario_key('solve', dict(base, **options), 'Prevention')
+        for options in ({}, {"seed": 1}, {"seed": 2}, {"burst_times": {"P1": 3}},
+                        {"cores": ["Core1", "Core2"]}, {"process_core_mapping": {"P1": "Core2"}})
+    }
+    assert len(keys) == 6
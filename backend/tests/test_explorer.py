@@ -0,0 +1,40 @@
+import pytest
+
+from explorer import MAX_SEQUENCES, SafeSequenceExplorer, explore_safe_sequences
+
+
+def independent(n):
+    # n proses tanpa kebutuhan: setiap permutasi adalah safe sequence
+    return {"processes": [f"P{i}" for i in range(n)], "resources": ["R1"],
+            "allocation": [[0]] * n, "max_need": [[0]] * n, "available": [1]}
+
+
+def test_limit_is_clamped_to_server_maximum():
+    for limit in (None, 10 ** 9):
+        data = dict(independent(8), limit=limit)
+        result = explore_safe_sequences(data)
+        assert len(result["sequences"]) == (10 if limit is None else MAX_SEQUENCES)
+    assert explore_safe_sequences(dict(independent(3), limit=0))["sequences"] == []
+
+
+def test_enumerate_stops_at_state_budget():
+    data = independent(12)
+    explorer = SafeSequenceExplorer(data['processes'], data['resources'], data['allocation'],
+                                    data['max_need'], data['available'], max_states=50)
+    sequences = list(explorer.enumerate())
+    assert explorer.limited
+    assert 0 < len(sequences) < 50
+
+
+def test_client_cannot_disable_budgets():
+    result = explore_safe_sequences(dict(independent(4), time_budget=0, max_states=0, limit=3))
+    assert len(result["sequences"]) == 3
+    assert result["sequences_truncated"] is False
+
+
+def test_priorities_must_be_a_dict_of_numbers():
+    for priorities in ([1, 2, 3], "P0", {"P0": "high"}, {"P1": True}):
+        with pytest.raises(ValueError):
+            explore_safe_sequences(dict(independent(3), cost="priority", priorities=priorities))
+    result = explore_safe_sequences(dict(independent(3), cost="priority", priorities={"P2": 5}))
+    assert result["best"]["sequence"][0] == "P2"
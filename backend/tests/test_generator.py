@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+import generator
+
+
+def scenarios():
+    return [json.dumps(generator.generate_scenario(n, m, c, seed, index), sort_keys=True)
+            for n, m, c in [(5, 3, 2), (1, 1, 1), (40, 7, 3)]
+            for seed in (0, 7)
+            for index in (None, 3)]
+
+
+def test_same_seed_same_scenario():
+    assert scenarios() == scenarios()
+    assert generator.generate_scenario(5, 3, 2, 1) != generator.generate_scenario(5, 3, 2, 2)
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = scenarios()
+    monkeypatch.setattr(generator, 'np', None)
+    assert scenarios() == with_numpy
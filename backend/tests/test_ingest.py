@@ -0,0 +1,174 @@
+import gzip
+import hashlib
+import io
+import json
+import random
+import tracemalloc
+
+import pytest
+
+import ingest
+from ingest import IngestError, PayloadTooLarge, read_scenario
+
+
+def body(n=4, m=3, seed=0, **options):
+    rng = random.Random(seed)
+    data = {
+        "processes": [f"P{i}" for i in range(n)],
+        "resources": [f"R{j}" for j in range(m)],
+        "allocation": [[rng.randint(0, 9) for _ in range(m)] for _ in range(n)],
+        "max_need": [[rng.randint(10, 99) for _ in range(m)] for _ in range(n)],
+        "available": [rng.randint(0, 9) for _ in range(m)],
+    }
+    data.update(options)
+    return data
+
+
+def parse(data, encoding=None, **kwargs):
+    raw = data if isinstance(data, bytes) else json.dumps(data).encode('utf-8')
+    if encoding == 'gzip':
+        raw = gzip.compress(raw)
+    return read_scenario(io.BytesIO(raw), encoding, len(raw), **kwargs)
+
+
+def as_dict(scenario):
+    result = scenario.to_dict()
+    del result["need"]
+    result.update(scenario.options)
+    return result
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1 << 16])
+@pytest.mark.parametrize("encoding", [None, 'gzip'])
+def test_valid_body_matches_json_loads(monkeypatch, chunk, encoding):
+    # Chunk kecil memaksa nilai, key dan baris terpotong di batas buffer
+    monkeypatch.setattr(ingest, 'CHUNK_SIZE', chunk)
+    data = body(30, 5, seed=chunk, strategy="Detection", seed_value=1.5e3,
+                label="Proses é中 \\\"x\"", nested={"a": [1, None, True]})
+    raw = json.dumps(data, indent=1, ensure_ascii=False).encode('utf-8')
+    scenario, key = parse(raw, encoding, key_prefix=b'solve\0')
+    assert as_dict(scenario) == json.loads(raw)
+    assert key == hashlib.sha256(b'solve\0' + raw).digest()
+
+
+def test_empty_matrices_and_columns_from_resources():
+    scenario, _ = parse({"processes": [], "resources": ["R1"], "allocation": [],
+                         "max_need": [], "available": [2]})
+    assert as_dict(scenario) == {"processes": [], "resources": ["R1"], "allocation": [],
+                                 "max_need": [], "available": [2]}
+
+
+@pytest.mark.parametrize("encoding", [None, 'gzip'])
+def test_truncated_body_is_rejected(monkeypatch, encoding):
+    monkeypatch.setattr(ingest, 'CHUNK_SIZE', 5)
+    raw = json.dumps(body()).encode('utf-8')
+    if encoding:
+        raw = gzip.compress(raw)
+    for cut in range(0, len(raw), 3):
+        partial = raw[:cut]
+        with pytest.raises(IngestError):
+            read_scenario(io.BytesIO(partial), encoding, len(partial))
+
+
+def test_gzip_bomb_stops_at_max_bytes():
+    bomb = gzip.compress(b'{"label": "' + b'a' * (64 << 20) + b'"}')
+    tracemalloc.start()
+    try:
+        with pytest.raises(PayloadTooLarge):
+            read_scenario(io.BytesIO(bomb), 'gzip', len(bomb), max_bytes=1 << 20)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Inflate berhenti di batas, body 64 MiB tidak pernah dibentuk utuh
+    assert peak < 16 << 20
+
+
+def test_number_split_at_chunk_boundary(monkeypatch):
+    raw = b'{"processes": [], "resources": [], "allocation": [], "max_need": [], ' \
+          b'"available": [], "a": 1500.25, "b": -1e-3, "c": 7}'
+    for chunk in range(1, 12):
+        monkeypatch.setattr(ingest, 'CHUNK_SIZE', chunk)
+        scenario, _ = parse(raw)
+        assert scenario.options == {"a": 1500.25, "b": -1e-3, "c": 7}
+    with pytest.raises(IngestError):
+        parse(raw.replace(b'1500.25', b'1500.'))
+
+
+def test_plain_body_over_limit():
+    raw = json.dumps(body()).encode('utf-8')
+    with pytest.raises(PayloadTooLarge):
+        read_scenario(io.BytesIO(raw), None, len(raw), max_bytes=len(raw) - 1)
+    with pytest.raises(PayloadTooLarge):
+        read_scenario(io.BytesIO(raw), None, None, max_bytes=len(raw) - 1)
+    with pytest.raises(PayloadTooLarge):
+        parse(body(8, 8), max_cells=63)
+
+
+@pytest.mark.parametrize("allocation", [
+    [[1, 2, 3], [1, 2], [0, 0, 0], [0, 0, 0]],
+    [[1, 2, 3], [1, 2, 3, 4], [0, 0, 0], [0, 0, 0]],
+    [[1, 2, 3], [1, 2, 3], [0, 0, 0]],
+    [[1, 2, 3], 4, [0, 0, 0], [0, 0, 0]],
+    [[1, 2.5, 3], [1, 2, 3], [0, 0, 0], [0, 0, 0]],
+    [[1, "2", 3], [1, 2, 3], [0, 0, 0], [0, 0, 0]],
+    [[1, None, 3], [1, 2, 3], [0, 0, 0], [0, 0, 0]],
+    [[1, -2, 3], [1, 2, 3], [0, 0, 0], [0, 0, 0]],
+    [[1, 2 ** 40, 3], [1, 2, 3], [0, 0, 0], [0, 0, 0]],
+])
+def test_ragged_or_non_integer_matrix_is_rejected(allocation):
+    with pytest.raises(IngestError) as error:
+        parse(dict(body(), allocation=allocation))
+    assert not isinstance(error.value, PayloadTooLarge)
+
+
+@pytest.mark.parametrize("raw", [
+    b'[]',
+    b'{"processes": ["P1"]}',
+    b'{"processes": ["P1"], "resources": ["R1"], "allocation": [[0]], '
+    b'"max_need": [[1]], "available": [1]} extra',
+    b'{"processes" ["P1"]}',
+    b'\xff\xfe',
+])
+def test_malformed_body_is_rejected(raw):
+    with pytest.raises(IngestError):
+        parse(raw)
+
+
+def test_unsupported_encoding_is_rejected():
+    with pytest.raises(IngestError):
+        parse(body(), 'br')
+
+
+@pytest.fixture
+def client(monkeypatch):
+    pytest.importorskip('flask')
+    import main
+    # Batas kecil agar gzip bomb uji cepat; main memanggil ingest.read_scenario
+    original = ingest.read_scenario
+    monkeypatch.setattr(ingest, 'read_scenario',
+                        lambda *args, **kwargs: original(*args, max_bytes=1 << 20, **kwargs))
+    return main.app.test_client()
+
+
+def post(client, raw, encoding=None):
+    headers = {'Content-Encoding': encoding} if encoding else {}
+    return client.post('/api/solve', data=raw, content_type='application/json', headers=headers)
+
+
+def test_streamed_body_answers_like_get_json(client):
+    raw = json.dumps(body(6, 3, seed=5, strategy="Detection")).encode('utf-8')
+    plain = post(client, raw)
+    streamed = post(client, gzip.compress(raw), 'gzip')
+    assert plain.status_code == streamed.status_code == 200
+    assert streamed.get_json() == plain.get_json()
+
+
+def test_endpoint_maps_ingest_errors(client):
+    bomb = gzip.compress(b'{"label": "' + b'a' * (8 << 20) + b'"}')
+    assert post(client, bomb, 'gzip').status_code == 413
+    raw = json.dumps(body(strategy="Detection")).encode('utf-8')
+    assert post(client, gzip.compress(raw)[:-20], 'gzip').status_code == 400
+    ragged = dict(body(strategy="Detection"), allocation=[[1, 2, 3], [1, 2], [0, 0, 0], [0, 0, 0]])
+    assert post(client, gzip.compress(json.dumps(ragged).encode('utf-8')), 'gzip').status_code == 400
+    fractional = dict(body(strategy="Detection"), allocation=[[1, 2.5, 3]] + [[0, 0, 0]] * 3)
+    assert post(client, gzip.compress(json.dumps(fractional).encode('utf-8')), 'gzip').status_code == 400
@@ -0,0 +1,47 @@
+import os
+
+import levels
+
+
+def test_solver_change_resolves_every_level(tmp_path, monkeypatch):
+    path = str(tmp_path / "levels.bin")
+    store, solved = levels.write_store(path, levels.load_levels())
+    count = len(store.entries)
+    assert solved == count
+
+    _, solved = levels.write_store(path, levels.load_levels(), store)
+    assert solved == 0
+
+    monkeypatch.setattr(levels, 'RESULT_FORMAT', levels.RESULT_FORMAT + 1)
+    monkeypatch.setattr(levels, '_solver_fingerprint', None)
+    _, solved = levels.write_store(path, levels.load_levels(), store)
+    assert solved == count
+
+
+def test_store_from_env_never_builds_and_solves_missing_levels_live(tmp_path, monkeypatch):
+    path = str(tmp_path / "levels.bin")
+    monkeypatch.setenv('LEVEL_STORE', path)
+    solutions = levels.store_from_env()
+    assert not os.path.exists(path)
+    assert solutions.store is None and not solutions.solved
+
+    level = levels.load_levels()[0]
+    body = solutions.get(level['id'], "Avoidance")
+    expected = levels.solve_level(levels.level_scenario(level))[levels.VARIANTS.index("Avoidance")]
+    assert body == expected
+    assert solutions.get(level['id'], "Unknown") is None
+    assert solutions.get(10 ** 6, "Avoidance") is None
+
+
+def test_stale_store_entries_are_not_served(tmp_path, monkeypatch):
+    path = str(tmp_path / "levels.bin")
+    all_levels = levels.load_levels()
+    levels.write_store(path, all_levels)
+    monkeypatch.setenv('LEVEL_STORE', path)
+    assert levels.store_from_env().fresh == {level['id'] for level in all_levels}
+
+    monkeypatch.setattr(levels, 'RESULT_FORMAT', levels.RESULT_FORMAT + 1)
+    monkeypatch.setattr(levels, '_solver_fingerprint', None)
+    solutions = levels.store_from_env()
+    assert solutions.fresh == set()
+    assert solutions.get(all_levels[0]['id'], "simulate") is not None
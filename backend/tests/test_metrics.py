@@ -0,0 +1,24 @@
+import metrics
+
+
+def test_metrics_are_opt_in(monkeypatch):
+    monkeypatch.delenv('METRICS', raising=False)
+    assert metrics.collector_from_env() is None
+    monkeypatch.setenv('METRICS', '1')
+    assert isinstance(metrics.collector_from_env(), metrics.PrometheusCollector)
+
+
+def test_server_timing_is_noop_without_collector():
+    previous = metrics.set_collector(None)
+    try:
+        with metrics.server_timing() as timing:
+            with metrics.phase("reduction"):
+                pass
+        assert timing is None
+        metrics.set_collector(metrics.PrometheusCollector())
+        with metrics.server_timing() as timing:
+            with metrics.phase("reduction"):
+                pass
+        assert "reduction;dur=" in timing.header()
+    finally:
+        metrics.set_collector(previous)
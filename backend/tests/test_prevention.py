@@ -0,0 +1,42 @@
+import random
+
+from prevention import ordering_violations, resource_order
+
+
+def naive_violations(processes, resources, allocation, need, rank):
+    # Referensi: bandingkan setiap pasangan held x needed per proses
+    result = []
+    for i, (held, needed) in enumerate(zip(allocation, need)):
+        pairs = [[resources[h], resources[n]]
+                 for h in sorted(held, key=rank.__getitem__)
+                 for n in sorted(needed, key=rank.__getitem__) if rank[n] < rank[h]]
+        if pairs:
+            lowest = min(rank[n] for n in needed)
+            result.append({"process": processes[i], "pair_count": len(pairs), "pairs": pairs,
+                           "release": [resources[h] for h in held if rank[h] > lowest]})
+    return result
+
+
+def test_ordering_violations_match_pairwise_reference():
+    rng = random.Random(22)
+    for _ in range(200):
+        n, m = rng.randint(1, 8), rng.randint(1, 8)
+        processes = [f"P{i}" for i in range(n)]
+        resources = [f"R{j}" for j in range(m)]
+        held = [sorted(rng.sample(range(m), rng.randint(0, m))) for _ in range(n)]
+        need = [sorted(rng.sample(range(m), rng.randint(0, m))) for _ in range(n)]
+        rank, _ = resource_order(held, need, m)
+        expected = naive_violations(processes, resources, held, need, rank)
+        violations, total = ordering_violations(processes, resources, held, need, rank)
+        assert violations == expected
+        assert total == sum(v["pair_count"] for v in expected)
+
+
+def test_ordering_violations_truncates_pairs_but_counts_all():
+    held = [[1], [1]]
+    need = [[0], [0]]
+    rank = [0, 1]
+    violations, total = ordering_violations(["P0", "P1"], ["R0", "R1"], held, need, rank, max_pairs=1)
+    assert total == 2
+    assert [v["pair_count"] for v in violations] == [1, 1]
+    assert [len(v["pairs"]) for v in violations] == [1, 0]
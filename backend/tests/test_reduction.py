@@ -0,0 +1,63 @@
+import random
+
+from reduction import Reduction, run_reduction
+
+
+def random_state(rng, num_processes, num_resources):
+    allocation = [[rng.randint(0, 3) for _ in range(num_resources)] for _ in range(num_processes)]
+    max_need = [[a + rng.randint(0, 4) for a in row] for row in allocation]
+    available = [rng.randint(0, 5) for _ in range(num_resources)]
+    return allocation, max_need, available
+
+
+def naive_reduction(allocation, max_need, available, finish=None):
+    """
+    Referensi full-scan: ulangi pemindaian dari indeks terkecil dan
+    selesaikan proses pertama yang need-nya muat di work
+    """
+    n = len(allocation)
+    work = list(available)
+    finish = list(finish or [False] * n)
+    order = []
+    while True:
+        for i in range(n):
+            if not finish[i] and all(mx - a <= w for mx, a, w in zip(max_need[i], allocation[i], work)):
+                break
+        else:
+            return order, finish, work
+        finish[i] = True
+        order.append(i)
+        work = [w + a for w, a in zip(work, allocation[i])]
+
+
+def test_reduction_matches_full_scan_reference():
+    rng = random.Random(1)
+    for _ in range(2000):
+        allocation, max_need, available = random_state(rng, rng.randint(0, 12), rng.randint(0, 6))
+        order = []
+        engine = run_reduction(allocation, max_need, available,
+                               on_finish=lambda i, work: order.append(i))
+        assert (order, engine.finish, engine.work) == naive_reduction(allocation, max_need, available)
+        assert engine.unfinished() == [i for i, done in enumerate(engine.finish) if not done]
+
+
+def test_requeue_matches_full_scan_from_current_state():
+    rng = random.Random(2)
+    for _ in range(500):
+        n, m = rng.randint(1, 10), rng.randint(1, 5)
+        allocation, max_need, available = random_state(rng, n, m)
+        engine = Reduction(allocation, max_need, available)
+        for _ in range(rng.randint(0, n)):
+            i = engine.next_runnable()
+            if i is None:
+                break
+            engine.complete(i)
+        # Ubah klaim proses yang belum selesai lalu lanjutkan reduksi
+        for i in engine.unfinished():
+            if rng.random() < 0.5:
+                max_need[i] = [a + rng.randint(0, 4) for a in allocation[i]]
+                engine.requeue(i)
+        work, finish = list(engine.work), list(engine.finish)
+        order = []
+        engine.run(on_finish=lambda i, work: order.append(i))
+        assert (order, engine.finish, engine.work) == naive_reduction(allocation, max_need, work, finish)
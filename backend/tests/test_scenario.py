@@ -0,0 +1,15 @@
+from scenario import Scenario
+from solver import solve_deadlock
+
+
+def scenario():
+    return Scenario(['P1', 'P2'], ['R1', 'R2'], [[1, 0], [0, 1]], [[1, 1], [1, 1]], [0, 0])
+
+
+def test_need_is_computed_only_when_read():
+    data = scenario()
+    before = data.nbytes()
+    solve_deadlock(data, "Avoidance")
+    assert data.nbytes() == before
+    assert data['need'].tolist() == [[0, 1], [1, 0]]
+    assert data.nbytes() > before
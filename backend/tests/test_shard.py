@@ -0,0 +1,68 @@
+import shard
+import solver
+from generator import generate_scenario
+
+
+def block_diagonal(parts):
+    """
+    Gabungkan beberapa skenario menjadi satu skenario dengan komponen terpisah
+    """
+    processes, resources, allocation, max_need, available = [], [], [], [], []
+    width = sum(len(part['resources']) for part in parts)
+    offset = 0
+    for k, part in enumerate(parts):
+        m = len(part['resources'])
+        processes += [f"{p}.{k}" for p in part['processes']]
+        resources += [f"{r}.{k}" for r in part['resources']]
+        for a_row, n_row in zip(part['allocation'], part['max_need']):
+            allocation.append([0] * offset + list(a_row) + [0] * (width - offset - m))
+            max_need.append([0] * offset + list(n_row) + [0] * (width - offset - m))
+        available += part['available']
+        offset += m
+    return {"processes": processes, "resources": resources, "allocation": allocation,
+            "max_need": max_need, "available": available}
+
+
+def scenarios():
+    for seed in range(20):
+        yield block_diagonal([generate_scenario(6, 3, 2, seed, k) for k in range(4)])
+
+
+def serial_recovery(data):
+    result = {}
+    for step, _, _, _ in solver.iter_detection_recovery(data, result):
+        result["steps"].append(step)
+    return result
+
+
+def test_sharded_detection_matches_serial():
+    deadlocks = 0
+    for data in scenarios():
+        args = (data['processes'], data['resources'], data['allocation'], data['max_need'], data['available'])
+        expected = solver.detect_deadlock(*args, shard=False)
+        deadlocks += bool(expected)
+        assert shard.detect_deadlock(*args, workers=1) == expected
+        assert shard.detect_deadlock_dependencies(*args, workers=1) == \
+            solver.detect_deadlock_dependencies(*args, shard=False)
+    assert deadlocks
+
+
+def test_sharded_recovery_has_serial_response_shape():
+    for data in scenarios():
+        assert shard.apply_detection_recovery_strategy(data, workers=1) == serial_recovery(data)
+
+
+def test_handle_deadlock_is_sharded_above_threshold(monkeypatch):
+    calls = []
+    original = shard.detect_deadlock
+
+    def spy(*args, **kwargs):
+        calls.append(len(args[0]))
+        return original(*args, workers=1)
+
+    data = next(scenarios())
+    expected = solver.handle_deadlock(data)
+    monkeypatch.setattr(solver, 'SHARD_MIN_PROCESSES', 10)
+    monkeypatch.setattr(shard, 'detect_deadlock', spy)
+    assert solver.handle_deadlock(data) == expected
+    assert calls == [len(data['processes'])]
@@ -0,0 +1,69 @@
+import pytest
+
+from compute import ComputePool, InvalidInput
+from generator import generate_scenario
+from simulator import MAX_EVENTS, MultiCoreSimulator, simulate_execution
+
+
+def unsafe_scenario():
+    # P1 dan P2 saling menunggu; P3 bisa selesai dari state awal
+    return {"processes": ["P1", "P2", "P3"], "resources": ["R1", "R2"],
+            "allocation": [[1, 0], [0, 1], [0, 0]],
+            "max_need": [[1, 1], [1, 1], [0, 0]],
+            "available": [0, 0]}
+
+
+def test_avoidance_from_unsafe_state_runs_finishable_processes():
+    report = simulate_execution(dict(unsafe_scenario(), seed=1), "Avoidance")
+    assert report["events"] > 0
+    assert report["unsafe_at_start"] == ["P1", "P2"]
+    assert report["completed"] == 1
+
+
+def test_avoidance_grants_without_full_scans():
+    data = generate_scenario(200, 8, 4, 7)
+    simulator = MultiCoreSimulator(data, "Avoidance", seed=1, initial="empty")
+    report = simulator.run()
+    assert report["completed"] + len(report["rejected"]) == 200
+    assert simulator.bank.full_scans == 0
+
+
+def test_detection_restarts_about_once_per_process():
+    data = generate_scenario(200, 8, 4, 7)
+    report = MultiCoreSimulator(data, "Detection", seed=1, initial="empty").run()
+    restarts = sum(p["restarts"] for p in report["processes"].values())
+    assert restarts < 2 * 200
+
+
+def test_max_events_is_capped(monkeypatch):
+    seen = []
+    original = MultiCoreSimulator.__init__
+
+    def spy(self, *args, **kwargs):
+        original(self, *args, **kwargs)
+        seen.append(self.max_events)
+
+    monkeypatch.setattr(MultiCoreSimulator, '__init__', spy)
+    simulate_execution(dict(unsafe_scenario(), max_events=10 ** 12), "Avoidance")
+    assert seen == [MAX_EVENTS]
+
+
+def test_pool_execute_runs_in_worker_and_rejects_invalid_input():
+    pool = ComputePool(workers=1, deadline=10.0)
+    report = pool.execute(dict(unsafe_scenario(), strategy="Detection", seed=1))
+    assert report["events"] > 0
+    with pytest.raises(InvalidInput):
+        pool.execute(dict(unsafe_scenario(), strategy="Prevention"))
+
+
+def test_detection_cost_is_charged_to_the_timeline():
+    data = generate_scenario(50, 4, 2, 3)
+    free = MultiCoreSimulator(data, "Detection", seed=1, initial="empty",
+                              detection_interval=1.0, detection_cost=0.0).run()
+    charged = MultiCoreSimulator(data, "Detection", seed=1, initial="empty",
+                                 detection_interval=1.0, detection_cost=0.25).run()
+    overhead = charged["detection"]["overhead"]
+    assert overhead > 0
+    assert charged["makespan"] > free["makespan"]
+    busy = sum(core["busy"] for core in charged["cores"].values())
+    assert busy <= len(charged["cores"]) * (charged["makespan"] - overhead) + 1e-9
@@ -0,0 +1,25 @@
+import pytest
+
+from solver import MAX_CYCLE_LENGTH, MAX_CYCLES, cycle_limits, solve_deadlock
+
+
+def ring(n):
+    # P_i memegang R_i dan menunggu R_{i+1}: satu siklus wait-for sepanjang n
+    return {"processes": [f"P{i}" for i in range(n)], "resources": [f"R{i}" for i in range(n)],
+            "allocation": [[int(j == i) for j in range(n)] for i in range(n)],
+            "max_need": [[int(j in (i, (i + 1) % n)) for j in range(n)] for i in range(n)],
+            "available": [0] * n}
+
+
+def test_cycle_limits_coerces_and_clamps():
+    assert cycle_limits({}) == (None, None)
+    assert cycle_limits({"max_cycles": "5", "max_cycle_length": 3}) == (5, 3)
+    assert cycle_limits({"max_cycles": 10 ** 12, "max_cycle_length": 10 ** 12}) == (MAX_CYCLES, MAX_CYCLE_LENGTH)
+    for bad in ({"max_cycles": "lima"}, {"max_cycles": -1}, {"max_cycle_length": [3]}, {"max_cycles": True}):
+        with pytest.raises(ValueError):
+            cycle_limits(bad)
+
+
+def test_detection_accepts_string_max_cycles():
+    result = solve_deadlock(dict(ring(4), max_cycles="5"), "Detection")
+    assert result["elementary_cycles"] == [["P0", "P1", "P2", "P3", "P0"]]
@@ -0,0 +1,36 @@
+import pytest
+
+from compute import ComputePool, Overloaded
+from stream import iter_solution_events, with_deadline
+
+
+def scenario():
+    return {"processes": ["P1", "P2"], "resources": ["R1"],
+            "allocation": [[1], [0]], "max_need": [[2], [1]], "available": [1]}
+
+
+def test_with_deadline_ends_stream_with_timeout_event():
+    ticks = iter(range(100))
+    timeouts = []
+    events = list(with_deadline(iter_solution_events(scenario(), "Avoidance"), 2.5,
+                                lambda: timeouts.append(True), clock=lambda: next(ticks)))
+    # Jam naik satu per event: dua event lolos sebelum deadline terlewati
+    assert [event["event"] for event in events] == ["start", "step", "error"]
+    assert events[-1]["timeout"] is True
+    assert timeouts == [True]
+
+
+def test_with_deadline_passes_complete_stream():
+    events = list(with_deadline(iter_solution_events(scenario(), "Avoidance"), 60.0))
+    assert events[-1]["event"] == "end"
+
+
+def test_admit_holds_pool_slot_until_released():
+    pool = ComputePool(workers=1, max_pending=1)
+    release = pool.admit()
+    with pytest.raises(Overloaded):
+        pool.admit()
+    assert pool.stats()["pending"] == 1
+    release()
+    pool.admit()()
+    assert pool.stats()["pending"] == 0
@@ -0,0 +1,44 @@
+import random
+
+from solver import detect_deadlock, detect_deadlock_dependencies
+from waitfor import is_single_instance
+
+
+def random_single_instance(rng, num_processes, num_resources):
+    """
+    Skenario single-instance acak: setiap resource dipegang satu proses atau
+    bebas, dan proses mengklaim sebagian resource lain
+    """
+    allocation = [[0] * num_resources for _ in range(num_processes)]
+    max_need = [[0] * num_resources for _ in range(num_processes)]
+    available = [0] * num_resources
+    for j in range(num_resources):
+        if num_processes and rng.random() < 0.8:
+            allocation[rng.randrange(num_processes)][j] = 1
+        else:
+            available[j] = 1
+    for i in range(num_processes):
+        for j in range(num_resources):
+            max_need[i][j] = 1 if allocation[i][j] or rng.random() < 0.3 else 0
+    return {
+        "processes": [f"P{i + 1}" for i in range(num_processes)],
+        "resources": [f"R{j + 1}" for j in range(num_resources)],
+        "allocation": allocation,
+        "max_need": max_need,
+        "available": available
+    }
+
+
+def test_single_instance_engine_matches_general_reduction():
+    rng = random.Random(1)
+    mismatches = []
+    for _ in range(2000):
+        data = random_single_instance(rng, rng.randint(0, 30), rng.randint(0, 30))
+        args = (data['processes'], data['resources'], data['allocation'], data['max_need'], data['available'])
+        assert is_single_instance(*args[2:])
+        fast = (detect_deadlock(*args), detect_deadlock_dependencies(*args))
+        general = (detect_deadlock(*args, single_instance=False),
+                   detect_deadlock_dependencies(*args, single_instance=False))
+        if fast != general:
+            mismatches.append(data)
+    assert mismatches == []
@@ -0,0 +1,81 @@
+"""
+Engine deteksi untuk skenario single-instance: setiap resource hanya punya
+satu unit (lock/mutex, sebagian besar level game). Di sini deadlock tepat
+sama dengan proses yang bisa mencapai siklus di wait-for graph, sehingga
+reduksi multi-instance bisa diganti satu pass linear atas graph tersebut.
+Kesetaraan dengan jalur umum diuji di tests/test_waitfor.py.
+"""
+from collections import deque
+from itertools import compress
+from operator import gt
+
+
+def is_single_instance(allocation, max_need, available):
+    """
+    True jika total setiap resource paling banyak 1 (alokasi dan available
+    bernilai 0/1) dan tidak ada klaim max_need yang melebihi total. Klaim
+    seperti itu tidak pernah terpenuhi dan ditangani jalur umum.
+    """
+    if any(a != 0 and a != 1 for a in available):
+        return False
+    for row in allocation:
+        if row and min(row) < 0:
+            return False
+    total = list(available)
+    if allocation:
+        total = [a + sum(column) for a, column in zip(available, zip(*allocation))]
+    if any(t > 1 for t in total):
+        return False
+    missing = [j for j, t in enumerate(total) if t == 0]
+    for row in max_need:
+        if row and max(row) > 1:
+            return False
+        if missing and any(row[j] > 0 for j in missing):
+            return False
+    return True
+
+
+def single_instance_deadlock(allocation, max_need, available):
+    """
+    Deteksi O(n*m) tanpa heap: proses i menunggu holder setiap resource yang
+    dibutuhkannya dan sedang dipegang. Proses selesai jika semua yang
+    ditunggunya selesai (propagasi mundur dari proses yang tidak menunggu),
+    jadi sisanya adalah proses yang mencapai siklus.
+
+    Mengembalikan (indeks proses deadlock terurut, dict i -> set proses
+    deadlock yang ditunggu i), sama dengan unfinished() reduksi dan
+    build_wait_for pada jalur umum.
+    """
+    n = len(allocation)
+    m = len(available)
+    columns = range(m)
+    holder = [-1] * m
+    for i, row in enumerate(allocation):
+        if any(row):
+            for j in compress(columns, row):
+                holder[j] = i
+
+    # Resource bebas (holder -1) tidak pernah membuat proses menunggu
+    blocking = []
+    waiters = [[] for _ in range(n)]
+    for i in range(n):
+        edges = [q for q in compress(holder, map(gt, max_need[i], allocation[i])) if q >= 0]
+        for q in edges:
+            waiters[q].append(i)
+        blocking.append(edges)
+
+    pending = [len(edges) for edges in blocking]
+    finished = [count == 0 for count in pending]
+    queue = deque(i for i in range(n) if finished[i])
+    while queue:
+        q = queue.popleft()
+        for i in waiters[q]:
+            pending[i] -= 1
+            if pending[i] == 0:
+                finished[i] = True
+                queue.append(i)
+
+    deadlocked = [i for i in range(n) if not finished[i]]
+    waits_for = {i: {q for q in blocking[i] if not finished[q]} for i in deadlocked}
+    return deadlocked, waits_for
+
@@ -0,0 +1,184 @@
+"""
+Format biner ringkas untuk skenario dan hasil solver berukuran besar.
+
+Layout (little-endian):
+    header  : magic b"DLKW", versi (uint16), flags (uint16), panjang meta (uint32)
+    meta    : JSON UTF-8, di-pad ke kelipatan 4 byte
+    buffers : array int32 berurutan sesuai meta["arrays"]
+
+meta = {"arrays": [[n, m], [k], ...], "value": ...}. Di dalam value setiap
+matriks int (list of list) dan vektor int yang panjang diganti referensi
+{"$array": indeks}; sisanya (nama proses, teks penjelasan, dst.) tetap JSON.
+
+Decode tidak menyalin buffer: matriks menjadi scenario.Matrix dan vektor
+menjadi memoryview int32 di atas body request (pada host little-endian).
+"""
+import hashlib
+import json
+import struct
+import sys
+from array import array
+
+from scenario import Matrix, Scenario
+
+MIMETYPE = 'application/x-deadlock-wire'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHHI')
+_MAGIC = b'DLKW'
+_REF = '$array'
+
+# Vektor lebih pendek dari ini lebih ringkas sebagai JSON
+MIN_VECTOR = 16
+
+_SCENARIO_KEYS = ('processes', 'resources', 'allocation', 'max_need', 'available', 'need')
+
+
+class WireError(ValueError):
+    """Body biner tidak valid"""
+
+
+def _int_vector(value):
+    return bool(value) and type(value[0]) is int
+
+
+def _int_matrix(value):
+    return bool(value) and isinstance(value[0], (list, Matrix)) and len(value[0]) > 0 \
+        and type(value[0][0]) is int
+
+
+def encode(value):
+    """
+    Encode nilai JSON-able (dict/list) ke format biner
+    """
+    shapes = []
+    buffers = []
+
+    def add(shape, data):
+        shapes.append(shape)
+        buffers.append(data)
+        return {_REF: len(shapes) - 1}
+
+    def walk(node):
+        if isinstance(node, Matrix):
+            return add([node.rows, node.cols], array('i', node.data))
+        if isinstance(node, dict):
+            return {key: walk(item) for key, item in node.items()}
+        if isinstance(node, (list, tuple, array, memoryview)):
+            if _int_matrix(node):
+                cols = len(node[0])
+                data = array('i')
+                try:
+                    for row in node:
+                        if len(row) != cols:
+                            raise ValueError
+                        data.extend(row)
+                except (TypeError, ValueError, OverflowError):
+                    return [walk(item) for item in node]
+                return add([len(node), cols], data)
+            if len(node) >= MIN_VECTOR and _int_vector(node):
+                try:
+                    return add([len(node)], array('i', node))
+                except (TypeError, OverflowError):
+                    pass
+            if isinstance(node, (array, memoryview)):
+                return node.tolist()
+            return [walk(item) for item in node]
+        return node
+
+    meta = json.dumps({"arrays": shapes, "value": walk(value)}, separators=(',', ':')).encode('utf-8')
+    meta += b' ' * (-len(meta) % 4)
+    parts = [_HEADER.pack(_MAGIC, VERSION, 0, len(meta)), meta]
+    for data in buffers:
+        if sys.byteorder != 'little':
+            data.byteswap()
+        parts.append(data.tobytes())
+    return b''.join(parts)
+
+
+def decode(body, copy=False):
+    """
+    Decode body biner. Tanpa copy, matriks dikembalikan sebagai Matrix dan
+    vektor sebagai memoryview di atas body; dengan copy=True semuanya list biasa.
+    """
+    view = memoryview(body)
+    if len(view) < _HEADER.size:
+        raise WireError("Body terlalu pendek")
+    magic, version, _, meta_length = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        raise WireError("Magic tidak dikenal")
+    if version != VERSION:
+        raise WireError(f"Versi format {version} tidak didukung")
+    offset = _HEADER.size + meta_length
+    if offset > len(view) or meta_length % 4:
+        raise WireError("Panjang meta tidak valid")
+    try:
+        meta = json.loads(bytes(view[_HEADER.size:offset]).decode('utf-8'))
+        shapes = meta["arrays"]
+        value = meta["value"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise WireError(f"Meta tidak valid: {e}")
+
+    arrays = []
+    for shape in shapes:
+        if not isinstance(shape, list) or len(shape) not in (1, 2) \
+                or any(not isinstance(d, int) or d < 0 for d in shape):
+            raise WireError("Dimensi array tidak valid")
+        count = shape[0] * (shape[1] if len(shape) == 2 else 1)
+        end = offset + 4 * count
+        if end > len(view):
+            raise WireError("Buffer array terpotong")
+        if sys.byteorder == 'little':
+            data = view[offset:end].cast('i')
+        else:
+            data = array('i', bytes(view[offset:end]))
+            data.byteswap()
+        if len(shape) == 2:
+            matrix = Matrix(data, shape[0], shape[1])
+            arrays.append(matrix.tolist() if copy else matrix)
+        else:
+            arrays.append(data.tolist() if copy else data)
+        offset = end
+    if offset != len(view):
+        raise WireError("Data tersisa setelah buffer terakhir")
+
+    def walk(node):
+        if isinstance(node, dict):
+            if len(node) == 1 and _REF in node:
+                try:
+                    return arrays[node[_REF]]
+                except (IndexError, TypeError):
+                    raise WireError("Referensi array tidak valid")
+            return {key: walk(item) for key, item in node.items()}
+        if isinstance(node, list):
+            return [walk(item) for item in node]
+        return node
+
+    return walk(value)
+
+
+def decode_scenario(body):
+    """
+    Decode body request menjadi Scenario; key selain matriks skenario
+    (mis. strategy, recovery_mode) menjadi opsi
+    """
+    data = decode(body)
+    if not isinstance(data, dict):
+        raise WireError("Body harus berisi objek skenario")
+    try:
+        options = {key: value for key, value in data.items() if key not in _SCENARIO_KEYS}
+        return Scenario(data['processes'], data['resources'], data['allocation'],
+                        data['max_need'], data['available'], options)
+    except (KeyError, TypeError, ValueError) as e:
+        raise WireError(f"Skenario tidak valid: {e}")
+
+
+def body_key(endpoint, body, strategy=None):
+    """
+    Key cache untuk body biner: hash isi body apa adanya. Dipisah dari key
+    JSON karena body cache yang disimpan juga berformat biner.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{endpoint}\0{strategy}\0".encode('utf-8'))
+    digest.update(body)
+    return digest.digest()